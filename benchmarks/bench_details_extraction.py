@@ -0,0 +1,78 @@
+"""
+Per-page parse time of the single-pass details extractor versus calling
+every legacy ``_parse_*`` helper (``legacy_details``) on its own, on large synthetic details pages.
+
+    python benchmarks/bench_details_extraction.py --reviews 500 --blocks 1000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from extractors import app_details  # noqa: E402
+from fixtures import details_page  # noqa: E402
+import legacy_details  # noqa: E402
+
+def _per_helper(soup: BeautifulSoup) -> Dict[str, Any]:
+    return {
+        "title": legacy_details._parse_title(soup),
+        "description": legacy_details._parse_description(soup),
+        "score": legacy_details._parse_score(soup),
+        "installs": legacy_details._parse_installs(soup),
+        "developerEmail": legacy_details._parse_developer_email(soup),
+        "developerWebsite": legacy_details._parse_developer_website(soup),
+        "developerAddress": legacy_details._parse_developer_address(soup),
+        "genre": legacy_details._parse_genre(soup),
+        "categories": legacy_details._parse_categories(soup),
+        "screenshots": legacy_details._parse_screenshots(soup),
+        "video": legacy_details._parse_video(soup),
+    }
+
+def _single_pass(soup: BeautifulSoup) -> Dict[str, Any]:
+    return app_details.walk_document(soup, app_details._detail_handlers())
+
+def _time(fn: Callable[[BeautifulSoup], Any], soup: BeautifulSoup, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(soup)
+    return (time.perf_counter() - started) / repeat
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=500)
+    parser.add_argument("--blocks", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = details_page(reviews=args.reviews, layout_blocks=args.blocks, layout_depth=args.depth)
+    soup = BeautifulSoup(html, "html.parser")
+
+    if _per_helper(soup) != _single_pass(soup):
+        print("Extractors disagree on the benchmark page", file=sys.stderr)
+        return 1
+
+    per_helper = _time(_per_helper, soup, args.repeat)
+    single_pass = _time(_single_pass, soup, args.repeat)
+    print(
+        json.dumps(
+            {
+                "pageBytes": len(html),
+                "perHelperSeconds": round(per_helper, 4),
+                "singlePassSeconds": round(single_pass, 4),
+                "speedup": round(per_helper / single_pass, 1),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+"""
+Compare the sequential, threaded and asyncio scraping engines against a
+local stub server.
+
+    python benchmarks/bench_engines.py --apps 500 --latency 0.05 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from async_scraper import async_scrape_app_ids, build_async_client  # noqa: E402
+from scraper import iter_scraped_apps  # noqa: E402
+from stub_server import StubPlayServer  # noqa: E402
+from utils.request_client import RequestClient  # noqa: E402
+
+def _run_threads(cfg: dict, app_ids: list) -> int:
+    client = RequestClient(user_agent="bench", pool_size=max(10, cfg["concurrency"]))
+    return sum(1 for _, record in iter_scraped_apps(client, app_ids, cfg) if record)
+
+def _run_async(cfg: dict, app_ids: list) -> int:
+    async def run() -> int:
+        async with build_async_client(cfg) as client:
+            results = await async_scrape_app_ids(client, app_ids, cfg)
+        return sum(1 for record in results if record)
+
+    return asyncio.run(run())
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apps", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--reviews", type=int, default=10)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    server = StubPlayServer(latency=args.latency, reviews=args.reviews).start()
+    app_ids = [f"com.bench.app{i}" for i in range(args.apps)]
+    base_cfg = {"max_reviews_per_app": args.reviews, **server.urls()}
+
+    engines = [
+        ("threads", _run_threads, args.concurrency),
+        ("async", _run_async, args.concurrency),
+    ]
+    if not args.skip_sequential:
+        engines.insert(0, ("sequential", _run_threads, 1))
+
+    results = []
+    try:
+        for name, runner, concurrency in engines:
+            cfg = {**base_cfg, "concurrency": concurrency}
+            served_before = server.requests_served
+            started = time.perf_counter()
+            scraped = runner(cfg, app_ids)
+            elapsed = time.perf_counter() - started
+            results.append(
+                {
+                    "engine": name,
+                    "concurrency": concurrency,
+                    "apps": scraped,
+                    "requests": server.requests_served - served_before,
+                    "seconds": round(elapsed, 3),
+                    "appsPerSecond": round(scraped / elapsed, 1),
+                }
+            )
+    finally:
+        server.stop()
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+"""
+Compare peak memory and time of the streaming Excel writer against the
+previous pandas-based writer.
+
+Each writer runs in its own subprocess so peak RSS is measured in
+isolation. Both workbooks are compared cell by cell afterwards.
+
+    python benchmarks/bench_excel_writer.py --apps 2000 --reviews 100
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+def _records(apps: int, reviews: int) -> Iterator[Dict[str, Any]]:
+    for idx in range(apps):
+        yield {
+            "title": f"Example App {idx}",
+            "appId": f"com.bench.app{idx}",
+            "description": "An example application used for benchmarks. " * 20,
+            "score": 4.3,
+            "ratings": None,
+            "reviews": [
+                {
+                    "userName": f"User {r}",
+                    "score": float(r % 5 + 1),
+                    "text": " ".join(f"word{(r * 7 + w) % 97}" for w in range(20 + r % 40)),
+                    "date": None,
+                    "version": None,
+                    "thumbsUp": None,
+                }
+                for r in range(reviews)
+            ],
+            "installs": "1,000,000+",
+            "screenshots": [f"https://example.com/shot{s}.png" for s in range(12)],
+            "video": None,
+            "developerEmail": "dev@example.com",
+            "developerWebsite": "https://example.com",
+            "developerAddress": None,
+            "genre": "Arcade",
+            "categories": ["Arcade", "Casual"],
+            "reviewsCount": reviews,
+        }
+
+def _previous_write_excel(records: List[Dict[str, Any]], output_path: Path) -> None:
+    """
+    The pandas-based writer this benchmark compares against.
+    """
+    import pandas as pd
+
+    apps_rows: List[Dict[str, Any]] = []
+    reviews_rows: List[Dict[str, Any]] = []
+
+    for record in records:
+        app_copy = {k: v for k, v in record.items() if k != "reviews"}
+        apps_rows.append(app_copy)
+
+        for review in record.get("reviews", []):
+            row = {"appId": record.get("appId")}
+            row.update(review)
+            reviews_rows.append(row)
+
+    apps_df = pd.DataFrame(apps_rows)
+    reviews_df = pd.DataFrame(reviews_rows)
+
+    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
+        apps_df.to_excel(writer, sheet_name="apps", index=False)
+        reviews_df.to_excel(writer, sheet_name="reviews", index=False)
+
+def _child(writer: str, apps: int, reviews: int, output_path: Path) -> None:
+    started = time.perf_counter()
+    if writer == "streaming":
+        from outputs.writer_excel import ExcelStreamWriter
+
+        # Records arrive one at a time, as they do from the scraper.
+        with ExcelStreamWriter(output_path) as stream:
+            for record in _records(apps, reviews):
+                stream.write(record)
+    else:
+        # The previous path needs the full list before it can start.
+        _previous_write_excel(list(_records(apps, reviews)), output_path)
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": round(elapsed, 2), "peakRssMb": round(peak_kb / 1024, 1)}))
+
+def _sheet_values(path: Path) -> Dict[str, List[tuple]]:
+    from openpyxl import load_workbook
+
+    def trimmed(row: tuple) -> tuple:
+        # Write-only sheets do not store empty trailing cells.
+        end = len(row)
+        while end and row[end - 1] is None:
+            end -= 1
+        return row[:end]
+
+    workbook = load_workbook(path, read_only=True)
+    return {sheet.title: [trimmed(row) for row in sheet.values] for sheet in workbook}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apps", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=100)
+    parser.add_argument("--child", choices=["streaming", "previous"])
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.apps, args.reviews, Path(args.output))
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = {}
+        for writer in ("previous", "streaming"):
+            outputs[writer] = Path(tmp) / f"{writer}.xlsx"
+            proc = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--child",
+                    writer,
+                    "--apps",
+                    str(args.apps),
+                    "--reviews",
+                    str(args.reviews),
+                    "--output",
+                    str(outputs[writer]),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            results.append({"writer": writer, **json.loads(proc.stdout)})
+        identical = _sheet_values(outputs["previous"]) == _sheet_values(outputs["streaming"])
+
+    summary = {
+        "apps": args.apps,
+        "reviewsPerApp": args.reviews,
+        "identical": identical,
+        "results": results,
+    }
+    print(json.dumps(summary, indent=2))
+    return 0 if identical else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+"""
+Per-app extraction time with a ``--fields`` projection against extracting
+every field, on a synthetic details page. ``extractSeconds`` covers the
+details and review extractors; ``appSeconds`` adds parsing the page, which
+every projection still pays for.
+
+    python benchmarks/bench_field_projection.py --reviews 200 --blocks 1000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from extractors.app_details import extract_app_details  # noqa: E402
+from extractors.reviews_parser import extract_app_reviews  # noqa: E402
+from fixtures import details_page  # noqa: E402
+from utils.formatters import merge_app_and_reviews  # noqa: E402
+from utils.html_parser import parse_html  # noqa: E402
+from utils.records import select_fields, wants_reviews  # noqa: E402
+
+PROJECTIONS: Dict[str, Optional[str]] = {
+    "all": None,
+    "title,score,installs": "title,score,installs",
+    "title,genre,developerEmail": "title,genre,developerEmail",
+    "title,score,reviews": "title,score,reviews",
+}
+
+def _extract(soup: BeautifulSoup, fields: Optional[List[str]], max_reviews: int) -> Any:
+    details = extract_app_details(soup, "com.example.app", fields=fields)
+    reviews = extract_app_reviews(soup, "com.example.app", max_reviews) if wants_reviews(fields) else []
+    return merge_app_and_reviews(details, reviews)
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = details_page(reviews=args.reviews, layout_blocks=args.blocks, layout_depth=args.depth)
+    soup = parse_html(html)
+    full = _extract(soup, None, args.reviews)
+
+    results = []
+    for name, projection in PROJECTIONS.items():
+        fields = list(select_fields(projection)) if projection else None
+        record = _extract(soup, fields, args.reviews)
+        if any(record[key] != full[key] for key in record):
+            print(f"Projection {name} disagrees with the full record", file=sys.stderr)
+            return 1
+        extract = _time(lambda: _extract(soup, fields, args.reviews), args.repeat)
+        app = _time(lambda: _extract(parse_html(html), fields, args.reviews), args.repeat)
+        results.append({"fields": name, "extractSeconds": round(extract, 4), "appSeconds": round(app, 4)})
+
+    for result in results:
+        result["extractSpeedup"] = round(results[0]["extractSeconds"] / result["extractSeconds"], 1)
+        result["appSpeedup"] = round(results[0]["appSeconds"] / result["appSeconds"], 2)
+    print(json.dumps({"pageBytes": len(html), "results": results}, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
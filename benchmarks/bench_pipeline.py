@@ -0,0 +1,92 @@
+"""
+Throughput of the fetch/parse pipeline with a growing number of parse
+processes, against the thread-pool engine, on an offline corpus of saved
+details pages (no network involved, so parsing is the bottleneck).
+
+    python benchmarks/bench_pipeline.py --apps 400 --workers 1,2,4,8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import details_page  # noqa: E402
+from pipeline import iter_pipelined_apps  # noqa: E402
+from scraper import iter_scraped_apps  # noqa: E402
+
+class CorpusResponse:
+    def __init__(self, text: str) -> None:
+        self.status_code = 200
+        self.text = text
+
+class CorpusClient:
+    """
+    Serves saved pages from ``<corpus_dir>/<app id>.html`` in place of the
+    HTTP client.
+    """
+
+    def __init__(self, corpus_dir: Path) -> None:
+        self.corpus_dir = corpus_dir
+
+    def get(self, url: str, *, params: Optional[Dict[str, Any]] = None) -> CorpusResponse:
+        app_id = (params or {})["id"]
+        return CorpusResponse((self.corpus_dir / f"{app_id}.html").read_text(encoding="utf-8"))
+
+def _build_corpus(corpus_dir: Path, apps: int, reviews: int) -> list:
+    app_ids = [f"com.bench.app{i}" for i in range(apps)]
+    for app_id in app_ids:
+        (corpus_dir / f"{app_id}.html").write_text(
+            details_page(app_id, reviews=reviews), encoding="utf-8"
+        )
+    return app_ids
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apps", type=int, default=400)
+    parser.add_argument("--reviews", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--workers", type=str, default="1,2,4")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = Path(tmp)
+        app_ids = _build_corpus(corpus_dir, args.apps, args.reviews)
+        client = CorpusClient(corpus_dir)
+        cfg = {
+            "base_url": "corpus",
+            "concurrency": args.concurrency,
+            "max_reviews_per_app": args.reviews,
+        }
+
+        runs = [("threads", iter_scraped_apps, 0)]
+        runs += [
+            ("pipeline", iter_pipelined_apps, int(n)) for n in args.workers.split(",")
+        ]
+        for name, iterate, workers in runs:
+            run_cfg = {**cfg, "parse_workers": workers}
+            started = time.perf_counter()
+            scraped = sum(1 for _, record in iterate(client, app_ids, run_cfg) if record)
+            elapsed = time.perf_counter() - started
+            results.append(
+                {
+                    "engine": name,
+                    "parseWorkers": workers,
+                    "apps": scraped,
+                    "seconds": round(elapsed, 3),
+                    "appsPerSecond": round(scraped / elapsed, 1),
+                }
+            )
+
+    print(json.dumps({"cpus": os.cpu_count(), "results": results}, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
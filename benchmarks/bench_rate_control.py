@@ -0,0 +1,91 @@
+"""
+Compare fixed concurrency against adaptive per-host rate control on a stub
+server that only handles ``--capacity`` requests at a time and answers 429
+(with Retry-After) beyond that, plus a share of random 503s.
+
+Apps that fail are scraped again in up to ``--passes`` passes, the way a
+failed_app_ids.txt re-run would, so the reported rate is the sustained
+throughput for getting the whole list done.
+
+    python benchmarks/bench_rate_control.py --apps 400 --concurrency 32 --capacity 8
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from scraper import iter_scraped_apps  # noqa: E402
+from stub_server import StubPlayServer  # noqa: E402
+from utils.rate_control import RateController  # noqa: E402
+from utils.request_client import RequestClient  # noqa: E402
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apps", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--passes", type=int, default=5)
+    args = parser.parse_args()
+
+    app_ids = [f"com.bench.app{i}" for i in range(args.apps)]
+    variants = [
+        ("fixed", None),
+        (
+            "adaptive",
+            RateController(initial_limit=args.concurrency, max_limit=args.concurrency),
+        ),
+    ]
+
+    results = []
+    for name, controller in variants:
+        server = StubPlayServer(
+            latency=args.latency,
+            reviews=5,
+            capacity=args.capacity,
+            error_rate=args.error_rate,
+            retry_after=args.retry_after,
+        ).start()
+        cfg = {"concurrency": args.concurrency, "max_reviews_per_app": 5, **server.urls()}
+        client = RequestClient(
+            user_agent="bench",
+            pool_size=max(10, args.concurrency),
+            backoff_factor=0.1,
+            rate_controller=controller,
+        )
+        try:
+            remaining = app_ids
+            passes = 0
+            started = time.perf_counter()
+            while remaining and passes < args.passes:
+                passes += 1
+                results_by_id = dict(iter_scraped_apps(client, remaining, cfg))
+                remaining = [app_id for app_id in remaining if not results_by_id.get(app_id)]
+            elapsed = time.perf_counter() - started
+        finally:
+            server.stop()
+        scraped = args.apps - len(remaining)
+        result = {
+            "variant": name,
+            "apps": scraped,
+            "failed": len(remaining),
+            "passes": passes,
+            "seconds": round(elapsed, 3),
+            "appsPerSecond": round(scraped / elapsed, 1),
+            **server.fault_stats(),
+        }
+        if controller is not None:
+            result["controller"] = controller.stats()
+        results.append(result)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
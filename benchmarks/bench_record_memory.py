@@ -0,0 +1,119 @@
+"""
+Memory footprint of scraped records held in memory, as the json, csv and
+excel outputs do until the end of a run: the former plain dict records
+(details copied on merge) against the slotted ``AppRecord``/``Review``
+records with interned strings.
+
+Every app gets freshly decoded strings, the way parsing its own pages
+would, so interning has the same duplicates to fold as in a real run.
+
+    python benchmarks/bench_record_memory.py --apps 2000 --reviews 100
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from extractors.app_details import extract_app_details  # noqa: E402
+from extractors.review_pages import _nested, _parse_review_page  # noqa: E402
+from fixtures import details_page, review_feed_page  # noqa: E402
+from utils.formatters import merge_app_and_reviews  # noqa: E402
+from utils.html_parser import parse_html  # noqa: E402
+from utils.records import AppRecord  # noqa: E402
+
+def _fresh(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.encode("utf-8").decode("utf-8")
+    if isinstance(value, list):
+        return [_fresh(item) for item in value]
+    return value
+
+def _dict_reviews(body: str) -> List[Dict[str, Any]]:
+    # The review dicts the feed extractor used to build.
+    envelopes = json.loads(body[body.find("["):])
+    entries = json.loads(envelopes[0][2])[0]
+    return [
+        {
+            "userName": _nested(entry, 1, 0) or "Unknown",
+            "score": _nested(entry, 2),
+            "text": _nested(entry, 4) or "",
+            "date": datetime.fromtimestamp(_nested(entry, 5, 0), tz=timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+            "version": _nested(entry, 10),
+            "thumbsUp": _nested(entry, 6),
+        }
+        for entry in entries
+    ]
+
+def _dict_records(details: Dict[str, Any], apps: int, body: str) -> List[Dict[str, Any]]:
+    records = []
+    for idx in range(apps):
+        app = {key: _fresh(value) for key, value in details.items()}
+        app["appId"] = f"com.bench.app{idx}"
+        record = deepcopy(app)
+        reviews = _dict_reviews(body)
+        record["reviews"] = reviews
+        record["reviewsCount"] = len(reviews)
+        records.append(record)
+    return records
+
+def _slotted_records(details: Dict[str, Any], apps: int, body: str) -> List[AppRecord]:
+    records = []
+    for idx in range(apps):
+        app = AppRecord.from_mapping({key: _fresh(value) for key, value in details.items()})
+        app.appId = f"com.bench.app{idx}"
+        reviews, _ = _parse_review_page(body)
+        records.append(merge_app_and_reviews(app, reviews))
+    return records
+
+def _measure(build: Callable[[], List[Any]]) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = build()
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        "records": len(records),
+        "retainedMB": round(retained / 2**20, 2),
+        "peakMB": round(peak / 2**20, 2),
+        "buildSeconds": round(elapsed, 3),
+    }
+    del records
+    return result
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apps", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=100)
+    args = parser.parse_args()
+
+    details = extract_app_details(parse_html(details_page("com.bench.app")), "com.bench.app").to_dict()
+    body = review_feed_page("com.bench.app", page_size=args.reviews, total=args.reviews)
+
+    dict_result = _measure(lambda: _dict_records(details, args.apps, body))
+    slotted_result = _measure(lambda: _slotted_records(details, args.apps, body))
+    summary = {
+        "apps": args.apps,
+        "reviewsPerApp": args.reviews,
+        "dict": dict_result,
+        "slotted": slotted_result,
+        "retainedReduction": round(1 - slotted_result["retainedMB"] / dict_result["retainedMB"], 3),
+        "peakReduction": round(1 - slotted_result["peakMB"] / dict_result["peakMB"], 3),
+    }
+    print(json.dumps(summary, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
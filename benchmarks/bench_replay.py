@@ -0,0 +1,74 @@
+"""
+Re-extraction throughput from a page archive with a growing number of
+replay processes. The archive is filled with generated details pages, as a
+capture run would, and then replayed without any network access.
+
+    python benchmarks/bench_replay.py --apps 2000 --workers 1,2,4,8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import details_page  # noqa: E402
+from replay import iter_replayed_apps  # noqa: E402
+from utils.page_archive import ArchiveWriter  # noqa: E402
+
+BASE_URL = "https://play.google.com/store/apps/details"
+
+def _build_archive(archive_dir: Path, apps: int, reviews: int) -> dict:
+    with ArchiveWriter(archive_dir) as writer:
+        for idx in range(apps):
+            app_id = f"com.bench.app{idx}"
+            body = details_page(app_id, reviews=reviews).encode("utf-8")
+            writer.record("GET", BASE_URL, {"id": app_id, "hl": "en_US"}, None, 200, body, "utf-8")
+        return writer.stats()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apps", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=40)
+    parser.add_argument("--workers", type=str, default="1,2,4")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_dir = Path(tmp)
+        started = time.perf_counter()
+        archive = _build_archive(archive_dir, args.apps, args.reviews)
+        archive["captureSeconds"] = round(time.perf_counter() - started, 3)
+
+        cfg = {
+            "base_url": BASE_URL,
+            "max_reviews_per_app": args.reviews,
+            "replay_chunk_size": args.chunk_size,
+        }
+        app_ids = [f"com.bench.app{idx}" for idx in range(args.apps)]
+        for workers in (int(n) for n in args.workers.split(",")):
+            run_cfg = {**cfg, "replay_workers": workers}
+            started = time.perf_counter()
+            replayed = sum(
+                1 for _, record in iter_replayed_apps(archive_dir, app_ids, run_cfg) if record
+            )
+            elapsed = time.perf_counter() - started
+            results.append(
+                {
+                    "replayWorkers": workers,
+                    "apps": replayed,
+                    "seconds": round(elapsed, 3),
+                    "appsPerSecond": round(replayed / elapsed, 1),
+                }
+            )
+
+    print(json.dumps({"cpus": os.cpu_count(), "archive": archive, "results": results}, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""
+Seen-review index: observed against configured Bloom filter false positive
+rates, lookup throughput and size on disk.
+
+For every rate, an index sized for ``--reviews`` is filled with that many
+reviews, reopened from disk, and then asked about the same number of
+reviews it has never seen (every one of them a potential false positive)
+and about the ones it holds.
+
+    python benchmarks/bench_review_dedup.py --reviews 200000 --rates 0.1,0.01,0.001
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.review_index import ReviewIndex  # noqa: E402
+
+def _reviews(start: int, count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "userName": f"User {idx}",
+            "score": idx % 5 + 1,
+            "text": f"Review text number {idx}",
+            "date": f"2024-05-{idx % 28 + 1:02d}T12:00:00Z",
+        }
+        for idx in range(start, start + count)
+    ]
+
+def _run(directory: Path, reviews: int, fp_rate: float) -> Dict[str, Any]:
+    seen = _reviews(0, reviews)
+    unseen = _reviews(reviews, reviews)
+
+    started = time.perf_counter()
+    with ReviewIndex(directory, capacity=reviews, fp_rate=fp_rate) as index:
+        index.filter_new("com.bench.app", seen)
+    fill_seconds = time.perf_counter() - started
+
+    index = ReviewIndex(directory, capacity=reviews, fp_rate=fp_rate).open()
+    started = time.perf_counter()
+    fresh = index.filter_new("com.bench.app", unseen)
+    unseen_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    repeated = index.filter_new("com.bench.app", seen)
+    seen_seconds = time.perf_counter() - started
+    stats = index.stats()
+    index.close(commit=False)
+
+    return {
+        "configuredFalsePositiveRate": fp_rate,
+        "observedFalsePositiveRate": stats["observedFalsePositiveRate"],
+        "expectedFalsePositiveRate": stats["expectedFalsePositiveRate"],
+        "newReviewsEmitted": len(fresh),
+        "seenReviewsEmitted": len(repeated),
+        "fillSeconds": round(fill_seconds, 3),
+        "unseenLookupsPerSecond": round(reviews / unseen_seconds),
+        "seenLookupsPerSecond": round(reviews / seen_seconds),
+        "bloomBytes": (directory / "bloom.bin").stat().st_size,
+        "setBytes": (directory / "seen.sqlite").stat().st_size,
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=100000)
+    parser.add_argument("--rates", type=str, default="0.1,0.01,0.001")
+    args = parser.parse_args()
+
+    results = []
+    for fp_rate in (float(rate) for rate in args.rates.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            results.append(_run(Path(tmp), args.reviews, fp_rate))
+
+    print(json.dumps({"reviews": args.reviews, "results": results}, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
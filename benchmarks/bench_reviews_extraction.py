@@ -0,0 +1,127 @@
+"""
+Review extraction time on synthetic pages with hundreds of reviews, compared
+with the previous per-container ``find_all``/``get_text`` implementation.
+
+Three layouts are measured: separate review cards, cards whose rating
+elements share one parent, and nested (threaded) cards where the old
+implementation is quadratic.
+
+    python benchmarks/bench_reviews_extraction.py --reviews 300
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from extractors.reviews_parser import _parse_reviews_from_page  # noqa: E402
+from fixtures import details_page  # noqa: E402
+from utils.html_parser import parse_html  # noqa: E402
+
+def _previous_parse_reviews(soup: BeautifulSoup, max_reviews: int) -> List[Dict[str, Any]]:
+    # Reference copy of the implementation this benchmark replaced.
+    reviews: List[Dict[str, Any]] = []
+    review_candidates = soup.find_all(attrs={"aria-label": lambda v: v and "stars" in v})
+    seen = 0
+    for candidate in review_candidates:
+        container = candidate.parent
+        if not container:
+            continue
+        rating_value = None
+        for token in candidate["aria-label"].split():
+            try:
+                rating_value = float(token)
+                break
+            except ValueError:
+                continue
+        user_name = None
+        for possible in container.find_all(["span", "div"]):
+            txt = possible.get_text(strip=True)
+            if txt and "stars" not in txt.lower() and len(txt.split()) <= 4:
+                user_name = txt
+                break
+        review_text = ""
+        longest = 0
+        for possible in container.find_all(["span", "div", "p"]):
+            txt = possible.get_text(" ", strip=True)
+            if txt and len(txt) > longest and "stars" not in txt.lower():
+                longest = len(txt)
+                review_text = txt
+        if not review_text:
+            continue
+        reviews.append(
+            {
+                "userName": user_name or "Unknown",
+                "score": rating_value,
+                "text": review_text,
+                "date": None,
+                "version": None,
+                "thumbsUp": None,
+            }
+        )
+        seen += 1
+        if seen >= max_reviews:
+            break
+    return reviews
+
+def _shared_parent_page(reviews: int) -> str:
+    cards = "".join(
+        f'<div aria-label="Rated {i % 5 + 1} stars"></div><span>User {i}</span>'
+        f"<p>{'word ' * (10 + i % 30)}</p>"
+        for i in range(reviews)
+    )
+    return f"<html><body><div>{cards}</div></body></html>"
+
+def _nested_page(reviews: int) -> str:
+    html = ""
+    for i in range(reviews):
+        html = (
+            f'<div><div aria-label="Rated {i % 5 + 1} stars"></div><span>User {i}</span>'
+            f"<p>{'word ' * (10 + i % 30)}</p>{html}</div>"
+        )
+    return f"<html><body>{html}</body></html>"
+
+def _time(fn: Callable[[BeautifulSoup, int], Any], soup: BeautifulSoup, max_reviews: int) -> float:
+    started = time.perf_counter()
+    fn(soup, max_reviews)
+    return time.perf_counter() - started
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=300)
+    parser.add_argument("--max-reviews", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    pages = {
+        "cards": details_page(reviews=args.reviews),
+        "sharedParent": _shared_parent_page(args.reviews),
+        "nested": _nested_page(args.reviews),
+    }
+    results: Dict[str, Any] = {}
+    failed = False
+    for name, html in pages.items():
+        soup = parse_html(html)
+        same = _previous_parse_reviews(soup, args.max_reviews) == _parse_reviews_from_page(
+            soup, args.max_reviews
+        )
+        failed = failed or not same
+        previous = _time(_previous_parse_reviews, soup, args.max_reviews)
+        current = _time(_parse_reviews_from_page, soup, args.max_reviews)
+        results[name] = {
+            "identical": same,
+            "previousSeconds": round(previous, 4),
+            "currentSeconds": round(current, 4),
+            "speedup": round(previous / current, 1),
+        }
+
+    print(json.dumps(results, indent=2))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
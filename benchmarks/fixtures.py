@@ -0,0 +1,159 @@
+"""
+Synthetic Google Play pages for offline benchmarks.
+
+The markup mirrors what the extractors look for on real store pages (meta
+tags, contact links, category links, screenshot images and review cards
+labelled "Rated N stars"), padded with nested layout divs so parse cost is
+in the same range as a live details page. Output is deterministic.
+
+Saved copies of the standard pages live in ``pages/`` (gzipped) so that
+benchmark results do not move when the generators change; rebuild them
+with ``python benchmarks/fixtures.py``.
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+
+def _review_card(idx: int) -> str:
+    stars = idx % 5 + 1
+    words = " ".join(f"word{(idx * 7 + w) % 97}" for w in range(20 + idx % 40))
+    return (
+        '<div role="listitem"><div class="hdr">'
+        f'<div aria-label="Rated {stars} stars out of five stars" role="img"></div>'
+        f"<span>User {idx}</span></div>"
+        f'<div class="body"><span>{words}</span></div>'
+        f"<div>{idx % 300} people found this review helpful</div></div>"
+    )
+
+def _layout_block(idx: int, depth: int) -> str:
+    inner = f"<span>Section {idx}</span><p>Filler paragraph {idx} for layout.</p>"
+    for level in range(depth):
+        inner = f'<div class="l{level}">{inner}</div>'
+    return inner
+
+def details_page(
+    app_id: str = "com.example.app",
+    reviews: int = 40,
+    screenshots: int = 12,
+    layout_blocks: int = 50,
+    layout_depth: int = 8,
+) -> str:
+    parts: List[str] = [
+        "<!DOCTYPE html><html><head>",
+        f'<meta property="og:title" content="Example App {app_id}">',
+        '<meta property="og:description" content="An example application used for benchmarks.">',
+        '<meta itemprop="ratingValue" content="4.3">',
+        '<meta property="og:video" content="https://www.youtube.com/embed/example">',
+        "</head><body><div id='root'>",
+        f"<h1>Example App {app_id}</h1>",
+        '<a href="/store/apps/category/GAME_ARCADE">Arcade</a>',
+        '<a href="/store/apps/category/GAME_CASUAL">Casual</a>',
+        "<div><span>1,000,000+ downloads</span></div>",
+    ]
+    for idx in range(layout_blocks):
+        parts.append(_layout_block(idx, layout_depth))
+    for idx in range(screenshots):
+        parts.append(
+            f'<img data-src="https://play-lh.googleusercontent.com/shot{idx}" alt="Screenshot">'
+        )
+    parts.append('<div role="list">')
+    for idx in range(reviews):
+        parts.append(_review_card(idx))
+    parts.append("</div>")
+    parts.extend(
+        [
+            "<div>",
+            '<a href="https://support.google.com/googleplay">Help</a>',
+            '<a href="mailto:support@example.com">Email</a>',
+            '<a href="https://www.example.com">Website</a>',
+            "</div></div>",
+            "<div>Address\n1 Example Street\nSpringfield</div>",
+            "</body></html>",
+        ]
+    )
+    return "".join(parts)
+
+def listing_page(
+    apps: int = 50,
+    prefix: str = "com.example",
+    clusters: Sequence[str] = (),
+) -> str:
+    """
+    Search or category results page with ``apps`` app cards, and a "See
+    more" link to each of the ``clusters`` collections.
+    """
+    parts: List[str] = ["<!DOCTYPE html><html><body><div>"]
+    for idx in range(apps):
+        parts.append(
+            f'<div class="card"><a href="/store/apps/details?id={prefix}.app{idx}&hl=en">'
+            f"<span>App {idx}</span></a></div>"
+        )
+    for cluster in clusters:
+        parts.append(f'<a href="/store/apps/collection/cluster?clp={cluster}">See more</a>')
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+def review_feed_page(
+    app_id: str = "com.example.app",
+    token: Optional[str] = None,
+    page_size: int = 100,
+    total: int = 500,
+    filter_score: Optional[int] = None,
+) -> str:
+    """
+    One batchexecute review page in the store's wire format. Tokens are the
+    stringified offset of the next page; the last page carries no token.
+    """
+    matching = [idx for idx in range(total) if filter_score in (None, idx % 5 + 1)]
+    start = int(token) if token else 0
+    entries = []
+    for idx in matching[start:start + page_size]:
+        words = " ".join(f"word{(idx * 7 + w) % 97}" for w in range(20 + idx % 40))
+        entries.append([
+            f"gp:{app_id}:{idx}",
+            [f"User {idx}", None],
+            idx % 5 + 1,
+            None,
+            words,
+            [1700000000 - idx * 3600, 0],
+            idx % 300,
+            None,
+            None,
+            None,
+            f"1.{idx % 10}.0",
+        ])
+    end = start + page_size
+    next_token = str(end) if end < len(matching) else None
+    payload = [entries, [None, next_token] if next_token else None, None]
+    envelope = [["wrb.fr", "UsvDTd", json.dumps(payload), None, None, None, "generic"]]
+    return ")]}'\n\n" + json.dumps(envelope)
+
+# Saved fixture pages: name -> generator.
+PAGES: Dict[str, Callable[[], str]] = {
+    "details": lambda: details_page("com.example.app"),
+    "details_large": lambda: details_page(
+        "com.example.large", layout_blocks=1000, layout_depth=12
+    ),
+    "details_reviews": lambda: details_page("com.example.reviews", reviews=1000),
+    "search": lambda: listing_page(50, prefix="com.example.search"),
+    "category": lambda: listing_page(500, prefix="com.example.category"),
+}
+
+def load_page(name: str) -> str:
+    with gzip.open(PAGES_DIR / f"{name}.html.gz", "rt", encoding="utf-8") as f:
+        return f.read()
+
+def write_pages(target_dir: Path = PAGES_DIR) -> None:
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for name, build in PAGES.items():
+        # mtime=0 keeps the compressed files byte-identical between rebuilds.
+        with (target_dir / f"{name}.html.gz").open("wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                f.write(build().encode("utf-8"))
+
+if __name__ == "__main__":
+    write_pages()
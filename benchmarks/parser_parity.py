@@ -0,0 +1,65 @@
+"""
+Check that every HTML parser backend yields identical records, and report
+parse plus extraction time per backend.
+
+Exits non-zero when any backend disagrees with the ``html.parser`` baseline.
+
+    python benchmarks/parser_parity.py
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from extractors.app_details import extract_app_details  # noqa: E402
+from extractors.categories_parser import _extract_app_cards  # noqa: E402
+from extractors.reviews_parser import extract_app_reviews  # noqa: E402
+from fixtures import details_page, listing_page  # noqa: E402
+from utils.html_parser import PARSER_BACKENDS, parse_html  # noqa: E402
+
+PAGES = {
+    "details": ("details", details_page()),
+    "details_large": ("details", details_page(reviews=400, layout_blocks=800, layout_depth=10)),
+    "details_no_reviews": ("details", details_page(reviews=0, screenshots=0)),
+    "search": ("listing", listing_page(apps=60)),
+    "category": ("listing", listing_page(apps=200, prefix="com.category")),
+}
+
+def _extract(kind: str, html: str, backend: str) -> Any:
+    soup = parse_html(html, parser=backend)
+    if kind == "details":
+        return {
+            "details": extract_app_details(soup, "com.example.app"),
+            "reviews": extract_app_reviews(soup, "com.example.app", max_reviews=1000),
+        }
+    return _extract_app_cards(soup, max_results=1000)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    mismatches: List[str] = []
+    timings: Dict[str, Dict[str, float]] = {}
+    for page_name, (kind, html) in PAGES.items():
+        baseline = _extract(kind, html, "html.parser")
+        timings[page_name] = {}
+        for backend in PARSER_BACKENDS:
+            result = _extract(kind, html, backend)
+            if result != baseline:
+                mismatches.append(f"{page_name}: {backend} differs from html.parser")
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                _extract(kind, html, backend)
+            timings[page_name][backend] = round((time.perf_counter() - started) / args.repeat, 4)
+
+    print(json.dumps({"secondsPerPage": timings, "mismatches": mismatches}, indent=2))
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,195 @@
+"""
+Local stand-in for the Google Play endpoints used by the scraper.
+
+Serves synthetic pages from ``fixtures`` for ``/store/apps/details``,
+``/store/search`` and ``/store/apps/category/<id>``, plus the paginated
+review feed on ``/_/PlayStoreUi/data/batchexecute``, with an optional
+per-request latency to imitate network round trips.
+
+With ``clusters`` set, every search or category lists its own apps and
+links to that many result clusters of its own plus one "top" cluster
+shared by all queries (served on ``/store/apps/collection/cluster``).
+Otherwise every query lists the same apps.
+
+Faults can be injected as well: with ``capacity`` set, requests beyond that
+many in flight are answered with 429, and ``error_rate`` makes that share
+of requests fail with a 503. With ``retry_after`` set, a 429 carries that
+Retry-After and the server refuses every request until it has passed, the
+way real rate limiters penalise clients that keep pushing.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from fixtures import details_page, listing_page, review_feed_page
+
+class StubPlayServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        reviews: int = 40,
+        capacity: int = 0,
+        error_rate: float = 0.0,
+        retry_after: Optional[float] = None,
+        clusters: int = 0,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.latency = latency
+        self.reviews = reviews
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.clusters = clusters
+        self.requests_served = 0
+        self.in_flight = 0
+        self.throttled = 0
+        self.errors = 0
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self) -> "StubPlayServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def admit(self) -> Optional[int]:
+        """
+        Count a request and decide whether to fail it. Returns the status
+        to answer with instead of serving it, or None when it is admitted
+        (and must then be finished with ``done``).
+        """
+        with self._lock:
+            self.requests_served += 1
+            now = time.monotonic()
+            if now < self.blocked_until:
+                self.throttled += 1
+                return 429
+            if self.capacity and self.in_flight >= self.capacity:
+                self.throttled += 1
+                if self.retry_after:
+                    self.blocked_until = now + self.retry_after
+                return 429
+            if self.error_rate and random.random() < self.error_rate:
+                self.errors += 1
+                return 503
+            self.in_flight += 1
+            return None
+
+    def done(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def fault_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requestsServed": self.requests_served,
+                "throttled": self.throttled,
+                "errors": self.errors,
+            }
+
+    def urls(self) -> Dict[str, str]:
+        return {
+            "base_url": f"{self.base_url}/store/apps/details",
+            "reviews_url": f"{self.base_url}/store/apps/details",
+            "search_url": f"{self.base_url}/store/search",
+            "category_url": f"{self.base_url}/store/apps/category",
+            "reviews_rpc_url": f"{self.base_url}/_/PlayStoreUi/data/batchexecute",
+        }
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: StubPlayServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._serve(self._get)
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._serve(self._post)
+
+    def _serve(self, handler: Callable[[], None]) -> None:
+        status = self.server.admit()
+        if status is not None:
+            # Drain the body so the kept-alive connection stays usable.
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            headers = {}
+            if self.server.retry_after is not None:
+                headers["Retry-After"] = f"{self.server.retry_after:g}"
+            self._send(status, "unavailable", headers)
+            return
+        try:
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            handler()
+        finally:
+            self.server.done()
+
+    def _get(self) -> None:
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path.endswith("/store/apps/details"):
+            app_id = query.get("id", ["com.example.app"])[0]
+            body = details_page(app_id, reviews=self.server.reviews)
+        elif parsed.path.endswith("/store/search") or "/store/apps/category/" in parsed.path:
+            body = self._listing(query.get("q", [parsed.path.rsplit("/", 1)[-1]])[0])
+        elif parsed.path.endswith("/store/apps/collection/cluster"):
+            body = listing_page(prefix=query.get("clp", ["com.example.top"])[0])
+        else:
+            self._send(404, "not found")
+            return
+        self._send(200, body)
+
+    def _listing(self, query: str) -> str:
+        if not self.server.clusters:
+            return listing_page()
+        prefix = "com." + "".join(ch for ch in query.lower() if ch.isalnum())
+        clusters = [f"{prefix}.more{idx}" for idx in range(self.server.clusters)]
+        return listing_page(prefix=prefix, clusters=clusters + ["com.example.top"])
+
+    def _post(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        if not urlparse(self.path).path.endswith("/data/batchexecute") or "f.req" not in form:
+            self._send(404, "not found")
+            return
+
+        inner = json.loads(json.loads(form["f.req"][0])[0][0][1])
+        page_size, _, token = inner[2][2]
+        filter_score = inner[2][4][1]
+        body = review_feed_page(
+            inner[3][0],
+            token=token,
+            page_size=page_size,
+            total=self.server.reviews,
+            filter_score=filter_score,
+        )
+        self._send(200, body)
+
+    def _send(self, status: int, body: str, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
@@ -0,0 +1,266 @@
+"""
+Benchmark suite: micro-benchmarks for the parsing helpers and writers on the
+saved fixture pages in ``pages/``, plus end-to-end ``main()`` runs against
+the local stub server.
+
+    python benchmarks/suite.py --output baseline.json
+    python benchmarks/suite.py --baseline baseline.json --output current.json
+
+Results are JSON: for every benchmark, the median and minimum seconds per
+call over ``--repeat`` runs. With ``--baseline``, a benchmark whose median
+is slower than the baseline by more than its threshold (``thresholds.json``,
+matched by name pattern) is reported as a regression and the exit code is 1.
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import main as scraper_main  # noqa: E402
+from extractors.app_details import extract_app_details  # noqa: E402
+from extractors.categories_parser import _extract_app_cards  # noqa: E402
+from extractors.reviews_parser import _parse_reviews_from_page, extract_app_reviews  # noqa: E402
+from fixtures import load_page  # noqa: E402
+import legacy_details  # noqa: E402
+from outputs.writer_csv import write_csv, write_csv_tables  # noqa: E402
+from outputs.writer_excel import write_excel  # noqa: E402
+from outputs.writer_json import write_json  # noqa: E402
+from outputs.writer_jsonl import write_jsonl  # noqa: E402
+from outputs.writer_parquet import pa, write_parquet  # noqa: E402
+from stub_server import StubPlayServer  # noqa: E402
+from utils.formatters import merge_app_and_reviews  # noqa: E402
+from utils.html_parser import parse_html  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+THRESHOLDS_PATH = BENCH_DIR / "thresholds.json"
+
+# (name, function, calls per timed run)
+Benchmark = Tuple[str, Callable[[], Any], int]
+
+def _parse_helpers() -> List[str]:
+    return sorted(name for name in dir(legacy_details) if name.startswith("_parse_"))
+
+def micro_benchmarks(number: int) -> Iterator[Benchmark]:
+    pages = {
+        name: load_page(name)
+        for name in ("details", "details_large", "details_reviews", "search", "category")
+    }
+    soups = {name: parse_html(html) for name, html in pages.items()}
+
+    for name, html in pages.items():
+        yield f"parse_html.{name}", lambda html=html: parse_html(html), max(1, number // 4)
+
+    for page in ("details", "details_large"):
+        soup = soups[page]
+        for helper in _parse_helpers():
+            fn = getattr(legacy_details, helper)
+            yield f"details.{helper}.{page}", lambda fn=fn, soup=soup: fn(soup), number
+        yield (
+            f"details.extract_app_details.{page}",
+            lambda soup=soup: extract_app_details(soup, "com.example.app"),
+            number,
+        )
+
+    for page in ("details", "details_reviews"):
+        soup = soups[page]
+        yield (
+            f"reviews._parse_reviews_from_page.{page}",
+            lambda soup=soup: _parse_reviews_from_page(soup, max_reviews=1_000_000),
+            number,
+        )
+
+    for page in ("search", "category"):
+        soup = soups[page]
+        yield (
+            f"cards._extract_app_cards.{page}",
+            lambda soup=soup: _extract_app_cards(soup, max_results=1_000_000),
+            number,
+        )
+
+def _sample_records(apps: int) -> List[Dict[str, Any]]:
+    soup = parse_html(load_page("details"))
+    details = extract_app_details(soup, "com.example.app")
+    reviews = extract_app_reviews(soup, "com.example.app", max_reviews=1_000_000)
+    records = []
+    for idx in range(apps):
+        record = merge_app_and_reviews({**details, "appId": f"com.example.app{idx}"}, reviews)
+        records.append(record)
+    return records
+
+def writer_benchmarks(records: List[Dict[str, Any]], out_dir: Path) -> Iterator[Benchmark]:
+    writers: Dict[str, Callable[[Path], None]] = {
+        "json": lambda path: write_json(records, path),
+        "jsonl": lambda path: write_jsonl(records, path),
+        "csv": lambda path: write_csv(records, path),
+        "csv_normalized": lambda path: write_csv_tables(records, path),
+        "excel": lambda path: write_excel(records, path),
+    }
+    if pa is not None:
+        writers["parquet"] = lambda path: write_parquet(records, path)
+    for name, write in writers.items():
+        path = out_dir / f"writer_{name}"
+        yield f"writer.{name}", lambda write=write, path=path: write(path), 1
+
+def e2e_benchmarks(server: StubPlayServer, work_dir: Path, apps: int) -> Iterator[Benchmark]:
+    app_ids_file = work_dir / "app_ids.txt"
+    app_ids_file.write_text(
+        "".join(f"com.example.e2e{idx}\n" for idx in range(apps)), encoding="utf-8"
+    )
+    config_path = work_dir / "settings.json"
+    config = {
+        "input_app_ids_file": str(app_ids_file),
+        "output_dir": str(work_dir / "out"),
+        "output_format": "jsonl",
+        "max_apps": apps,
+        "max_reviews_per_app": 20,
+        **server.urls(),
+    }
+    config_path.write_text(json.dumps(config), encoding="utf-8")
+
+    def run(*args: str) -> None:
+        code = scraper_main.main(["--config", str(config_path), *args])
+        if code != 0:
+            raise RuntimeError(f"main() exited with {code} for {args}")
+
+    runs = {
+        "app_ids.sequential": ["--mode", "app_ids", "--concurrency", "1"],
+        "app_ids.threads": ["--mode", "app_ids", "--concurrency", "8"],
+        "app_ids.async": ["--mode", "app_ids", "--concurrency", "8", "--async"],
+        "keyword": ["--mode", "keyword", "--keyword", "puzzle", "--concurrency", "8"],
+        "category": ["--mode", "category", "--category", "GAME_ARCADE", "--concurrency", "8"],
+    }
+    for name, args in runs.items():
+        yield f"e2e.{name}", lambda args=args: run(*args), 1
+
+def measure(fn: Callable[[], Any], number: int, repeat: int) -> Dict[str, Any]:
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        # Like timeit: a collection of the parsed fixture trees would
+        # otherwise land in whichever benchmark happens to trigger it.
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            timings.append((time.perf_counter() - started) / number)
+        finally:
+            gc.enable()
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "repeat": repeat,
+        "number": number,
+    }
+
+def load_thresholds(path: Path) -> Dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+def threshold_for(name: str, thresholds: Dict[str, Any]) -> float:
+    for pattern, value in thresholds.get("overrides", {}).items():
+        if fnmatch.fnmatchcase(name, pattern):
+            return float(value)
+    return float(thresholds.get("default", 0.25))
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    thresholds: Dict[str, Any],
+) -> Dict[str, Dict[str, Any]]:
+    comparison: Dict[str, Dict[str, Any]] = {}
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            comparison[name] = {"status": "new"}
+            continue
+        limit = threshold_for(name, thresholds)
+        ratio = result["median"] / previous["median"] if previous["median"] else 1.0
+        if ratio > 1 + limit:
+            status = "regressed"
+        elif ratio < 1 / (1 + limit):
+            status = "improved"
+        else:
+            status = "ok"
+        comparison[name] = {"status": status, "ratio": round(ratio, 3), "threshold": limit}
+    return comparison
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filter", default="*", help="Only run benchmarks matching this pattern.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20, help="Calls per timed micro run.")
+    parser.add_argument("--writer-records", type=int, default=200)
+    parser.add_argument("--e2e-apps", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub server latency.")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--output", type=Path, help="Also write the results to this file.")
+    parser.add_argument("--baseline", type=Path, help="Results file to check for regressions.")
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS_PATH)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    server: Optional[StubPlayServer] = None
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        suites = [
+            micro_benchmarks(args.number),
+            writer_benchmarks(_sample_records(args.writer_records), work_dir),
+        ]
+        if not args.skip_e2e:
+            server = StubPlayServer(latency=args.latency, reviews=20).start()
+            suites.append(e2e_benchmarks(server, work_dir, args.e2e_apps))
+        # Keep the scraper's per-app logging out of the timings.
+        logging.disable(logging.WARNING)
+        try:
+            for benchmarks in suites:
+                for name, fn, number in benchmarks:
+                    if not fnmatch.fnmatchcase(name, args.filter):
+                        continue
+                    repeat = min(args.repeat, 3) if name.startswith(("writer.", "e2e.")) else args.repeat
+                    results[name] = measure(fn, number, repeat)
+                    print(f"{name}: {results[name]['median'] * 1000:.3f} ms", file=sys.stderr)
+        finally:
+            logging.disable(logging.NOTSET)
+            if server is not None:
+                server.stop()
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "latency": args.latency,
+        },
+        "results": results,
+    }
+    regressed = []
+    if args.baseline is not None:
+        with args.baseline.open("r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        comparison = compare(results, baseline, load_thresholds(args.thresholds))
+        report["comparison"] = comparison
+        regressed = [name for name, entry in comparison.items() if entry["status"] == "regressed"]
+        report["regressions"] = regressed
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(json.dumps(report, indent=2))
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
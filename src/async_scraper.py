@@ -0,0 +1,225 @@
+import asyncio
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from extractors.app_details import extract_app_details
+from extractors.async_extractors import async_fetch_app_reviews_paginated
+from extractors.review_pages import REVIEWS_RPC_URL, load_review_cursor
+from extractors.reviews_parser import extract_app_reviews
+from scraper import UNCHANGED, RecordSink
+from utils.async_request_client import AsyncRequestClient
+from utils.fingerprints import FingerprintStore
+from utils.formatters import merge_app_and_reviews
+from utils.http_cache import HttpCache
+from utils.metrics import metrics
+from utils.page_archive import ArchiveWriter
+from utils.page_fetcher import AsyncPageFetcher
+from utils.rate_control import RateController
+from utils.records import AppRecord, Review, wants_reviews
+from utils.run_journal import RunJournal
+
+logger = logging.getLogger(__name__)
+
+def build_async_client(
+    cfg: Dict[str, Any],
+    cache: Optional[HttpCache] = None,
+    rate_controller: Optional[RateController] = None,
+    archive: Optional[ArchiveWriter] = None,
+) -> AsyncRequestClient:
+    return AsyncRequestClient(
+        user_agent=cfg.get("user_agent", "Mozilla/5.0"),
+        limit_per_host=cfg.get("async_limit_per_host", 0),
+        cache=cache,
+        max_backoff=cfg.get("max_backoff_seconds", 30.0),
+        rate_controller=rate_controller,
+        archive=archive,
+    )
+
+async def _async_fetch_paginated_reviews(
+    client: AsyncRequestClient,
+    app_id: str,
+    cfg: Dict[str, Any],
+) -> Tuple[List[Review], Optional[Dict[str, Any]]]:
+    """
+    Reviews from the paginated feed, resumed from the app's saved cursor,
+    and the cursor to save once they are written (None without a cursor
+    directory).
+    """
+    cursor_dir = cfg.get("review_cursor_dir")
+    cursor = load_review_cursor(Path(cursor_dir), app_id) if cursor_dir else None
+    reviews, cursor = await async_fetch_app_reviews_paginated(
+        client=client,
+        app_id=app_id,
+        language=cfg.get("language", "en_US"),
+        max_reviews=cfg.get("max_reviews_per_app", 50),
+        sort=cfg.get("review_sort", "newest"),
+        filter_score=cfg.get("review_filter_score"),
+        cursor=cursor,
+        rpc_url=cfg.get("reviews_rpc_url", REVIEWS_RPC_URL),
+    )
+    return reviews, cursor if cursor_dir else None
+
+async def async_scrape_app(
+    client: AsyncRequestClient,
+    fetcher: AsyncPageFetcher,
+    app_id: str,
+    cfg: Dict[str, Any],
+    fingerprints: Optional[FingerprintStore] = None,
+) -> AppRecord:
+    """
+    Async version of ``scraper.scrape_app``.
+    """
+    language = cfg.get("language", "en_US")
+    base_url = cfg.get("base_url")
+    reviews_url = cfg.get("reviews_url", base_url)
+    params = {"id": app_id, "hl": language}
+    paginated = cfg.get("review_source", "page") == "paginated"
+    fields = cfg.get("fields")
+
+    page_digest = None
+    review_cursor = None
+    # Pages this call holds in the fetcher, each released exactly once.
+    held: List[str] = []
+    try:
+        if fingerprints is not None:
+            page_digest = fingerprints.page_digest(await fetcher.get_text(base_url, params=params))
+            held.append(base_url)
+            if not paginated and fingerprints.page_unchanged(app_id, page_digest):
+                return UNCHANGED
+
+        logger.debug("Requesting app details for %s with params %s", app_id, params)
+        details_soup = await fetcher.get_soup(base_url, params=params)
+        held.append(base_url)
+        details = extract_app_details(details_soup, app_id, fields=fields)
+        if not wants_reviews(fields):
+            reviews = []
+        elif paginated:
+            reviews, review_cursor = await _async_fetch_paginated_reviews(client, app_id, cfg)
+        else:
+            logger.debug("Requesting reviews for %s from %s", app_id, reviews_url)
+            reviews_soup = await fetcher.get_soup(reviews_url, params=params)
+            held.append(reviews_url)
+            reviews = extract_app_reviews(
+                reviews_soup, app_id, max_reviews=cfg.get("max_reviews_per_app", 50)
+            )
+    finally:
+        for url in held:
+            fetcher.release(url, params=params)
+
+    record = merge_app_and_reviews(details, reviews)
+    record.review_cursor = review_cursor
+    if fingerprints is not None and fingerprints.classify(app_id, page_digest, record) is None:
+        return UNCHANGED
+    return record
+
+async def async_iter_scraped_apps(
+    client: AsyncRequestClient,
+    app_ids: List[str],
+    cfg: Dict[str, Any],
+    fingerprints: Optional[FingerprintStore] = None,
+) -> AsyncIterator[Tuple[str, Optional[AppRecord]]]:
+    """
+    Async version of ``scraper.iter_scraped_apps``.
+
+    Up to ``cfg["concurrency"]`` apps are in flight at once and results are
+    yielded in input order, with None in place of apps that failed. Tasks are
+    created for a bounded window only, so memory does not grow with the size
+    of the input list.
+    """
+    concurrency = max(1, int(cfg.get("concurrency", 1)))
+    semaphore = asyncio.Semaphore(concurrency)
+    fetcher = AsyncPageFetcher(client)
+    total = len(app_ids)
+
+    async def scrape_one(idx: int, app_id: str) -> Optional[AppRecord]:
+        async with semaphore:
+            logger.info("Processing app %d/%d: %s", idx, total, app_id)
+            try:
+                with metrics.time("app_seconds", engine="async"):
+                    return await async_scrape_app(client, fetcher, app_id, cfg, fingerprints)
+            except Exception as e:  # noqa: BLE001
+                logger.exception("Failed to fetch data for app %s: %s", app_id, e)
+                metrics.inc("apps_failed_total")
+                return None
+
+    window = concurrency * 2
+    pending: Deque[Tuple[str, "asyncio.Task[Optional[AppRecord]]"]] = deque()
+    try:
+        for idx, app_id in enumerate(app_ids, start=1):
+            pending.append((app_id, asyncio.ensure_future(scrape_one(idx, app_id))))
+            if len(pending) >= window:
+                done_id, done_task = pending.popleft()
+                yield done_id, await done_task
+        while pending:
+            done_id, done_task = pending.popleft()
+            yield done_id, await done_task
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+    stats = fetcher.stats()
+    logger.info(
+        "Page requests: %d sent, %d saved by sharing pages between extractors.",
+        stats["requestsMade"],
+        stats["requestsSaved"],
+    )
+
+async def async_scrape_app_ids(
+    client: AsyncRequestClient,
+    app_ids: List[str],
+    cfg: Dict[str, Any],
+    sink: Optional[RecordSink] = None,
+    journal: Optional[RunJournal] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+) -> List[Optional[AppRecord]]:
+    """
+    Scrape ``app_ids`` on the running event loop.
+
+    The returned list is in input order, with None in place of apps that
+    failed. When ``sink`` is given, successful records are passed to it as
+    soon as they are ready and are not collected in the returned list. With a
+    ``journal``, apps it lists as done are skipped and every outcome is
+    recorded in it. With ``fingerprints``, apps unchanged since the previous
+    run are left out.
+    """
+    if fingerprints is not None:
+        fingerprints.expect(app_ids)
+    if journal is not None:
+        app_ids = journal.pending(app_ids)
+
+    results: List[Optional[AppRecord]] = []
+    async for app_id, record in async_iter_scraped_apps(client, app_ids, cfg, fingerprints):
+        if record is UNCHANGED:
+            if journal is not None:
+                journal.mark_done(app_id)
+            continue
+        if sink is None:
+            results.append(record)
+        elif record is not None:
+            sink(record)
+        if journal is not None:
+            if record is None:
+                journal.mark_failed(app_id)
+            else:
+                journal.mark_done(app_id)
+    return results
+
+async def async_run_with_app_ids(
+    app_ids: List[str],
+    cfg: Dict[str, Any],
+    cache: Optional[HttpCache] = None,
+    rate_controller: Optional[RateController] = None,
+    archive: Optional[ArchiveWriter] = None,
+    sink: Optional[RecordSink] = None,
+    journal: Optional[RunJournal] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+) -> List[AppRecord]:
+    async with build_async_client(
+        cfg, cache=cache, rate_controller=rate_controller, archive=archive
+    ) as client:
+        results = await async_scrape_app_ids(
+            client, app_ids, cfg, sink=sink, journal=journal, fingerprints=fingerprints
+        )
+    return [record for record in results if record is not None]
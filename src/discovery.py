@@ -0,0 +1,128 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from extractors.categories_parser import CATEGORY_BASE_URL, SEARCH_BASE_URL, fetch_listing_page
+from utils.request_client import RequestClient
+
+logger = logging.getLogger(__name__)
+
+QUERY_KINDS = ("keyword", "category")
+
+# ("keyword", "puzzle") or ("category", "GAME_ARCADE").
+DiscoveryQuery = Tuple[str, str]
+
+def read_queries(file_path: Path, kind: str) -> List[DiscoveryQuery]:
+    """
+    One keyword or category per line; blank lines and lines starting with
+    ``#`` are skipped. A ``#`` anywhere else is part of the query ("c#").
+    """
+    if not file_path.exists():
+        raise FileNotFoundError(f"Query file not found: {file_path}")
+    queries: List[DiscoveryQuery] = []
+    with file_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            value = line.strip()
+            if value and not value.startswith("#"):
+                queries.append((kind, value))
+    return queries
+
+def query_page(query: DiscoveryQuery, cfg: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    kind, value = query
+    language = cfg.get("language", "en_US")
+    if kind == "keyword":
+        return cfg.get("search_url", SEARCH_BASE_URL), {"q": value, "c": "apps", "hl": language}
+    if kind == "category":
+        return f"{cfg.get('category_url', CATEGORY_BASE_URL)}/{value}", {"hl": language}
+    raise ValueError(f"Unsupported query kind '{kind}'. Allowed: {', '.join(QUERY_KINDS)}.")
+
+def explore_query(
+    client: RequestClient,
+    query: DiscoveryQuery,
+    cfg: Dict[str, Any],
+    visited: Optional[Set[str]] = None,
+    visited_lock: Optional[threading.Lock] = None,
+) -> List[str]:
+    """
+    App IDs listed for one query: its result page, then the result clusters
+    it links to, breadth first, up to ``cfg["discovery_max_pages"]`` pages
+    and ``cfg["discovery_max_per_query"]`` apps (never more than
+    ``cfg["max_apps"]``).
+
+    Cluster pages already in ``visited`` (shared between queries) are not
+    fetched again. A page that fails is logged and skipped.
+    """
+    max_pages = max(1, int(cfg.get("discovery_max_pages") or 5))
+    limit = cfg.get("max_apps", 50)
+    if cfg.get("discovery_max_per_query"):
+        limit = min(limit, cfg["discovery_max_per_query"])
+    language = cfg.get("language", "en_US")
+    visited = visited if visited is not None else set()
+    visited_lock = visited_lock or threading.Lock()
+
+    frontier: Deque[Tuple[str, Dict[str, Any]]] = deque([query_page(query, cfg)])
+    found: List[str] = []
+    pages = 0
+    while frontier and pages < max_pages:
+        url, params = frontier.popleft()
+        if pages:
+            with visited_lock:
+                if url in visited:
+                    continue
+                visited.add(url)
+        try:
+            apps, clusters = fetch_listing_page(client, url, params=params)
+        except Exception as e:  # noqa: BLE001
+            logger.exception("Failed to fetch %s results page %s: %s", query[0], url, e)
+            continue
+        pages += 1
+        found.extend(app["appId"] for app in apps)
+        if len(found) >= limit:
+            return found[:limit]
+        frontier.extend((link, {"hl": language}) for link in clusters)
+    return found
+
+def discover_app_ids(
+    client: RequestClient,
+    queries: Iterable[DiscoveryQuery],
+    cfg: Dict[str, Any],
+) -> List[str]:
+    """
+    Run every query and return the app IDs they list, deduplicated in
+    memory and in query order, capped at ``cfg["max_apps"]``.
+
+    Queries are explored by ``cfg["concurrency"]`` threads; once enough apps
+    are found, queries that have not started yet are cancelled.
+    """
+    queries = list(dict.fromkeys(queries))
+    max_apps = cfg.get("max_apps", 50)
+    workers = max(1, int(cfg.get("concurrency", 1)))
+    visited: Set[str] = set()
+    visited_lock = threading.Lock()
+    seen: Dict[str, None] = {}
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discovery")
+    try:
+        futures: List["Future[List[str]]"] = [
+            executor.submit(explore_query, client, query, cfg, visited, visited_lock)
+            for query in queries
+        ]
+        for (kind, value), future in zip(queries, futures):
+            found = future.result()
+            before = len(seen)
+            seen.update(dict.fromkeys(found))
+            logger.info(
+                "Discovered %d apps for %s '%s' (%d new, %d total)",
+                len(found), kind, value, len(seen) - before, len(seen),
+            )
+            if len(seen) >= max_apps:
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    app_ids = list(seen)[:max_apps]
+    logger.info("Discovered %d unique apps from %d queries.", len(app_ids), len(queries))
+    return app_ids
@@ -1,183 +1,382 @@
 import logging
-from typing import Any, Dict, Optional
+from typing import Collection, Iterable, List, Optional, Set, Tuple, Type
 
 from bs4 import BeautifulSoup
+from bs4.element import Tag
 
+from extractors.dom_visitor import FieldHandler, walk_document
+
+from utils.metrics import metrics
+from utils.page_fetcher import PageFetcher
+from utils.records import AppRecord, select_fields
 from utils.request_client import RequestClient
 
 logger = logging.getLogger(__name__)
 
-def _parse_title(soup: BeautifulSoup) -> Optional[str]:
-    # New layout: meta property
-    og_title = soup.find("meta", property="og:title")
-    if og_title and og_title.get("content"):
-        return og_title["content"].strip()
-
-    # Legacy h1
-    h1 = soup.find("h1")
-    if h1 and h1.text:
-        return h1.text.strip()
-
-    return None
-
-def _parse_description(soup: BeautifulSoup) -> Optional[str]:
-    meta_desc = soup.find("meta", property="og:description")
-    if meta_desc and meta_desc.get("content"):
-        return meta_desc["content"].strip()
-
-    desc_div = soup.find("div", attrs={"itemprop": "description"})
-    if desc_div:
-        return desc_div.get_text(separator="\n").strip()
-
-    return None
-
-def _parse_score(soup: BeautifulSoup) -> Optional[float]:
-    try:
-        rating_meta = soup.find("meta", itemprop="ratingValue")
-        if rating_meta and rating_meta.get("content"):
-            return float(rating_meta["content"])
-    except (TypeError, ValueError):
-        logger.debug("Failed to parse rating score from meta.", exc_info=True)
-
-    try:
-        rating_span = soup.find("div", attrs={"aria-label": True})
-        if rating_span and rating_span.has_attr("aria-label"):
+# Single-pass field handlers. Each one reproduces the matching ``_parse_*``
+# helper in benchmarks/legacy_details.py, but receives elements from
+# ``walk_document`` instead of searching the whole tree itself.
+
+class _MetaFallbackHandler(FieldHandler):
+    """
+    Value of the first ``<meta property=...>`` tag, falling back to the
+    first element matched by ``_is_fallback`` when the meta has no content.
+    """
+
+    meta_property = ""
+    fallback_tag = ""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.tags = ("meta", self.fallback_tag)
+        self.meta: Optional[Tag] = None
+        self.meta_seen = False
+        self.fallback: Optional[Tag] = None
+
+    def _is_fallback(self, tag: Tag) -> bool:
+        return True
+
+    def start(self, tag: Tag) -> None:
+        if tag.name == "meta":
+            if not self.meta_seen and tag.get("property") == self.meta_property:
+                self.meta_seen = True
+                self.meta = tag
+        elif self.fallback is None and self._is_fallback(tag):
+            self.fallback = tag
+        meta_has_content = self.meta is not None and bool(self.meta.get("content"))
+        self.done = self.meta_seen and (meta_has_content or self.fallback is not None)
+
+class _TitleHandler(_MetaFallbackHandler):
+    field = "title"
+    meta_property = "og:title"
+    fallback_tag = "h1"
+
+    def result(self) -> Optional[str]:
+        if self.meta is not None and self.meta.get("content"):
+            return self.meta["content"].strip()
+        if self.fallback is not None and self.fallback.text:
+            return self.fallback.text.strip()
+        return None
+
+class _DescriptionHandler(_MetaFallbackHandler):
+    field = "description"
+    meta_property = "og:description"
+    fallback_tag = "div"
+
+    def _is_fallback(self, tag: Tag) -> bool:
+        return tag.get("itemprop") == "description"
+
+    def result(self) -> Optional[str]:
+        if self.meta is not None and self.meta.get("content"):
+            return self.meta["content"].strip()
+        if self.fallback is not None:
+            return self.fallback.get_text(separator="\n").strip()
+        return None
+
+class _ScoreHandler(FieldHandler):
+    field = "score"
+    tags = ("meta", "div")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.meta_seen = False
+        self.meta_score: Optional[float] = None
+        self.labelled_div: Optional[Tag] = None
+
+    def start(self, tag: Tag) -> None:
+        if tag.name == "meta":
+            if not self.meta_seen and tag.get("itemprop") == "ratingValue":
+                self.meta_seen = True
+                try:
+                    if tag.get("content"):
+                        self.meta_score = float(tag["content"])
+                except (TypeError, ValueError):
+                    logger.debug("Failed to parse rating score from meta.", exc_info=True)
+        elif self.labelled_div is None and tag.get("aria-label") is not None:
+            self.labelled_div = tag
+        self.done = self.meta_seen and (
+            self.meta_score is not None or self.labelled_div is not None
+        )
+
+    def result(self) -> Optional[float]:
+        if self.meta_score is not None:
+            return self.meta_score
+        if self.labelled_div is not None:
             # e.g. "Rated 4.2 stars out of five"
-            text = rating_span["aria-label"]
-            for token in text.split():
+            for token in self.labelled_div["aria-label"].split():
                 try:
                     return float(token)
                 except ValueError:
                     continue
-    except Exception:  # noqa: BLE001
-        logger.debug("Failed to parse rating score from aria-label.", exc_info=True)
+        return None
+
+class _InstallsHandler(FieldHandler):
+    field = "installs"
+    tags = ()  # the data-testid block can be any element
 
-    return None
+    def __init__(self) -> None:
+        super().__init__()
+        self.header_depth = 0
+        self.header_value: Optional[str] = None
+        self.span_value: Optional[str] = None
+        # One flag per open <span>: True when the span's text cannot
+        # contain the fallback pattern, which rules out its descendants too.
+        self.span_stack: List[bool] = []
+        self.failed_spans = 0
 
-def _parse_installs(soup: BeautifulSoup) -> Optional[str]:
-    # Google Play layout changes frequently; use data-testid labels where possible.
-    try:
-        elements = soup.select("[data-testid='play-review-header-info'] div")
-        for el in elements:
-            text = el.get_text(strip=True)
+    def start(self, tag: Tag) -> bool:
+        name = tag.name
+        if name == "div" and self.header_depth:
+            text = tag.get_text(strip=True)
             if "+" in text and any(ch.isdigit() for ch in text):
-                return text
-    except Exception:  # noqa: BLE001
-        logger.debug("Failed to parse installs from data-testid block.", exc_info=True)
-
-    # Fallback: search for patterns like "1,000,000+ downloads"
-    for span in soup.find_all("span"):
-        text = span.get_text(strip=True)
-        if "downloads" in text.lower() and "+" in text:
-            parts = text.split()
-            for part in parts:
-                if "+" in part and any(ch.isdigit() for ch in part):
-                    return part
-    return None
-
-def _parse_developer_email(soup: BeautifulSoup) -> Optional[str]:
-    # Email often appears in the "Contact" section as a mailto link
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
+                self.header_value = text
+                self.done = True
+                return False
+
+        wants_end = False
+        if tag.get("data-testid") == "play-review-header-info":
+            self.header_depth += 1
+            wants_end = True
+
+        if name == "span":
+            failed = self.failed_spans > 0 or self.span_value is not None
+            if not failed:
+                text = tag.get_text(strip=True)
+                if "downloads" in text.lower() and "+" in text:
+                    for part in text.split():
+                        if "+" in part and any(ch.isdigit() for ch in part):
+                            self.span_value = part
+                            break
+                else:
+                    failed = True
+            self.span_stack.append(failed)
+            self.failed_spans += failed
+            wants_end = True
+
+        return wants_end
+
+    def end(self, tag: Tag) -> None:
+        if tag.get("data-testid") == "play-review-header-info":
+            self.header_depth -= 1
+        if tag.name == "span":
+            self.failed_spans -= self.span_stack.pop()
+
+    def result(self) -> Optional[str]:
+        return self.header_value or self.span_value
+
+class _FirstLinkHandler(FieldHandler):
+    """
+    Value derived from the first ``<a href>`` accepted by ``_match``.
+    """
+
+    tags = ("a",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.value: Optional[str] = None
+
+    def _match(self, tag: Tag, href: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def start(self, tag: Tag) -> None:
+        href = tag.get("href")
+        if href is None:
+            return
+        value = self._match(tag, href)
+        if value is not None:
+            self.value = value
+            self.done = True
+
+    def result(self) -> Optional[str]:
+        return self.value
+
+class _DeveloperEmailHandler(_FirstLinkHandler):
+    field = "developerEmail"
+
+    def _match(self, tag: Tag, href: str) -> Optional[str]:
         if href.startswith("mailto:"):
             return href.replace("mailto:", "").strip()
-    return None
+        return None
 
-def _parse_developer_website(soup: BeautifulSoup) -> Optional[str]:
-    # Developer website also appears in contact section
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
+class _DeveloperWebsiteHandler(_FirstLinkHandler):
+    field = "developerWebsite"
+
+    def _match(self, tag: Tag, href: str) -> Optional[str]:
         if "http" in href and "support.google.com" not in href and "policies.google.com" not in href:
-            # avoid store internal links
             if "/store/apps/details" not in href and "/store/apps/dev" not in href:
                 return href
-    return None
-
-def _parse_developer_address(soup: BeautifulSoup) -> Optional[str]:
-    # Address often rendered as text block; detect via "Address" label
-    for div in soup.find_all("div"):
-        text = div.get_text(" ", strip=True)
-        if "Address" in text and "\n" in div.text:
-            parts = [line.strip() for line in div.text.splitlines() if line.strip()]
-            if len(parts) >= 2:
-                return " ".join(parts[1:])
-    return None
-
-def _parse_genre(soup: BeautifulSoup) -> Optional[str]:
-    # Genre/category usually shown as a link near title
-    for a in soup.find_all("a", href=True):
-        if "/store/apps/category/" in a["href"]:
-            return a.get_text(strip=True)
-    return None
-
-def _parse_categories(soup: BeautifulSoup) -> Optional[list[str]]:
-    categories: list[str] = []
-    for a in soup.find_all("a", href=True):
-        if "/store/apps/category/" in a["href"]:
-            label = a.get_text(strip=True)
-            if label and label not in categories:
-                categories.append(label)
-    return categories or None
-
-def _parse_screenshots(soup: BeautifulSoup) -> list[str]:
-    screenshots: list[str] = []
-    # Common pattern: <img ... data-src="https://play-lh.googleusercontent.com/...">
-    for img in soup.find_all("img"):
-        src = img.get("data-src") or img.get("src")
+        return None
+
+class _GenreHandler(_FirstLinkHandler):
+    field = "genre"
+
+    def _match(self, tag: Tag, href: str) -> Optional[str]:
+        if "/store/apps/category/" in href:
+            return tag.get_text(strip=True)
+        return None
+
+class _CategoriesHandler(FieldHandler):
+    field = "categories"
+    tags = ("a",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.categories: List[str] = []
+
+    def start(self, tag: Tag) -> None:
+        href = tag.get("href")
+        if href is not None and "/store/apps/category/" in href:
+            label = tag.get_text(strip=True)
+            if label and label not in self.categories:
+                self.categories.append(label)
+
+    def result(self) -> Optional[List[str]]:
+        return self.categories or None
+
+class _ScreenshotsHandler(FieldHandler):
+    field = "screenshots"
+    tags = ("img",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.screenshots: List[str] = []
+        self.seen: Set[str] = set()
+
+    def start(self, tag: Tag) -> None:
+        src = tag.get("data-src") or tag.get("src")
         if isinstance(src, str) and "play-lh.googleusercontent.com" in src:
-            if src not in screenshots:
-                screenshots.append(src)
-    return screenshots
+            if src not in self.seen:
+                self.seen.add(src)
+                self.screenshots.append(src)
+
+    def result(self) -> List[str]:
+        return self.screenshots
+
+class _VideoHandler(FieldHandler):
+    field = "video"
+    tags = ("meta",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.value: Optional[str] = None
 
-def _parse_video(soup: BeautifulSoup) -> Optional[str]:
-    og_video = soup.find("meta", property="og:video")
-    if og_video and og_video.get("content"):
-        return og_video["content"].strip()
-    return None
+    def start(self, tag: Tag) -> None:
+        if tag.get("property") == "og:video":
+            self.done = True
+            if tag.get("content"):
+                self.value = tag["content"].strip()
+
+    def result(self) -> Optional[str]:
+        return self.value
+
+class _DeveloperAddressHandler(FieldHandler):
+    """
+    Only outermost ``<div>`` elements are inspected: a nested div's text is
+    a substring of its ancestor's, so it can only match if the ancestor
+    already did. This keeps the text scan linear in document size.
+    """
+
+    field = "developerAddress"
+    tags = ("div",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.depth = 0
+        self.value: Optional[str] = None
+
+    def start(self, tag: Tag) -> bool:
+        if self.depth == 0:
+            text = tag.get_text(" ", strip=True)
+            if "Address" in text:
+                raw = tag.text
+                if "\n" in raw:
+                    parts = [line.strip() for line in raw.splitlines() if line.strip()]
+                    if len(parts) >= 2:
+                        self.value = " ".join(parts[1:])
+                        self.done = True
+                        return False
+        self.depth += 1
+        return True
+
+    def end(self, tag: Tag) -> None:
+        self.depth -= 1
+
+    def result(self) -> Optional[str]:
+        return self.value
+
+_DETAIL_HANDLERS: Tuple[Type[FieldHandler], ...] = (
+    _TitleHandler,
+    _DescriptionHandler,
+    _ScoreHandler,
+    _InstallsHandler,
+    _DeveloperEmailHandler,
+    _DeveloperWebsiteHandler,
+    _DeveloperAddressHandler,
+    _GenreHandler,
+    _CategoriesHandler,
+    _ScreenshotsHandler,
+    _VideoHandler,
+)
+
+def _detail_handlers(fields: Optional[Collection[str]] = None) -> List[FieldHandler]:
+    """
+    Handlers for ``fields``, or for every details field when None.
+    """
+    return [cls() for cls in _DETAIL_HANDLERS if fields is None or cls.field in fields]
 
 def fetch_app_details(
     client: RequestClient,
     app_id: str,
     base_url: str,
     language: str = "en_US",
-) -> Dict[str, Any]:
+    fetcher: Optional[PageFetcher] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> AppRecord:
     """
     Fetch app details for a single app ID from Google Play.
+
+    Pass a shared ``fetcher`` to reuse the parsed page with other extractors,
+    and ``fields`` to extract only those (see ``extract_app_details``).
     """
     params = {"id": app_id, "hl": language}
     logger.debug("Requesting app details for %s with params %s", app_id, params)
-    response = client.get(base_url, params=params)
-
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    title = _parse_title(soup)
-    description = _parse_description(soup)
-    score = _parse_score(soup)
-    installs = _parse_installs(soup)
-    developer_email = _parse_developer_email(soup)
-    developer_website = _parse_developer_website(soup)
-    developer_address = _parse_developer_address(soup)
-    genre = _parse_genre(soup)
-    categories = _parse_categories(soup)
-    screenshots = _parse_screenshots(soup)
-    video = _parse_video(soup)
-
-    details: Dict[str, Any] = {
-        "title": title,
-        "appId": app_id,
-        "description": description,
-        "score": score,
-        "ratings": None,  # can be added by more advanced parsing
-        "reviews": None,  # will be replaced by reviews parser
-        "installs": installs,
-        "screenshots": screenshots,
-        "video": video,
-        "developerEmail": developer_email,
-        "developerWebsite": developer_website,
-        "developerAddress": developer_address,
-        "genre": genre,
-        "categories": categories,
-    }
+    fetcher = fetcher or PageFetcher(client)
+    soup = fetcher.get_soup(base_url, params=params)
+    return extract_app_details(soup, app_id, fields=fields)
+
+def extract_app_details(
+    soup: BeautifulSoup,
+    app_id: str,
+    fields: Optional[Iterable[str]] = None,
+) -> AppRecord:
+    """
+    Build the app details record from an already parsed details page.
+
+    The page is walked once, with every field handler fed from the same pass.
+    With ``fields``, only their handlers run (the walk ends as soon as they
+    are done) and the record is projected onto them.
+    """
+    projection = select_fields(fields) if fields is not None else None
+    with metrics.time("extractor_seconds", extractor="app_details"):
+        values = walk_document(soup, _detail_handlers(projection))
+
+    details = AppRecord(
+        title=values.get("title"),
+        appId=app_id,
+        description=values.get("description"),
+        score=values.get("score"),
+        ratings=None,  # can be added by more advanced parsing
+        reviews=None,  # will be replaced by reviews parser
+        installs=values.get("installs"),
+        screenshots=values.get("screenshots"),
+        video=values.get("video"),
+        developerEmail=values.get("developerEmail"),
+        developerWebsite=values.get("developerWebsite"),
+        developerAddress=values.get("developerAddress"),
+        genre=values.get("genre"),
+        categories=values.get("categories"),
+    )
+    details.projection = projection
 
     logger.debug("Parsed details for %s: %s", app_id, details)
     return details
\ No newline at end of file
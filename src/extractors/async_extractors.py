@@ -0,0 +1,48 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from extractors.review_pages import REVIEWS_RPC_URL, ReviewStream
+from utils.async_request_client import AsyncRequestClient
+from utils.records import Review
+
+logger = logging.getLogger(__name__)
+
+async def async_fetch_app_reviews_paginated(
+    client: AsyncRequestClient,
+    app_id: str,
+    language: str = "en_US",
+    max_reviews: int = 50,
+    sort: str = "newest",
+    filter_score: Optional[int] = None,
+    cursor: Optional[Dict[str, Any]] = None,
+    rpc_url: str = REVIEWS_RPC_URL,
+) -> Tuple[List[Review], Dict[str, Any]]:
+    """
+    Async version of ``fetch_app_reviews_paginated``.
+    """
+    # The stream does the request building and cursor bookkeeping; the
+    # pages are fetched here, with the async client.
+    stream = ReviewStream(
+        None,
+        app_id,
+        language=language,
+        sort=sort,
+        filter_score=filter_score,
+        page_size=min(max(max_reviews, 1), 200),
+        cursor=cursor,
+        rpc_url=rpc_url,
+    )
+    reviews: List[Review] = []
+    while max_reviews > 0 and not stream.exhausted:
+        response = await client.post(rpc_url, **stream.next_request())
+        for review in stream.consume_page(response.text):
+            reviews.append(review)
+            if len(reviews) >= max_reviews:
+                break
+        if len(reviews) >= max_reviews:
+            break
+
+    logger.debug(
+        "Fetched %d reviews for %s over %d pages", len(reviews), app_id, stream.pages_fetched
+    )
+    return reviews, stream.cursor
@@ -1,8 +1,12 @@
 import logging
-from typing import Any, Dict, List
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 
+from utils.html_parser import parse_html
+from utils.metrics import metrics
 from utils.request_client import RequestClient
 
 logger = logging.getLogger(__name__)
@@ -10,6 +14,9 @@ logger = logging.getLogger(__name__)
 SEARCH_BASE_URL = "https://play.google.com/store/search"
 CATEGORY_BASE_URL = "https://play.google.com/store/apps/category"
 
+# "See more" links of result clusters point below this path.
+CLUSTER_PATH = "/store/apps/collection/"
+
 def _extract_app_cards(soup: BeautifulSoup, max_results: int) -> List[Dict[str, Any]]:
     apps: List[Dict[str, Any]] = []
     seen_ids: set[str] = set()
@@ -35,35 +42,30 @@ def _extract_app_cards(soup: BeautifulSoup, max_results: int) -> List[Dict[str,
 
     return apps
 
-def search_apps_by_keyword(
-    client: RequestClient,
-    keyword: str,
-    max_results: int = 50,
-    language: str = "en_US",
-) -> List[Dict[str, Any]]:
-    params = {
-        "q": keyword,
-        "c": "apps",
-        "hl": language,
-    }
-    logger.debug("Searching apps by keyword '%s' with params %s", keyword, params)
-    response = client.get(SEARCH_BASE_URL, params=params)
-    soup = BeautifulSoup(response.text, "html.parser")
-    apps = _extract_app_cards(soup, max_results=max_results)
-    logger.info("Found %d apps for keyword '%s'", len(apps), keyword)
-    return apps
+def _extract_cluster_links(soup: BeautifulSoup, page_url: str) -> List[str]:
+    links: List[str] = []
+    seen: set[str] = set()
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if CLUSTER_PATH not in href:
+            continue
+        url = urljoin(page_url, href)
+        if url not in seen:
+            seen.add(url)
+            links.append(url)
+    return links
 
-def fetch_category_top_apps(
+def fetch_listing_page(
     client: RequestClient,
-    category_id: str,
-    max_results: int = 50,
-    language: str = "en_US",
-) -> List[Dict[str, Any]]:
-    url = f"{CATEGORY_BASE_URL}/{category_id}"
-    params = {"hl": language}
-    logger.debug("Fetching category '%s' apps from %s", category_id, url)
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Fetch one search, category or cluster page and return all of its app
+    cards together with the absolute URLs of the result clusters it links to.
+    """
     response = client.get(url, params=params)
-    soup = BeautifulSoup(response.text, "html.parser")
-    apps = _extract_app_cards(soup, max_results=max_results)
-    logger.info("Found %d apps for category '%s'", len(apps), category_id)
-    return apps
\ No newline at end of file
+    soup = parse_html(response.text)
+    with metrics.time("extractor_seconds", extractor="app_cards"):
+        apps = _extract_app_cards(soup, max_results=sys.maxsize)
+    return apps, _extract_cluster_links(soup, url)
@@ -0,0 +1,127 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from utils.metrics import metrics
+
+class FieldHandler:
+    """
+    Extracts one output field while the document is walked.
+
+    ``tags`` lists the element names the handler wants to see; an empty
+    tuple means every element. ``start`` is called when an element is
+    entered; if it returns True, ``end`` is called for the same element once
+    its subtree has been walked. A handler sets ``done`` once its value can
+    no longer change so the walker stops feeding it.
+    """
+
+    field: str = ""
+    tags: Tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self.done = False
+
+    def start(self, tag: Tag) -> Optional[bool]:
+        raise NotImplementedError
+
+    def end(self, tag: Tag) -> None:
+        pass
+
+    def result(self) -> Any:
+        raise NotImplementedError
+
+class _TimedHandler(FieldHandler):
+    """
+    Wraps a handler and adds up the time spent in its callbacks, for the
+    per-field metrics. Only used while metrics are enabled.
+    """
+
+    def __init__(self, handler: FieldHandler) -> None:
+        self.handler = handler
+        self.field = handler.field
+        self.tags = handler.tags
+        self.elapsed = 0.0
+
+    @property
+    def done(self) -> bool:  # type: ignore[override]
+        return self.handler.done
+
+    def start(self, tag: Tag) -> Optional[bool]:
+        started = time.perf_counter()
+        try:
+            return self.handler.start(tag)
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+    def end(self, tag: Tag) -> None:
+        started = time.perf_counter()
+        try:
+            self.handler.end(tag)
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+    def result(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return self.handler.result()
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+def walk_document(
+    soup: BeautifulSoup,
+    handlers: Iterable[FieldHandler],
+) -> Dict[str, Any]:
+    """
+    Walk ``soup`` once in document order, dispatching every element to the
+    handlers registered for its name, and return ``{field: result}``.
+    """
+    handlers = list(handlers)
+    timed = metrics.enabled
+    if timed:
+        handlers = [_TimedHandler(handler) for handler in handlers]
+    by_name: Dict[str, List[FieldHandler]] = {}
+    wildcard: List[FieldHandler] = []
+    for handler in handlers:
+        if handler.tags:
+            for name in handler.tags:
+                by_name.setdefault(name, []).append(handler)
+        else:
+            wildcard.append(handler)
+
+    pending = sum(1 for h in handlers if not h.done)
+    # The stack holds elements still to enter, and (element, listeners)
+    # tuples marking where an element's subtree ends.
+    stack: List[Any] = [child for child in reversed(soup.contents) if isinstance(child, Tag)]
+    while stack and pending:
+        node = stack.pop()
+        if type(node) is tuple:
+            tag, closing = node
+            for handler in closing:
+                handler.end(tag)
+            continue
+
+        named = by_name.get(node.name)
+        listeners: List[FieldHandler] = []
+        for group in (named, wildcard):
+            if not group:
+                continue
+            for handler in group:
+                if handler.done:
+                    continue
+                wants_end = handler.start(node)
+                if handler.done:
+                    pending -= 1
+                elif wants_end:
+                    listeners.append(handler)
+
+        if listeners:
+            stack.append((node, listeners))
+        stack.extend(child for child in reversed(node.contents) if isinstance(child, Tag))
+
+    fields = {handler.field: handler.result() for handler in handlers}
+    if timed:
+        for handler in handlers:
+            metrics.observe("field_seconds", handler.elapsed, field=handler.field)
+    return fields
@@ -0,0 +1,290 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from utils.metrics import metrics
+from utils.records import Review
+from utils.request_client import PageClient
+
+logger = logging.getLogger(__name__)
+
+REVIEWS_RPC_URL = "https://play.google.com/_/PlayStoreUi/data/batchexecute"
+REVIEWS_RPC_ID = "UsvDTd"
+
+SORT_ORDERS = {
+    "most_relevant": 1,
+    "newest": 2,
+    "rating": 3,
+}
+
+def _build_request_body(
+    app_id: str,
+    sort: int,
+    page_size: int,
+    filter_score: Optional[int],
+    token: Optional[str],
+) -> Dict[str, str]:
+    inner = [
+        None,
+        None,
+        [2, sort, [page_size, None, token], None, [None, filter_score]],
+        [app_id, 7],
+    ]
+    envelope = [[[REVIEWS_RPC_ID, json.dumps(inner, separators=(",", ":")), None, "generic"]]]
+    return {"f.req": json.dumps(envelope, separators=(",", ":"))}
+
+def _nested(data: Any, *path: int) -> Any:
+    for index in path:
+        try:
+            data = data[index]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return data
+
+def _review_from_entry(entry: List[Any]) -> Review:
+    timestamp = _nested(entry, 5, 0)
+    date = None
+    if isinstance(timestamp, (int, float)):
+        date = datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return Review(
+        userName=_nested(entry, 1, 0) or "Unknown",
+        score=_nested(entry, 2),
+        text=_nested(entry, 4) or "",
+        date=date,
+        version=_nested(entry, 10),
+        thumbsUp=_nested(entry, 6),
+    )
+
+def _parse_review_page(body: str) -> Tuple[List[Review], Optional[str]]:
+    """
+    Decode one batchexecute response into reviews and the next page token.
+    """
+    # Responses start with an anti-JSON-hijacking prefix line: )]}'
+    start = body.find("[")
+    if start < 0:
+        return [], None
+    envelopes = json.loads(body[start:])
+
+    for envelope in envelopes:
+        if _nested(envelope, 0) != "wrb.fr" or _nested(envelope, 1) != REVIEWS_RPC_ID:
+            continue
+        raw = _nested(envelope, 2)
+        if not raw:
+            return [], None
+        payload = json.loads(raw)
+        entries = _nested(payload, 0) or []
+        token = _nested(payload, -2, -1)
+        reviews = [_review_from_entry(entry) for entry in entries if isinstance(entry, list)]
+        return reviews, token if isinstance(token, str) else None
+
+    return [], None
+
+class ReviewStream:
+    """
+    Lazily pages through an app's reviews using the store's continuation
+    tokens, holding at most one page in memory.
+
+    Iterate over the stream to receive review dicts. ``cursor`` describes the
+    position of the next review to be yielded and can be stored and passed
+    back later to resume exactly where iteration stopped. A cursor taken
+    with another sort order or star filter is ignored, since its tokens
+    belong to a different query. So is one of a stream that reached the
+    end: the stream starts over from the first page, where reviews posted
+    since then show up.
+
+    Without a ``client``, the caller fetches every page itself, posting
+    ``next_request()`` and handing the body to ``consume_page``, as the
+    async extractor does.
+    """
+
+    def __init__(
+        self,
+        client: Optional[PageClient],
+        app_id: str,
+        language: str = "en_US",
+        country: str = "us",
+        sort: str = "newest",
+        filter_score: Optional[int] = None,
+        page_size: int = 100,
+        cursor: Optional[Dict[str, Any]] = None,
+        rpc_url: str = REVIEWS_RPC_URL,
+    ) -> None:
+        if sort not in SORT_ORDERS:
+            raise ValueError(
+                f"Invalid review sort '{sort}'. Allowed: {', '.join(sorted(SORT_ORDERS))}."
+            )
+        if filter_score is not None and filter_score not in (1, 2, 3, 4, 5):
+            raise ValueError(f"Invalid review star filter '{filter_score}'. Allowed: 1-5.")
+        self.client = client
+        self.app_id = app_id
+        self.language = language
+        self.country = country
+        self.sort = sort
+        self.filter_score = filter_score
+        self.rpc_url = rpc_url
+        cursor = cursor or {}
+        if cursor and (cursor.get("sort"), cursor.get("filter_score")) != (sort, filter_score):
+            logger.info("Ignoring the review cursor of %s, taken for another sort or filter.", app_id)
+            cursor = {}
+        if cursor.get("exhausted"):
+            cursor = {}
+        # Offsets are only meaningful for the page size they were taken
+        # with, so a resumed stream keeps the original size.
+        self.page_size = cursor.get("page_size", page_size)
+        # Token of the page currently being consumed, and how many of its
+        # reviews have been yielded already.
+        self._page_token: Optional[str] = cursor.get("token")
+        self._page_offset: int = cursor.get("offset", 0)
+        self.exhausted: bool = False
+        self.pages_fetched = 0
+
+    @property
+    def cursor(self) -> Dict[str, Any]:
+        return {
+            "token": self._page_token,
+            "offset": self._page_offset,
+            "page_size": self.page_size,
+            "exhausted": self.exhausted,
+            "sort": self.sort,
+            "filter_score": self.filter_score,
+        }
+
+    def next_request(self) -> Dict[str, Any]:
+        """
+        Keyword arguments for the ``post`` call that fetches the current page.
+        """
+        logger.debug(
+            "Requesting review page for %s (sort=%s, token=%s)",
+            self.app_id,
+            self.sort,
+            self._page_token,
+        )
+        return {
+            "params": {"hl": self.language, "gl": self.country},
+            "data": _build_request_body(
+                self.app_id,
+                SORT_ORDERS[self.sort],
+                self.page_size,
+                self.filter_score,
+                self._page_token,
+            ),
+        }
+
+    def consume_page(self, body: str) -> Iterator[Review]:
+        """
+        Yield the not yet consumed reviews of a fetched page. The cursor
+        moves before each review is handed out, so stopping at any point
+        leaves it on the next unread review.
+        """
+        self.pages_fetched += 1
+        with metrics.time("extractor_seconds", extractor="review_feed"):
+            reviews, next_token = _parse_review_page(body)
+        if self._page_offset >= len(reviews):
+            self._advance(next_token)
+            return
+        last = len(reviews) - 1
+        for idx in range(self._page_offset, len(reviews)):
+            if idx == last:
+                self._advance(next_token)
+            else:
+                self._page_offset = idx + 1
+            yield reviews[idx]
+
+    def _advance(self, next_token: Optional[str]) -> None:
+        if next_token is None:
+            self.exhausted = True
+            self._page_offset = 0
+        else:
+            self._page_token = next_token
+            self._page_offset = 0
+
+    def __iter__(self) -> Iterator[Review]:
+        if self.client is None:
+            raise RuntimeError("ReviewStream has no client; fetch its pages with next_request().")
+        while not self.exhausted:
+            response = self.client.post(self.rpc_url, **self.next_request())
+            yield from self.consume_page(response.text)
+
+def load_review_cursor(cursor_dir: Path, app_id: str) -> Optional[Dict[str, Any]]:
+    path = Path(cursor_dir) / f"{app_id}.json"
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_review_cursor(cursor_dir: Path, app_id: str, cursor: Dict[str, Any]) -> None:
+    path = Path(cursor_dir) / f"{app_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(cursor, f)
+    os.replace(tmp_path, path)
+
+class ReviewCursors:
+    """
+    Review cursors waiting to be saved to ``cursor_dir``. A cursor is staged
+    once its app's record has been handed to the writer and only saved by
+    ``commit``, once that record is on disk; otherwise a lost record would
+    take the reviews it held with it for good.
+    """
+
+    def __init__(self, cursor_dir: Path) -> None:
+        self.cursor_dir = Path(cursor_dir)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, record: Mapping[str, Any]) -> None:
+        """
+        Stage the cursor ``record`` was scraped with, if any.
+        """
+        cursor = getattr(record, "review_cursor", None)
+        if cursor is not None:
+            with self._lock:
+                self._pending[record["appId"]] = cursor
+
+    def commit(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for app_id, cursor in pending.items():
+            save_review_cursor(self.cursor_dir, app_id, cursor)
+
+def fetch_app_reviews_paginated(
+    client: PageClient,
+    app_id: str,
+    language: str = "en_US",
+    max_reviews: int = 50,
+    sort: str = "newest",
+    filter_score: Optional[int] = None,
+    cursor: Optional[Dict[str, Any]] = None,
+    rpc_url: str = REVIEWS_RPC_URL,
+) -> Tuple[List[Review], Dict[str, Any]]:
+    """
+    Collect up to ``max_reviews`` reviews through the paginated review feed.
+
+    Returns the reviews together with the cursor to resume from next time.
+    """
+    stream = ReviewStream(
+        client,
+        app_id,
+        language=language,
+        sort=sort,
+        filter_score=filter_score,
+        page_size=min(max(max_reviews, 1), 200),
+        cursor=cursor,
+        rpc_url=rpc_url,
+    )
+    reviews: List[Review] = []
+    if max_reviews > 0:
+        for review in stream:
+            reviews.append(review)
+            if len(reviews) >= max_reviews:
+                break
+
+    logger.debug(
+        "Fetched %d reviews for %s over %d pages", len(reviews), app_id, stream.pages_fetched
+    )
+    return reviews, stream.cursor
@@ -1,72 +1,217 @@
 import logging
-from typing import Any, Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from bs4 import BeautifulSoup
+from bs4.element import CData, NavigableString, Tag
 
+from utils.metrics import metrics
+from utils.page_fetcher import PageFetcher
+from utils.records import Review
 from utils.request_client import RequestClient
 
 logger = logging.getLogger(__name__)
 
-def _parse_reviews_from_page(soup: BeautifulSoup, max_reviews: int) -> List[Dict[str, Any]]:
+# Strings counted by ``get_text`` on span/div/p elements (no comments,
+# scripts, templates, ...).
+_TEXT_TYPES = (NavigableString, CData)
+_USERNAME_TAGS = frozenset(("span", "div"))
+_TEXT_TAGS = frozenset(("span", "div", "p"))
+
+class _SubtreeText:
+    """
+    Per-element text statistics for one parsed page, computed bottom-up at
+    most once per element and shared by every review container on the page.
+
+    For each element it records the summed length, part count and word count
+    of its stripped strings and whether any of them contains "stars". That is
+    enough to know the length of ``get_text(" ", strip=True)`` and the word
+    count of ``get_text(strip=True)`` without building either string, so
+    only the winning elements are ever turned into text.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[int, Tuple[int, int, int, bool]] = {}
+        self._longest: Dict[int, Optional[Tuple[int, Tag]]] = {}
+        self._username: Dict[int, Optional[str]] = {}
+        # Results per review container; sibling cards often share one.
+        self._container_text: Dict[int, Optional[Tag]] = {}
+        self._container_user: Dict[int, Optional[str]] = {}
+
+    def stats(self, root: Tag) -> Tuple[int, int, int, bool]:
+        memo = self._stats
+        if id(root) in memo:
+            return memo[id(root)]
+
+        stack: List[Tuple[Tag, bool]] = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                if id(node) not in memo:
+                    stack.append((node, True))
+                    stack.extend(
+                        (child, False) for child in node.contents if isinstance(child, Tag)
+                    )
+                continue
+
+            length = parts = words = 0
+            stars = False
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    c_length, c_parts, c_words, c_stars = memo[id(child)]
+                elif type(child) in _TEXT_TYPES:
+                    text = child.strip()
+                    if not text:
+                        continue
+                    c_length, c_parts, c_words = len(text), 1, len(text.split())
+                    c_stars = "stars" in text.lower()
+                else:
+                    continue
+                length += c_length
+                parts += c_parts
+                words += c_words
+                stars = stars or c_stars
+            memo[id(node)] = (length, parts, words, stars)
+
+        return memo[id(root)]
+
+    def longest_text(self, container: Tag) -> Optional[Tag]:
+        """
+        First element below ``container`` with the longest star-free
+        ``get_text(" ", strip=True)`` among span/div/p elements.
+        """
+        if id(container) in self._container_text:
+            return self._container_text[id(container)]
+        self.stats(container)
+        best: Optional[Tuple[int, Tag]] = None
+        for child in container.contents:
+            if isinstance(child, Tag):
+                candidate = self._longest_in(child)
+                if candidate is not None and (best is None or candidate[0] > best[0]):
+                    best = candidate
+        result = best[1] if best is not None else None
+        self._container_text[id(container)] = result
+        return result
+
+    def _longest_in(self, root: Tag) -> Optional[Tuple[int, Tag]]:
+        memo = self._longest
+        stack: List[Tuple[Tag, bool]] = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            key = id(node)
+            if key in memo:
+                continue
+            length, parts, _, stars = self._stats[key]
+            if node.name in _TEXT_TAGS and parts and not stars:
+                # An element's text contains all of its descendants' text, so
+                # an eligible element always beats everything below it.
+                memo[key] = (length + parts - 1, node)
+                continue
+            children = [child for child in node.contents if isinstance(child, Tag)]
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children)
+                continue
+            best: Optional[Tuple[int, Tag]] = None
+            for child in children:
+                candidate = memo[id(child)]
+                if candidate is not None and (best is None or candidate[0] > best[0]):
+                    best = candidate
+            memo[key] = best
+        return memo[id(root)]
+
+    def username(self, container: Tag) -> Optional[str]:
+        """
+        Text of the first span/div below ``container`` whose stripped text is
+        non-empty, star-free and at most four words long.
+        """
+        if id(container) in self._container_user:
+            return self._container_user[id(container)]
+        self.stats(container)
+        result = None
+        for child in container.contents:
+            if isinstance(child, Tag):
+                result = self._username_in(child)
+                if result is not None:
+                    break
+        self._container_user[id(container)] = result
+        return result
+
+    def _username_in(self, root: Tag) -> Optional[str]:
+        memo = self._username
+        stack: List[Tuple[Tag, bool]] = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            key = id(node)
+            if key in memo:
+                continue
+            _, parts, words, _ = self._stats[key]
+            if node.name in _USERNAME_TAGS and parts and words - (parts - 1) <= 4:
+                text = node.get_text(strip=True)
+                if "stars" not in text.lower():
+                    memo[key] = text
+                    continue
+            children = [child for child in node.contents if isinstance(child, Tag)]
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in children)
+                continue
+            memo[key] = next(
+                (memo[id(child)] for child in children if memo[id(child)] is not None),
+                None,
+            )
+        return memo[id(root)]
+
+def _iter_review_candidates(soup: BeautifulSoup) -> Iterator[Tag]:
+    for node in soup.descendants:
+        if isinstance(node, Tag):
+            label = node.get("aria-label")
+            if label and "stars" in label:
+                yield node
+
+def _parse_reviews_from_page(soup: BeautifulSoup, max_reviews: int) -> List[Review]:
     """
     Attempt to parse review cards from the app details page.
 
     Google Play markup changes periodically; this function uses generic
     heuristics instead of relying on brittle selectors.
-    """
-    reviews: List[Dict[str, Any]] = []
 
-    # Common structure: review containers with role="listitem" under a reviews list
-    review_candidates = soup.find_all(attrs={"aria-label": lambda v: v and "stars" in v})
+    Text statistics are computed once per element and shared between review
+    containers, so the cost is linear in page size. The document is scanned
+    lazily and scanning stops once ``max_reviews`` reviews have been found.
+    """
+    reviews: List[Review] = []
+    text_index = _SubtreeText()
     seen = 0
 
-    for candidate in review_candidates:
+    # Common structure: review containers with role="listitem" under a reviews list
+    for candidate in _iter_review_candidates(soup):
         # Move up to a container with text content
         container = candidate.parent
         if not container:
             continue
 
-        try:
-            rating_text = candidate["aria-label"]
-            rating_value = None
-            for token in rating_text.split():
-                try:
-                    rating_value = float(token)
-                    break
-                except ValueError:
-                    continue
-        except Exception:  # noqa: BLE001
-            rating_value = None
-
-        # Username often appears nearby as a strong/bold/spans
-        user_name = None
-        for possible in container.find_all(["span", "div"]):
-            txt = possible.get_text(strip=True)
-            if txt and "stars" not in txt.lower() and len(txt.split()) <= 4:
-                user_name = txt
+        rating_value = None
+        for token in candidate["aria-label"].split():
+            try:
+                rating_value = float(token)
                 break
+            except ValueError:
+                continue
 
         # Review text: longest paragraph-like block under container
-        review_text = ""
-        longest = 0
-        for possible in container.find_all(["span", "div", "p"]):
-            txt = possible.get_text(" ", strip=True)
-            if txt and len(txt) > longest and "stars" not in txt.lower():
-                longest = len(txt)
-                review_text = txt
-
-        if not review_text:
+        text_block = text_index.longest_text(container)
+        if text_block is None:
             continue
 
+        # Username often appears nearby as a strong/bold/spans
+        user_name = text_index.username(container)
+
         reviews.append(
-            {
-                "userName": user_name or "Unknown",
-                "score": rating_value,
-                "text": review_text,
-                "date": None,
-                "version": None,
-                "thumbsUp": None,
-            }
+            Review(
+                userName=user_name or "Unknown",
+                score=rating_value,
+                text=text_block.get_text(" ", strip=True),
+            )
         )
         seen += 1
         if seen >= max_reviews:
@@ -80,20 +225,32 @@ def fetch_app_reviews(
     reviews_url: str,
     language: str = "en_US",
     max_reviews: int = 50,
-) -> List[Dict[str, Any]]:
+    fetcher: Optional[PageFetcher] = None,
+) -> List[Review]:
     """
     Fetch reviews for an app.
 
     For simplicity and robustness, this implementation scrapes reviews from the
     public app detail page. It aims to capture a useful subset of reviews even
-    when the underlying HTML structure changes.
+    when the underlying HTML structure changes. Pass the same ``fetcher`` used
+    for ``fetch_app_details`` to avoid downloading the page twice.
     """
     params = {"id": app_id, "hl": language}
     logger.debug("Requesting reviews for %s from %s", app_id, reviews_url)
-    response = client.get(reviews_url, params=params)
-    soup = BeautifulSoup(response.text, "html.parser")
+    fetcher = fetcher or PageFetcher(client)
+    soup = fetcher.get_soup(reviews_url, params=params)
+    return extract_app_reviews(soup, app_id, max_reviews=max_reviews)
 
-    reviews = _parse_reviews_from_page(soup, max_reviews=max_reviews)
+def extract_app_reviews(
+    soup: BeautifulSoup,
+    app_id: str,
+    max_reviews: int = 50,
+) -> List[Review]:
+    """
+    Extract reviews for ``app_id`` from an already parsed details page.
+    """
+    with metrics.time("extractor_seconds", extractor="reviews"):
+        reviews = _parse_reviews_from_page(soup, max_reviews=max_reviews)
     if not reviews:
         logger.info("No reviews parsed from app page for %s.", app_id)
 
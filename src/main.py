@@ -1,23 +1,45 @@
 import argparse
+import asyncio
+import functools
 import json
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Sequence, cast
 
-from extractors.app_details import fetch_app_details
-from extractors.reviews_parser import fetch_app_reviews
-from extractors.categories_parser import search_apps_by_keyword, fetch_category_top_apps
+from extractors.review_pages import SORT_ORDERS, ReviewCursors
+from utils.html_parser import PARSER_BACKENDS, set_default_parser
+from utils.fingerprints import FingerprintStore
+from utils.http_cache import HttpCache
+from utils.metrics import MetricsExporter, metrics
+from utils.page_archive import ArchiveReader, ArchiveWriter, index_is_stale, rebuild_index
+from utils.rate_control import RateController
+from utils.records import AppRecord, select_fields
+from utils.review_index import ReviewIndex
+from utils.run_journal import RunJournal
+from utils.work_queue import WorkQueue
 from utils.request_client import RequestClient
 from utils.validators import (
     validate_app_ids,
+    validate_concurrency,
     validate_output_format,
     validate_mode,
+    validate_review_source,
 )
-from utils.formatters import merge_app_and_reviews
 from outputs.writer_json import write_json
-from outputs.writer_csv import write_csv
-from outputs.writer_excel import write_excel
+from outputs.writer_jsonl import JsonlWriter, write_jsonl
+from outputs.writer_parquet import PARTITION_COLUMNS, ParquetDatasetWriter, write_parquet
+from outputs.stream_writer import StreamWriter
+from outputs.writer_csv import CsvTablesWriter, write_csv, write_csv_tables
+from outputs.writer_excel import ExcelStreamWriter, write_excel
+from outputs.writer_sqlite import SqliteStoreWriter, write_sqlite
+from scraper import UNCHANGED, RecordSink
+from discovery import DiscoveryQuery, discover_app_ids, read_queries
+from pipeline import app_iterator
+import store_query
+from replay import iter_replayed_apps
+from queue_worker import default_worker_id, iter_shard_records, open_shard_writer, run_worker
+from async_scraper import async_run_with_app_ids
 
 CONFIG_RELATIVE_PATH = Path("src/config/settings.example.json")
 
@@ -33,8 +55,8 @@ def setup_logging(verbosity: int) -> None:
         format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
     )
 
-def load_config(root_dir: Path) -> Dict[str, Any]:
-    config_path = root_dir / CONFIG_RELATIVE_PATH
+def load_config(root_dir: Path, config_path: Optional[Path] = None) -> Dict[str, Any]:
+    config_path = config_path or root_dir / CONFIG_RELATIVE_PATH
     if not config_path.exists():
         logging.warning("Config file %s not found, using defaults.", config_path)
         return {
@@ -45,8 +67,58 @@ def load_config(root_dir: Path) -> Dict[str, Any]:
             "language": "en_US",
             "max_apps": 50,
             "max_reviews_per_app": 50,
+            "concurrency": 1,
+            "cache_dir": None,
+            "cache_ttl_seconds": 3600,
+            "cache_max_bytes": 536870912,
+            "html_parser": "html.parser",
+            "review_source": "page",
+            "review_sort": "newest",
+            "review_filter_score": None,
+            "review_cursor_dir": None,
+            "fields": None,
+            "csv_gzip": False,
+            "journal_flush_every": 100,
+            "incremental": False,
+            "fingerprints_file": None,
+            "review_dedup": False,
+            "review_index_dir": None,
+            "review_dedup_capacity": 1000000,
+            "review_dedup_fp_rate": 0.001,
+            "parquet_partition_by": None,
+            "parquet_row_group_size": 10000,
+            "sqlite_batch_size": 500,
+            "adaptive_rate": False,
+            "rate_limit_per_host": 0,
+            "rate_burst": 10,
+            "max_backoff_seconds": 30,
+            "circuit_failure_threshold": 20,
+            "circuit_reset_seconds": 30,
+            "queue_file": None,
+            "queue_visibility_timeout": 600,
+            "queue_max_attempts": 3,
+            "shard_dir": None,
+            "parse_workers": 0,
+            "pipeline_queue_size": 64,
+            "metrics": False,
+            "metrics_file": None,
+            "metrics_port": None,
+            "metrics_prometheus_file": None,
+            "metrics_interval": 15,
+            "keywords_file": None,
+            "categories_file": None,
+            "discovery_max_pages": None,
+            "discovery_max_per_query": None,
+            "capture_archive": None,
+            "replay_archive": None,
+            "archive_segment_mb": 256,
+            "archive_compress_level": 6,
+            "replay_workers": 0,
+            "replay_chunk_size": 64,
             "base_url": "https://play.google.com/store/apps/details",
             "reviews_url": "https://play.google.com/store/apps/details",
+            "search_url": "https://play.google.com/store/search",
+            "category_url": "https://play.google.com/store/apps/category",
             "user_agent": (
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                 "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -66,6 +138,30 @@ def resolve_paths(root_dir: Path, config: Dict[str, Any]) -> Dict[str, Any]:
 
     cfg["input_app_ids_file"] = str(root_dir / input_path)
     cfg["output_dir"] = str(root_dir / output_dir)
+    if cfg.get("cache_dir"):
+        cfg["cache_dir"] = str(root_dir / cfg["cache_dir"])
+    if cfg.get("fingerprints_file"):
+        cfg["fingerprints_file"] = str(root_dir / cfg["fingerprints_file"])
+    if cfg.get("review_cursor_dir"):
+        cfg["review_cursor_dir"] = str(root_dir / cfg["review_cursor_dir"])
+    if cfg.get("review_index_dir"):
+        cfg["review_index_dir"] = str(root_dir / cfg["review_index_dir"])
+    if cfg.get("queue_file"):
+        cfg["queue_file"] = str(root_dir / cfg["queue_file"])
+    if cfg.get("shard_dir"):
+        cfg["shard_dir"] = str(root_dir / cfg["shard_dir"])
+    if cfg.get("metrics_file"):
+        cfg["metrics_file"] = str(root_dir / cfg["metrics_file"])
+    if cfg.get("metrics_prometheus_file"):
+        cfg["metrics_prometheus_file"] = str(root_dir / cfg["metrics_prometheus_file"])
+    if cfg.get("keywords_file"):
+        cfg["keywords_file"] = str(root_dir / cfg["keywords_file"])
+    if cfg.get("categories_file"):
+        cfg["categories_file"] = str(root_dir / cfg["categories_file"])
+    if cfg.get("capture_archive"):
+        cfg["capture_archive"] = str(root_dir / cfg["capture_archive"])
+    if cfg.get("replay_archive"):
+        cfg["replay_archive"] = str(root_dir / cfg["replay_archive"])
     return cfg
 
 def read_app_ids(file_path: Path, max_apps: int) -> List[str]:
@@ -84,162 +180,777 @@ def read_app_ids(file_path: Path, max_apps: int) -> List[str]:
     validate_app_ids(app_ids)
     return app_ids
 
-def build_client(user_agent: str) -> RequestClient:
-    return RequestClient(user_agent=user_agent)
+def build_cache(cfg: Dict[str, Any]) -> Optional[HttpCache]:
+    cache_dir = cfg.get("cache_dir")
+    if not cache_dir:
+        return None
+    return HttpCache(
+        Path(cache_dir),
+        ttl=cfg.get("cache_ttl_seconds", 3600),
+        max_bytes=cfg.get("cache_max_bytes", 512 * 1024 * 1024),
+    )
+
+def build_rate_controller(cfg: Dict[str, Any]) -> Optional[RateController]:
+    if not cfg.get("adaptive_rate"):
+        return None
+    # Start at the configured concurrency; AIMD only ever backs off from it.
+    concurrency = max(1, int(cfg.get("concurrency", 1)))
+    return RateController(
+        rate=float(cfg.get("rate_limit_per_host", 0)),
+        burst=float(cfg.get("rate_burst", 10)),
+        initial_limit=concurrency,
+        max_limit=concurrency,
+        failure_threshold=int(cfg.get("circuit_failure_threshold", 20)),
+        reset_timeout=float(cfg.get("circuit_reset_seconds", 30)),
+    )
+
+def build_client(
+    user_agent: str,
+    concurrency: int = 1,
+    cache: Optional[HttpCache] = None,
+    rate_controller: Optional[RateController] = None,
+    max_backoff: float = 30.0,
+    archive: Optional[ArchiveWriter] = None,
+) -> RequestClient:
+    # Keep at least one pooled connection per worker thread.
+    return RequestClient(
+        user_agent=user_agent,
+        pool_size=max(10, concurrency),
+        cache=cache,
+        max_backoff=max_backoff,
+        rate_controller=rate_controller,
+        archive=archive,
+    )
+
+def open_capture_archive(cfg: Dict[str, Any]) -> Optional[ArchiveWriter]:
+    if not cfg.get("capture_archive"):
+        return None
+    return ArchiveWriter(
+        Path(cfg["capture_archive"]),
+        segment_bytes=int(cfg.get("archive_segment_mb", 256)) * 1024 * 1024,
+        compress_level=cfg.get("archive_compress_level", 6),
+    ).open()
 
 def run_with_app_ids(
     client: RequestClient,
     cfg: Dict[str, Any],
-) -> List[Dict[str, Any]]:
+    sink: Optional[RecordSink] = None,
+    journal: Optional[RunJournal] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+) -> List[AppRecord]:
+    """
+    Scrape the app IDs listed in ``cfg["input_app_ids_file"]``.
+    """
     app_ids = read_app_ids(
         Path(cfg["input_app_ids_file"]), cfg.get("max_apps", 50)
     )
+    return scrape_app_ids(
+        client, app_ids, cfg, sink=sink, journal=journal, fingerprints=fingerprints
+    )
 
-    language = cfg.get("language", "en_US")
-    base_url = cfg.get("base_url")
-    reviews_url = cfg.get("reviews_url", base_url)
-    max_reviews_per_app = cfg.get("max_reviews_per_app", 50)
-
-    results: List[Dict[str, Any]] = []
-    for idx, app_id in enumerate(app_ids, start=1):
-        logging.info("Processing app %d/%d: %s", idx, len(app_ids), app_id)
-        try:
-            details = fetch_app_details(
-                client=client,
-                app_id=app_id,
-                base_url=base_url,
-                language=language,
-            )
-            reviews = fetch_app_reviews(
-                client=client,
-                app_id=app_id,
-                reviews_url=reviews_url,
-                language=language,
-                max_reviews=max_reviews_per_app,
-            )
-            record = merge_app_and_reviews(details, reviews)
-            results.append(record)
-        except Exception as e:  # noqa: BLE001
-            logging.exception("Failed to fetch data for app %s: %s", app_id, e)
+def scrape_app_ids(
+    client: RequestClient,
+    app_ids: List[str],
+    cfg: Dict[str, Any],
+    sink: Optional[RecordSink] = None,
+    journal: Optional[RunJournal] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+) -> List[AppRecord]:
+    """
+    Scrape ``app_ids``. With a ``sink``, each record is handed to it as soon
+    as it is scraped instead of being collected in the result. With a
+    ``journal``, apps it lists as done are skipped and every outcome is
+    recorded in it. With ``fingerprints``, apps unchanged since the previous
+    run are left out.
+    """
+    if fingerprints is not None:
+        fingerprints.expect(app_ids)
+    if journal is not None:
+        app_ids = journal.pending(app_ids)
 
-    return results
+    records: List[AppRecord] = []
+    for app_id, record in app_iterator(cfg)(client, app_ids, cfg, fingerprints):
+        if record is UNCHANGED:
+            if journal is not None:
+                journal.mark_done(app_id)
+            continue
+        if record is None:
+            if journal is not None:
+                journal.mark_failed(app_id)
+            continue
+        if sink is None:
+            records.append(record)
+        else:
+            sink(record)
+        if journal is not None:
+            journal.mark_done(app_id)
+    return records
 
-def run_with_keyword_search(
-    client: RequestClient,
+def run_replay(
     cfg: Dict[str, Any],
-    keyword: str,
-) -> List[Dict[str, Any]]:
-    logging.info("Searching apps by keyword: %s", keyword)
-    language = cfg.get("language", "en_US")
-    max_apps = cfg.get("max_apps", 50)
-    base_url = cfg.get("base_url")
-    search_results = search_apps_by_keyword(
-        client=client,
-        keyword=keyword,
-        max_results=max_apps,
-        language=language,
-    )
-
-    app_ids = [item["appId"] for item in search_results]
-    cfg_local = cfg.copy()
-    cfg_local["max_apps"] = len(app_ids)
-
-    # Temporarily write app IDs to process them with shared logic
-    tmp_app_ids_path = Path(cfg["output_dir"]) / "tmp_keyword_app_ids.txt"
-    tmp_app_ids_path.parent.mkdir(parents=True, exist_ok=True)
-    with tmp_app_ids_path.open("w", encoding="utf-8") as f:
-        for app_id in app_ids:
-            f.write(app_id + "\n")
+    sink: Optional[RecordSink] = None,
+    journal: Optional[RunJournal] = None,
+) -> List[AppRecord]:
+    """
+    Re-extract every app whose details page was captured in the replay
+    archive, without network access. ``sink`` and ``journal`` behave as in
+    ``run_with_app_ids``; ``max_apps`` only applies when set on the command
+    line. An index missing or cut short by a crashed capture is rebuilt from
+    the archive's segments first.
+    """
+    archive_dir = Path(cfg["replay_archive"])
+    if index_is_stale(archive_dir):
+        logging.info("Rebuilding the index of %s from its segments.", archive_dir)
+        logging.info("Indexed %d archived pages.", rebuild_index(archive_dir))
+    with ArchiveReader(archive_dir) as reader:
+        app_ids = reader.app_ids(cfg.get("base_url"))
+    if cfg.get("replay_max_apps") is not None:
+        app_ids = app_ids[: cfg["replay_max_apps"]]
+    if journal is not None:
+        app_ids = journal.pending(app_ids)
+    logging.info("Replaying %d apps from %s", len(app_ids), archive_dir)
 
-    cfg_local["input_app_ids_file"] = str(tmp_app_ids_path)
-    return run_with_app_ids(client, cfg_local)
+    records: List[AppRecord] = []
+    for app_id, record in iter_replayed_apps(archive_dir, app_ids, cfg):
+        if record is None:
+            if journal is not None:
+                journal.mark_failed(app_id)
+            continue
+        if sink is None:
+            records.append(record)
+        else:
+            sink(record)
+        if journal is not None:
+            journal.mark_done(app_id)
+    return records
 
-def run_with_category(
+def run_with_queries(
     client: RequestClient,
     cfg: Dict[str, Any],
-    category_id: str,
-) -> List[Dict[str, Any]]:
-    logging.info("Fetching apps for category: %s", category_id)
-    language = cfg.get("language", "en_US")
-    max_apps = cfg.get("max_apps", 50)
-
-    search_results = fetch_category_top_apps(
-        client=client,
-        category_id=category_id,
-        max_results=max_apps,
-        language=language,
-    )
-
-    app_ids = [item["appId"] for item in search_results]
-    cfg_local = cfg.copy()
-    cfg_local["max_apps"] = len(app_ids)
-
-    tmp_app_ids_path = Path(cfg["output_dir"]) / "tmp_category_app_ids.txt"
-    tmp_app_ids_path.parent.mkdir(parents=True, exist_ok=True)
-    with tmp_app_ids_path.open("w", encoding="utf-8") as f:
-        for app_id in app_ids:
-            f.write(app_id + "\n")
+    queries: List[DiscoveryQuery],
+    sink: Optional[RecordSink] = None,
+    journal: Optional[RunJournal] = None,
+    fingerprints: Optional[FingerprintStore] = None,
+) -> List[AppRecord]:
+    """
+    Discover apps for any number of keyword and category queries and scrape
+    each of them once, however many queries list it.
+    """
+    app_ids = discover_app_ids(client, queries, cfg)
+    return scrape_app_ids(
+        client, app_ids, cfg, sink=sink, journal=journal, fingerprints=fingerprints
+    )
 
-    cfg_local["input_app_ids_file"] = str(tmp_app_ids_path)
-    return run_with_app_ids(client, cfg_local)
+def output_path_for(cfg: Dict[str, Any], output_format: str) -> Path:
+    output_dir = Path(cfg["output_dir"])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if output_format == "csv_normalized":
+        # A directory holding apps.csv and reviews.csv.
+        return output_dir / "google_play_data_csv"
+    return output_dir / f"google_play_data.{output_format if output_format != 'excel' else 'xlsx'}"
 
 def write_output(
-    records: List[Dict[str, Any]],
+    records: Sequence[Mapping[str, Any]],
     cfg: Dict[str, Any],
     output_format: str,
 ) -> Path:
     validate_output_format(output_format)
-    output_dir = Path(cfg["output_dir"])
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    output_path = output_dir / f"google_play_data.{output_format if output_format != 'excel' else 'xlsx'}"
+    output_path = output_path_for(cfg, output_format)
 
-    if output_format == "json":
-        write_json(records, output_path)
-    elif output_format == "csv":
-        write_csv(records, output_path)
-    elif output_format == "excel":
-        write_excel(records, output_path)
-    else:
-        raise ValueError(f"Unsupported output format: {output_format}")
+    with metrics.time("writer_seconds", writer=output_format, op="write_all"):
+        if output_format == "json":
+            write_json(records, output_path)
+        elif output_format == "jsonl":
+            write_jsonl(records, output_path)
+        elif output_format == "csv":
+            write_csv(records, output_path)
+        elif output_format == "csv_normalized":
+            write_csv_tables(records, output_path, compress=cfg.get("csv_gzip", False))
+        elif output_format == "excel":
+            write_excel(records, output_path)
+        elif output_format == "parquet":
+            write_parquet(
+                records,
+                output_path,
+                partition_by=cfg.get("parquet_partition_by"),
+                row_group_size=cfg.get("parquet_row_group_size", 10000),
+            )
+        elif output_format == "sqlite":
+            write_sqlite(records, output_path, batch_size=cfg.get("sqlite_batch_size", 500))
+        else:
+            raise ValueError(f"Unsupported output format: {output_format}")
 
     logging.info("Wrote %d records to %s", len(records), output_path)
     return output_path
 
+def open_stream_writer(
+    cfg: Dict[str, Any],
+    output_format: str,
+    resume_offset: Optional[int] = None,
+) -> Optional[StreamWriter]:
+    """
+    Return a writer that receives records as they are scraped, or None when
+    ``output_format`` is written in one go after scraping finishes.
+    """
+    if output_format == "jsonl":
+        return JsonlWriter(
+            output_path_for(cfg, output_format), resume_offset=resume_offset
+        ).open()
+    if output_format == "csv_normalized":
+        return CsvTablesWriter(
+            output_path_for(cfg, output_format),
+            compress=cfg.get("csv_gzip", False),
+        ).open()
+    if output_format == "excel":
+        return ExcelStreamWriter(output_path_for(cfg, output_format)).open()
+    if output_format == "parquet":
+        return ParquetDatasetWriter(
+            output_path_for(cfg, output_format),
+            partition_by=cfg.get("parquet_partition_by"),
+            row_group_size=cfg.get("parquet_row_group_size", 10000),
+        ).open()
+    if output_format == "sqlite":
+        return SqliteStoreWriter(
+            output_path_for(cfg, output_format),
+            batch_size=cfg.get("sqlite_batch_size", 500),
+        ).open()
+    return None
+
+def timed_sink(sink: RecordSink, output_format: str) -> RecordSink:
+    """
+    Wrap a stream writer's ``write`` so each call is recorded in the writer
+    latency histogram. Returns ``sink`` itself while metrics are disabled.
+    """
+    if not metrics.enabled:
+        return sink
+
+    def write(record: Mapping[str, Any]) -> None:
+        with metrics.time("writer_seconds", writer=output_format, op="write"):
+            sink(record)
+
+    return write
+
+def close_stream_writer(stream_writer: StreamWriter, output_format: str) -> None:
+    with metrics.time("writer_seconds", writer=output_format, op="close"):
+        stream_writer.close()
+
+def start_metrics(cfg: Dict[str, Any]) -> Optional[MetricsExporter]:
+    """
+    Enable metrics when any metrics option is set, and start publishing them
+    in the Prometheus format when a port or file is configured.
+    """
+    port = cfg.get("metrics_port")
+    prometheus_file = cfg.get("metrics_prometheus_file")
+    if not (cfg.get("metrics") or port is not None or prometheus_file):
+        return None
+    metrics.enable()
+    if port is None and not prometheus_file:
+        return None
+    return MetricsExporter(
+        port=port,
+        prometheus_file=Path(prometheus_file) if prometheus_file else None,
+        interval=cfg.get("metrics_interval", 15),
+    ).start()
+
+def finish_metrics(cfg: Dict[str, Any], exporter: Optional[MetricsExporter]) -> None:
+    """
+    Stop the exporter and write the JSON summary of the run.
+    """
+    if exporter is not None:
+        exporter.stop()
+    if not metrics.enabled:
+        return
+    summary_path = Path(cfg.get("metrics_file") or Path(cfg["output_dir"]) / "google_play_metrics.json")
+    metrics.write_summary(summary_path)
+    logging.info("Wrote metrics summary to %s", summary_path)
+
+def open_journal(cfg: Dict[str, Any], output_format: str, resume: bool) -> Optional[RunJournal]:
+    """
+    Open the run journal kept next to jsonl output. Other formats cannot be
+    appended to after a crash, so they are not journaled.
+    """
+    if output_format != "jsonl":
+        if resume:
+            raise ValueError("--resume requires --output-format jsonl.")
+        return None
+    journal = RunJournal(
+        output_path_for(cfg, output_format).with_suffix(".journal"),
+        flush_every=cfg.get("journal_flush_every", 100),
+    )
+    if resume:
+        journal.load()
+    return journal.open(resume=resume)
+
+def write_failure_list(cfg: Dict[str, Any], journal: RunJournal) -> None:
+    failed_path = Path(cfg["output_dir"]) / "failed_app_ids.txt"
+    with failed_path.open("w", encoding="utf-8") as f:
+        for app_id in sorted(journal.failed):
+            f.write(app_id + "\n")
+    if journal.failed:
+        logging.warning("%d apps failed; listed in %s", len(journal.failed), failed_path)
+
+def open_fingerprints(cfg: Dict[str, Any]) -> Optional[FingerprintStore]:
+    if not cfg.get("incremental"):
+        return None
+    path = cfg.get("fingerprints_file") or str(Path(cfg["output_dir"]) / "fingerprints.json")
+    return FingerprintStore(Path(path)).load()
+
+def write_delta(cfg: Dict[str, Any], fingerprints: FingerprintStore) -> Path:
+    """
+    Write the list of new, changed and removed apps of an incremental run.
+    Only new and changed apps are part of the regular output.
+    """
+    delta = fingerprints.delta()
+    delta_path = Path(cfg["output_dir"]) / "google_play_delta.json"
+    delta_path.parent.mkdir(parents=True, exist_ok=True)
+    with delta_path.open("w", encoding="utf-8") as f:
+        json.dump(delta, f, ensure_ascii=False, indent=2)
+    logging.info(
+        "Incremental run: %d new, %d changed, %d removed, %d unchanged (%s)",
+        len(delta["new"]),
+        len(delta["changed"]),
+        len(delta["removed"]),
+        delta["unchangedCount"],
+        delta_path,
+    )
+    return delta_path
+
+def open_review_cursors(cfg: Dict[str, Any]) -> Optional[ReviewCursors]:
+    directory = cfg.get("review_cursor_dir")
+    return ReviewCursors(Path(directory)) if directory else None
+
+def cursor_sink(sink: RecordSink, review_cursors: ReviewCursors) -> RecordSink:
+    """
+    Stage the review cursor of every record ``sink`` accepted; the caller
+    saves them once the writer has the records on disk.
+    """
+
+    def write(record: Mapping[str, Any]) -> None:
+        sink(record)
+        review_cursors.stage(record)
+
+    return write
+
+def commit_written(
+    review_index: Optional[ReviewIndex], review_cursors: Optional[ReviewCursors]
+) -> None:
+    """
+    Commit the seen reviews and review cursors of the records written so far.
+    """
+    if review_index is not None:
+        review_index.commit()
+    if review_cursors is not None:
+        review_cursors.commit()
+
+def build_review_index(cfg: Dict[str, Any]) -> Optional[ReviewIndex]:
+    """
+    The index of already emitted reviews, opened on first use. The sqlite
+    store replaces an app's reviews on every upsert, so it is never
+    deduplicated: that would leave only the new reviews in it.
+    """
+    if not cfg.get("review_dedup"):
+        return None
+    if cfg.get("output_format") == "sqlite":
+        logging.warning(
+            "--dedup-reviews does not apply to the sqlite store, which keeps "
+            "each app's latest reviews; ignoring it."
+        )
+        return None
+    directory = cfg.get("review_index_dir") or str(Path(cfg["output_dir"]) / "review_index")
+    return ReviewIndex(
+        Path(directory),
+        capacity=cfg.get("review_dedup_capacity", 1000000),
+        fp_rate=cfg.get("review_dedup_fp_rate", 0.001),
+    )
+
+def drop_seen_reviews(record: Mapping[str, Any], review_index: ReviewIndex) -> Mapping[str, Any]:
+    """
+    Keep only the reviews of ``record`` that no run has emitted before;
+    ``reviewsCount`` follows the reviews that are left. The record is
+    updated in place.
+    """
+    reviews = record.get("reviews")
+    if reviews:
+        fresh = review_index.filter_new(record.get("appId"), reviews)
+        metrics.inc("review_duplicates_total", len(reviews) - len(fresh))
+        # Both AppRecords and the dicts read back from shards take item
+        # assignment for their fields.
+        writable = cast(MutableMapping[str, Any], record)
+        writable["reviews"] = fresh
+        writable["reviewsCount"] = len(fresh)
+    return record
+
+def dedup_sink(sink: RecordSink, review_index: ReviewIndex) -> RecordSink:
+    """
+    Drop already emitted reviews before ``sink`` writes a record. The new
+    ones are only staged; the caller commits them to the index once the
+    writer has them on disk.
+    """
+
+    def write(record: Mapping[str, Any]) -> None:
+        record = drop_seen_reviews(record, review_index)
+        try:
+            sink(record)
+        except BaseException:
+            review_index.discard(record.get("appId"), record.get("reviews") or [])
+            raise
+
+    return write
+
+def write_deduplicated_output(
+    records: Sequence[Mapping[str, Any]],
+    cfg: Dict[str, Any],
+    output_format: str,
+    review_index: Optional[ReviewIndex],
+) -> Path:
+    """
+    ``write_output`` with already emitted reviews dropped first. The new
+    ones are only committed to the index once the output is written.
+    """
+    if review_index is None:
+        return write_output(records, cfg, output_format)
+    records = [drop_seen_reviews(record, review_index) for record in records]
+    try:
+        output_path = write_output(records, cfg, output_format)
+    except BaseException:
+        review_index.close(commit=False)
+        raise
+    review_index.commit()
+    return output_path
+
+def collect_queries(cfg: Dict[str, Any], mode: str) -> List[DiscoveryQuery]:
+    """
+    Keyword and/or category queries of the keyword, category and discover
+    modes: ``keywords`` (or the single ``keyword``) and ``categories`` (or
+    ``category_id``), plus the lines of ``keywords_file`` and
+    ``categories_file``.
+    """
+    queries: List[DiscoveryQuery] = []
+    if mode in ("keyword", "discover"):
+        keywords = cfg.get("keywords") or ([cfg["keyword"]] if cfg.get("keyword") else [])
+        queries.extend(("keyword", keyword) for keyword in keywords)
+        if cfg.get("keywords_file"):
+            queries.extend(read_queries(Path(cfg["keywords_file"]), "keyword"))
+    if mode in ("category", "discover"):
+        categories = cfg.get("categories") or ([cfg["category_id"]] if cfg.get("category_id") else [])
+        queries.extend(("category", category_id) for category_id in categories)
+        if cfg.get("categories_file"):
+            queries.extend(read_queries(Path(cfg["categories_file"]), "category"))
+
+    if not queries:
+        if mode == "keyword":
+            raise ValueError("Keyword mode requires a --keyword argument or 'keyword' in config.")
+        if mode == "category":
+            raise ValueError("Category mode requires a --category argument or 'category_id' in config.")
+        if mode == "discover":
+            raise ValueError(
+                "Discover mode requires --keyword, --category, --keywords-file or --categories-file."
+            )
+    return queries
+
+def app_ids_for_mode(client: RequestClient, cfg: Dict[str, Any], mode: str) -> List[str]:
+    """
+    App IDs the given mode would scrape, without scraping them.
+    """
+    if mode == "app_ids":
+        return read_app_ids(Path(cfg["input_app_ids_file"]), cfg.get("max_apps", 50))
+    if cfg.get("discovery_max_pages") is None:
+        # Keyword and category mode read just the results page unless told
+        # otherwise; discover mode also follows the clusters it links to.
+        cfg = dict(cfg, discovery_max_pages=5 if mode == "discover" else 1)
+    return discover_app_ids(client, collect_queries(cfg, mode), cfg)
+
+def run_queue_action(
+    action: str,
+    client: RequestClient,
+    cfg: Dict[str, Any],
+    mode: str,
+    worker_id: Optional[str],
+    review_index: Optional[ReviewIndex] = None,
+) -> int:
+    """
+    Distributed runs: ``enqueue`` seeds the shared queue, any number of
+    ``work`` processes drain it into per-worker shards, ``merge`` combines
+    the shards into the regular output and ``status`` reports progress.
+    Reviews are deduplicated against ``review_index`` when merging.
+    """
+    shard_dir = Path(cfg.get("shard_dir") or Path(cfg["output_dir"]) / "shards")
+    queue = WorkQueue(
+        Path(cfg["queue_file"]),
+        visibility_timeout=cfg.get("queue_visibility_timeout", 600),
+        max_attempts=cfg.get("queue_max_attempts", 3),
+    )
+    with queue:
+        if action == "enqueue":
+            app_ids = app_ids_for_mode(client, cfg, mode)
+            added = queue.enqueue(app_ids)
+            logging.info("Queued %d new apps (%d already queued).", added, len(app_ids) - added)
+        elif action == "work":
+            worker_id = worker_id or default_worker_id()
+            writer = open_shard_writer(shard_dir, worker_id)
+            try:
+                stats = run_worker(client, queue, cfg, worker_id, writer)
+            finally:
+                writer.close()
+            logging.info("Worker %s finished: %s (shard %s)", worker_id, stats, writer.output_path)
+        elif action == "merge":
+            output_format = cfg.get("output_format", "json")
+            validate_output_format(output_format)
+            counts = queue.counts()
+            if counts["pending"] or counts["leased"]:
+                logging.warning(
+                    "Merging while %d apps are still pending or leased.",
+                    counts["pending"] + counts["leased"],
+                )
+            stream_writer = open_stream_writer(cfg, output_format)
+            if stream_writer is None:
+                records = list(iter_shard_records(shard_dir))
+                if not records:
+                    logging.warning("No records found in %s.", shard_dir)
+                    return 1
+                write_deduplicated_output(records, cfg, output_format, review_index)
+            else:
+                write = timed_sink(stream_writer.write, output_format)
+                if review_index is not None:
+                    write = dedup_sink(write, review_index)
+                try:
+                    for record in iter_shard_records(shard_dir):
+                        write(record)
+                finally:
+                    close_stream_writer(stream_writer, output_format)
+                if review_index is not None:
+                    review_index.commit()
+                logging.info(
+                    "Merged %d records into %s",
+                    stream_writer.records_written,
+                    stream_writer.output_path,
+                )
+        elif action == "status":
+            status = {
+                "counts": queue.counts(),
+                "deadLetters": [
+                    {"appId": app_id, "attempts": attempts, "lastError": error}
+                    for app_id, attempts, error in queue.dead_letters()
+                ],
+            }
+            print(json.dumps(status, indent=2))
+        else:
+            raise ValueError(f"Unsupported queue action: {action}")
+    return 0
+
 def parse_args(argv: List[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Google Play Scraper - extract app details and reviews from Google Play Store."
     )
+    parser.add_argument(
+        "--config",
+        type=str,
+        help=f"Settings file to use instead of {CONFIG_RELATIVE_PATH}.",
+    )
     parser.add_argument(
         "--mode",
-        choices=["app_ids", "keyword", "category"],
-        help="Scraping mode: app_ids, keyword, or category (overrides config).",
+        choices=["app_ids", "keyword", "category", "discover"],
+        help=(
+            "Scraping mode: app_ids, keyword, category, or discover for any mix of "
+            "keywords and categories (overrides config)."
+        ),
     )
     parser.add_argument(
         "--keyword",
-        type=str,
-        help="Keyword for search mode.",
+        action="append",
+        help="Keyword for keyword or discover mode; repeat for several.",
     )
     parser.add_argument(
         "--category",
+        action="append",
+        help="Category ID for category or discover mode (e.g., APPLICATION, GAME_ARCADE); repeat for several.",
+    )
+    parser.add_argument(
+        "--keywords-file",
         type=str,
-        help="Category ID for category mode (e.g., APPLICATION, GAME_ARCADE).",
+        help="File with one keyword per line (keyword and discover modes).",
+    )
+    parser.add_argument(
+        "--categories-file",
+        type=str,
+        help="File with one category ID per line (category and discover modes).",
+    )
+    parser.add_argument(
+        "--discovery-max-pages",
+        type=int,
+        help=(
+            "Result pages, including followed clusters, fetched per query (overrides config). "
+            "Defaults to 1 in keyword and category mode and 5 in discover mode."
+        ),
     )
     parser.add_argument(
         "--output-format",
-        choices=["json", "csv", "excel"],
-        help="Output format (overrides config).",
+        choices=["json", "jsonl", "csv", "csv_normalized", "excel", "parquet", "sqlite"],
+        help=(
+            "Output format (overrides config). jsonl, csv_normalized, excel, "
+            "parquet and sqlite are written as records are scraped; sqlite "
+            "upserts into a store kept across runs (see 'main.py query')."
+        ),
+    )
+    parser.add_argument(
+        "--csv-gzip",
+        action="store_true",
+        help="Gzip-compress the csv_normalized output files.",
+    )
+    parser.add_argument(
+        "--parquet-partition-by",
+        choices=sorted(PARTITION_COLUMNS),
+        help="Split the Parquet tables into one directory per scrape date or genre.",
     )
     parser.add_argument(
         "--max-apps",
         type=int,
         help="Maximum number of apps to process.",
     )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        help=(
+            "Comma-separated fields to extract, e.g. title,score,installs (appId is always "
+            "included). Reviews are only fetched when reviews or reviewsCount is listed."
+        ),
+    )
     parser.add_argument(
         "--max-reviews-per-app",
         type=int,
         help="Maximum reviews to fetch per app.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Number of apps to scrape in parallel (overrides config).",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        help="Parse pages in this many worker processes while threads keep fetching (0 = off).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory for the on-disk HTTP response cache (enables caching).",
+    )
+    parser.add_argument(
+        "--html-parser",
+        choices=PARSER_BACKENDS,
+        help="HTML parser backend used by all extractors (overrides config).",
+    )
+    parser.add_argument(
+        "--review-source",
+        choices=["page", "paginated"],
+        help="Read reviews from the details page or page through the review feed.",
+    )
+    parser.add_argument(
+        "--review-sort",
+        choices=sorted(SORT_ORDERS),
+        help="Review order for the paginated feed (overrides config).",
+    )
+    parser.add_argument(
+        "--review-stars",
+        type=int,
+        choices=[1, 2, 3, 4, 5],
+        help="Only fetch reviews with this star rating (paginated feed only).",
+    )
+    parser.add_argument(
+        "--review-cursor-dir",
+        type=str,
+        help="Directory where per-app review cursors are saved and resumed from.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only output apps that are new or changed since the previous incremental run.",
+    )
+    parser.add_argument(
+        "--dedup-reviews",
+        action="store_true",
+        help=(
+            "Only output reviews that no previous deduplicated run has output "
+            "(not with the sqlite store)."
+        ),
+    )
+    parser.add_argument(
+        "--review-index",
+        type=str,
+        help="Directory of the seen-review index used by --dedup-reviews.",
+    )
+    parser.add_argument(
+        "--review-fp-rate",
+        type=float,
+        help="Target false positive rate of the seen-review Bloom filter (overrides config).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip apps finished by the previous jsonl run and append to its output.",
+    )
+    parser.add_argument(
+        "--adaptive-rate",
+        action="store_true",
+        help="Adapt per-host concurrency to 429/5xx responses and open a circuit on repeated failures.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="Maximum requests per second per host (0 = unlimited, overrides config).",
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        help="SQLite work queue shared by distributed workers (overrides config).",
+    )
+    parser.add_argument(
+        "--queue-action",
+        choices=["enqueue", "work", "merge", "status"],
+        default="work",
+        help="With --queue: seed it, work on it, merge the worker shards, or show progress.",
+    )
+    parser.add_argument(
+        "--worker-id",
+        type=str,
+        help="Name of this worker and its output shard (default: <hostname>-<pid>).",
+    )
+    parser.add_argument(
+        "--capture-archive",
+        type=str,
+        help="Also store every raw response in this page archive for later replay.",
+    )
+    parser.add_argument(
+        "--replay-archive",
+        type=str,
+        help="Re-extract all apps from this page archive instead of scraping (no network).",
+    )
+    parser.add_argument(
+        "--replay-workers",
+        type=int,
+        help="Processes used by --replay-archive (0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record latency histograms and counters and write a JSON summary at exit.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve the metrics in the Prometheus format on this port during the run.",
+    )
+    parser.add_argument(
+        "--metrics-prometheus-file",
+        type=str,
+        help="Periodically write the metrics in the Prometheus format to this file.",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Scrape on an asyncio event loop instead of worker threads.",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -249,15 +960,29 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     )
     return parser.parse_args(argv)
 
+def run_store_query(argv: List[str]) -> int:
+    """
+    ``main.py query [...]``: export filtered apps from the SQLite result
+    store, by default the one a sqlite run with the default config writes.
+    """
+    setup_logging(1)
+    root_dir = Path(__file__).resolve().parents[1]
+    config = resolve_paths(root_dir, load_config(root_dir))
+    default_store = Path(config["output_dir"]) / "google_play_data.sqlite"
+    return store_query.main(argv, default_store=default_store)
+
 def main(argv: List[str] | None = None) -> int:
     if argv is None:
         argv = sys.argv[1:]
 
+    if argv[:1] == ["query"]:
+        return run_store_query(argv[1:])
+
     args = parse_args(argv)
     setup_logging(args.verbose)
 
     root_dir = Path(__file__).resolve().parents[1]
-    raw_config = load_config(root_dir)
+    raw_config = load_config(root_dir, Path(args.config).resolve() if args.config else None)
     config = resolve_paths(root_dir, raw_config)
 
     if args.max_apps is not None:
@@ -266,40 +991,239 @@ def main(argv: List[str] | None = None) -> int:
         config["max_reviews_per_app"] = args.max_reviews_per_app
     if args.output_format:
         config["output_format"] = args.output_format
+    if args.csv_gzip:
+        config["csv_gzip"] = True
+    if args.parquet_partition_by:
+        config["parquet_partition_by"] = args.parquet_partition_by
+    if args.concurrency is not None:
+        config["concurrency"] = args.concurrency
+    if args.parse_workers is not None:
+        config["parse_workers"] = args.parse_workers
+    if args.use_async:
+        config["use_async"] = True
+    if args.adaptive_rate:
+        config["adaptive_rate"] = True
+    if args.rate_limit is not None:
+        config["rate_limit_per_host"] = args.rate_limit
+        config["adaptive_rate"] = True
+    if args.resume:
+        config["resume"] = True
+    if args.incremental:
+        config["incremental"] = True
+    if args.dedup_reviews:
+        config["review_dedup"] = True
+    if args.review_index:
+        config["review_index_dir"] = str(Path(args.review_index).resolve())
+    if args.review_fp_rate is not None:
+        config["review_dedup_fp_rate"] = args.review_fp_rate
+    if args.cache_dir:
+        config["cache_dir"] = str(Path(args.cache_dir).resolve())
+    if args.html_parser:
+        config["html_parser"] = args.html_parser
+    if args.review_source:
+        config["review_source"] = args.review_source
+    if args.fields:
+        config["fields"] = args.fields
+    if args.review_sort:
+        config["review_sort"] = args.review_sort
+    if args.review_stars is not None:
+        config["review_filter_score"] = args.review_stars
+    if args.review_cursor_dir:
+        config["review_cursor_dir"] = str(Path(args.review_cursor_dir).resolve())
+    if args.queue:
+        config["queue_file"] = str(Path(args.queue).resolve())
+    if args.keyword:
+        config["keywords"] = args.keyword
+    if args.category:
+        config["categories"] = args.category
+    if args.keywords_file:
+        config["keywords_file"] = str(Path(args.keywords_file).resolve())
+    if args.categories_file:
+        config["categories_file"] = str(Path(args.categories_file).resolve())
+    if args.discovery_max_pages is not None:
+        config["discovery_max_pages"] = args.discovery_max_pages
+    if args.capture_archive:
+        config["capture_archive"] = str(Path(args.capture_archive).resolve())
+    if args.replay_archive:
+        config["replay_archive"] = str(Path(args.replay_archive).resolve())
+        if args.max_apps is not None:
+            config["replay_max_apps"] = args.max_apps
+    if args.replay_workers is not None:
+        config["replay_workers"] = args.replay_workers
+    if args.metrics:
+        config["metrics"] = True
+    if args.metrics_port is not None:
+        config["metrics_port"] = args.metrics_port
+    if args.metrics_prometheus_file:
+        config["metrics_prometheus_file"] = str(Path(args.metrics_prometheus_file).resolve())
 
     mode = args.mode or config.get("mode", "app_ids")
     validate_mode(mode)
+    validate_review_source(config.get("review_source", "page"))
+    if config.get("fields"):
+        config["fields"] = select_fields(config["fields"])
+    set_default_parser(config.get("html_parser", "html.parser"))
 
+    if config.get("replay_archive") and config.get("incremental"):
+        raise ValueError("--replay-archive cannot be combined with --incremental.")
+
+    exporter = start_metrics(config)
+    archive = open_capture_archive(config)
+    review_index = build_review_index(config)
+    try:
+        return run(args, config, mode, archive, review_index)
+    finally:
+        if review_index is not None and review_index.is_open:
+            # Reviews are committed once their output is on disk; anything
+            # still staged here was never durably written.
+            review_index.close(commit=False)
+            logging.info("Review index: %s", review_index.stats())
+        if archive is not None:
+            archive.close()
+            logging.info("Page archive: %s", archive.stats())
+        finish_metrics(config, exporter)
+
+def run(
+    args: argparse.Namespace,
+    config: Dict[str, Any],
+    mode: str,
+    archive: Optional[ArchiveWriter] = None,
+    review_index: Optional[ReviewIndex] = None,
+) -> int:
     user_agent = config.get(
         "user_agent",
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/120.0.0.0 Safari/537.36",
     )
+    config["user_agent"] = user_agent
 
-    client = build_client(user_agent=user_agent)
+    cache = build_cache(config)
+    rate_controller = build_rate_controller(config)
+    client = build_client(
+        user_agent=user_agent,
+        concurrency=validate_concurrency(config.get("concurrency", 1)),
+        cache=cache,
+        rate_controller=rate_controller,
+        max_backoff=config.get("max_backoff_seconds", 30),
+        archive=archive,
+    )
 
-    if mode == "app_ids":
-        records = run_with_app_ids(client, config)
-    elif mode == "keyword":
-        keyword = args.keyword or config.get("keyword")
-        if not keyword:
-            raise ValueError("Keyword mode requires a --keyword argument or 'keyword' in config.")
-        records = run_with_keyword_search(client, config, keyword)
-    elif mode == "category":
-        category_id = args.category or config.get("category_id")
-        if not category_id:
-            raise ValueError("Category mode requires a --category argument or 'category_id' in config.")
-        records = run_with_category(client, config, category_id)
-    else:
-        raise ValueError(f"Unsupported mode: {mode}")
+    if config.get("queue_file"):
+        return run_queue_action(
+            args.queue_action,
+            client,
+            config,
+            mode,
+            worker_id=args.worker_id,
+            review_index=review_index,
+        )
 
+    use_async = config.get("use_async", False)
+    output_format = config.get("output_format", "json")
+    validate_output_format(output_format)
+    resume = config.get("resume", False)
+    journal = open_journal(config, output_format, resume)
+    stream_writer = open_stream_writer(
+        config,
+        output_format,
+        resume_offset=journal.resume_offset if journal is not None and resume else None,
+    )
+    review_cursors = open_review_cursors(config)
+    sink = timed_sink(stream_writer.write, output_format) if stream_writer is not None else None
+    if sink is not None and review_index is not None:
+        sink = dedup_sink(sink, review_index)
+    if sink is not None and review_cursors is not None:
+        sink = cursor_sink(sink, review_cursors)
+    if journal is not None and isinstance(stream_writer, JsonlWriter):
+        journal.offset_source = stream_writer.tell
+        journal.sync_output = stream_writer.sync
+        if review_index is not None or review_cursors is not None:
+            # A resumed run cuts the output back to the last journaled
+            # offset, so reviews and cursors are only committed along
+            # with the journal.
+            journal.after_flush = functools.partial(commit_written, review_index, review_cursors)
+
+    fingerprints = open_fingerprints(config)
+    run_options: Dict[str, Any] = {
+        "sink": sink,
+        "journal": journal,
+        "fingerprints": fingerprints,
+    }
+
+    try:
+        if config.get("replay_archive"):
+            records = run_replay(config, sink=sink, journal=journal)
+        elif mode == "app_ids" and not use_async:
+            records = run_with_app_ids(client, config, **run_options)
+        else:
+            # Queries are discovered with the sync client on every engine.
+            app_ids = app_ids_for_mode(client, config, mode)
+            if use_async:
+                records = asyncio.run(
+                    async_run_with_app_ids(
+                        app_ids, config,
+                        cache=cache,
+                        rate_controller=rate_controller,
+                        archive=archive,
+                        **run_options,
+                    )
+                )
+            else:
+                records = scrape_app_ids(client, app_ids, config, **run_options)
+    finally:
+        # The journal syncs the output before its last batch, so it is closed
+        # while the writer is still open.
+        if journal is not None:
+            journal.close()
+        if stream_writer is not None:
+            close_stream_writer(stream_writer, output_format)
+    if stream_writer is not None:
+        commit_written(review_index, review_cursors)
+    if stream_writer is None and records:
+        write_deduplicated_output(records, config, output_format, review_index)
+        if review_cursors is not None:
+            for record in records:
+                review_cursors.stage(record)
+            review_cursors.commit()
+
+    # Only once the output is written: apps saved as seen here are skipped
+    # by the next incremental run even if they never reached any output.
+    if fingerprints is not None:
+        write_delta(config, fingerprints)
+        fingerprints.save()
+
+    if journal is not None:
+        write_failure_list(config, journal)
+
+    if cache is not None:
+        logging.info("HTTP cache: %s", cache.stats())
+    if rate_controller is not None:
+        logging.info("Rate control: %s", rate_controller.stats())
+
+    if stream_writer is not None:
+        if not stream_writer.records_written and journal is not None and journal.completed:
+            logging.info("All apps were already finished by the previous run.")
+            return 0
+        if not stream_writer.records_written and fingerprints is not None:
+            logging.info("No app changed since the previous run.")
+            return 0
+        if not stream_writer.records_written:
+            logging.warning("No records scraped. Exiting.")
+            return 1
+        logging.info(
+            "Streamed %d records to %s",
+            stream_writer.records_written,
+            stream_writer.output_path,
+        )
+        return 0
+
+    if not records and fingerprints is not None:
+        logging.info("No app changed since the previous run.")
+        return 0
     if not records:
         logging.warning("No records scraped. Exiting.")
         return 1
-
-    output_format = config.get("output_format", "json")
-    write_output(records, config, output_format)
     return 0
 
 if __name__ == "__main__":
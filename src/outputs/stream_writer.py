@@ -0,0 +1,15 @@
+from pathlib import Path
+from typing import Any, Mapping, Protocol
+
+class StreamWriter(Protocol):
+    """
+    Interface of the writers that receive records one at a time while the
+    scrape is running instead of a finished list.
+    """
+
+    output_path: Path
+    records_written: int
+
+    def write(self, record: Mapping[str, Any]) -> None: ...
+
+    def close(self) -> None: ...
@@ -1,9 +1,36 @@
 import csv
+import gzip
 import json
+import logging
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, List, Mapping, Optional, Sequence, Set
 
-def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+from utils.records import to_builtin
+
+logger = logging.getLogger(__name__)
+
+# Declared columns of the normalized export, covering every field produced by
+# fetch_app_details plus reviewsCount. Reviews go to their own file.
+APP_COLUMNS = [
+    "appId",
+    "title",
+    "description",
+    "score",
+    "ratings",
+    "installs",
+    "screenshots",
+    "video",
+    "developerEmail",
+    "developerWebsite",
+    "developerAddress",
+    "genre",
+    "categories",
+    "reviewsCount",
+]
+
+REVIEW_COLUMNS = ["appId", "userName", "score", "text", "date", "version", "thumbsUp"]
+
+def _flatten_record(record: Mapping[str, Any]) -> Dict[str, Any]:
     """
     Flatten nested record so that it can be stored in a single CSV row.
 
@@ -12,12 +39,12 @@ def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
     flat: Dict[str, Any] = {}
     for key, value in record.items():
         if key == "reviews":
-            flat[key] = json.dumps(value, ensure_ascii=False)
+            flat[key] = json.dumps(value, ensure_ascii=False, default=to_builtin)
         else:
             flat[key] = value
     return flat
 
-def write_csv(records: List[Dict[str, Any]], output_path: Path) -> None:
+def write_csv(records: Sequence[Mapping[str, Any]], output_path: Path) -> None:
     if not records:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with output_path.open("w", encoding="utf-8", newline="") as f:
@@ -34,4 +61,94 @@ def write_csv(records: List[Dict[str, Any]], output_path: Path) -> None:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         for row in flat_records:
-            writer.writerow(row)
\ No newline at end of file
+            writer.writerow(row)
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+class CsvTablesWriter:
+    """
+    Streams records into two CSV files under ``output_path``:
+    - apps.csv: one row per app, with the columns in ``APP_COLUMNS``
+    - reviews.csv: one row per individual review with appId back-reference
+
+    The header is fixed up front, so rows are written as soon as each record
+    arrives and nothing is held in memory. Lists such as screenshots are
+    stored as JSON. With ``compress`` the files are written as .csv.gz.
+    """
+
+    def __init__(self, output_path: Path, compress: bool = False) -> None:
+        self.output_path = output_path
+        self.compress = compress
+        self.records_written = 0
+        self._files: List[IO[str]] = []
+        self._apps: Optional[csv.DictWriter] = None
+        self._reviews: Optional[csv.DictWriter] = None
+        self._unknown_fields: Set[str] = set()
+
+    def _open_table(self, name: str, columns: List[str]) -> csv.DictWriter:
+        suffix = ".csv.gz" if self.compress else ".csv"
+        path = self.output_path / f"{name}{suffix}"
+        if self.compress:
+            f = gzip.open(path, "wt", encoding="utf-8", newline="")
+        else:
+            f = path.open("w", encoding="utf-8", newline="")
+        self._files.append(f)
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        return writer
+
+    def open(self) -> "CsvTablesWriter":
+        self.output_path.mkdir(parents=True, exist_ok=True)
+        # Drop files a previous run wrote with the other compression setting.
+        stale_suffix = ".csv" if self.compress else ".csv.gz"
+        for name in ("apps", "reviews"):
+            (self.output_path / f"{name}{stale_suffix}").unlink(missing_ok=True)
+        self._apps = self._open_table("apps", APP_COLUMNS)
+        self._reviews = self._open_table("reviews", REVIEW_COLUMNS)
+        return self
+
+    def _warn_unknown(self, row: Mapping[str, Any], columns: List[str]) -> None:
+        unknown = set(row) - set(columns) - self._unknown_fields - {"reviews"}
+        if unknown:
+            self._unknown_fields.update(unknown)
+            logger.warning(
+                "Fields %s are not part of the CSV schema and are not exported.",
+                ", ".join(sorted(unknown)),
+            )
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        if self._apps is None:
+            self.open()
+        assert self._apps is not None and self._reviews is not None
+
+        self._warn_unknown(record, APP_COLUMNS)
+        self._apps.writerow({column: _cell(record.get(column)) for column in APP_COLUMNS})
+        app_id = record.get("appId")
+        for review in record.get("reviews") or []:
+            row = {"appId": app_id}
+            row.update(review)
+            self._reviews.writerow(row)
+        self.records_written += 1
+
+    def close(self) -> None:
+        for f in self._files:
+            f.close()
+        self._files.clear()
+
+    def __enter__(self) -> "CsvTablesWriter":
+        return self.open()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def write_csv_tables(
+    records: Sequence[Mapping[str, Any]],
+    output_path: Path,
+    compress: bool = False,
+) -> None:
+    with CsvTablesWriter(output_path, compress=compress) as writer:
+        for record in records:
+            writer.write(record)
@@ -1,40 +1,106 @@
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, List, Mapping, Optional, Sequence
 
-import pandas as pd
+from openpyxl import Workbook
 
-def write_excel(records: List[Dict[str, Any]], output_path: Path) -> None:
+# Rows per sheet in .xlsx files, including the header row.
+EXCEL_MAX_ROWS = 1048576
+
+REVIEW_COLUMNS = ["appId", "userName", "score", "text", "date", "version", "thumbsUp"]
+
+def _cell(value: Any) -> Any:
+    # Same rendering pandas used for nested values before.
+    if isinstance(value, (list, dict, tuple)):
+        return str(value)
+    return value
+
+class _RollingSheet:
+    """
+    A logical sheet that continues on "<name>_2", "<name>_3", ... whenever
+    the current worksheet reaches ``max_rows``. Every part gets the header.
     """
-    Write records into an Excel file with two sheets:
+
+    def __init__(self, workbook: Workbook, name: str, max_rows: int) -> None:
+        self.workbook = workbook
+        self.name = name
+        self.max_rows = max_rows
+        self.columns: Optional[List[str]] = None
+        self.parts = 0
+        self._sheet: Any = None
+        self._rows = 0
+
+    def set_columns(self, columns: List[str]) -> None:
+        self.columns = columns
+        self._start_part()
+
+    def _start_part(self) -> None:
+        self.parts += 1
+        title = self.name if self.parts == 1 else f"{self.name}_{self.parts}"
+        self._sheet = self.workbook.create_sheet(title)
+        self._sheet.append(self.columns)
+        self._rows = 1
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        assert self.columns is not None and self._sheet is not None
+        if self._rows >= self.max_rows:
+            self._start_part()
+        self._sheet.append([_cell(row.get(column)) for column in self.columns])
+        self._rows += 1
+
+class ExcelStreamWriter:
+    """
+    Writes records into an Excel file with two sheets:
     - apps: one row per app
     - reviews: one row per individual review with appId back-reference
+
+    The workbook is opened in openpyxl's write-only mode, where appended rows
+    go straight to temporary files on disk, so memory stays constant as the
+    run grows. Sheets that reach Excel's row limit continue on "apps_2",
+    "reviews_2" and so on.
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if not records:
-        # Create an empty workbook with a note
-        df_empty = pd.DataFrame([{"message": "No records to write."}])
-        with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-            df_empty.to_excel(writer, sheet_name="info", index=False)
-        return
+    def __init__(self, output_path: Path, max_rows: int = EXCEL_MAX_ROWS) -> None:
+        self.output_path = output_path
+        self.records_written = 0
+        self._workbook: Optional[Workbook] = Workbook(write_only=True)
+        self._apps = _RollingSheet(self._workbook, "apps", max_rows)
+        self._reviews = _RollingSheet(self._workbook, "reviews", max_rows)
 
-    apps_rows: List[Dict[str, Any]] = []
-    reviews_rows: List[Dict[str, Any]] = []
+    def open(self) -> "ExcelStreamWriter":
+        return self
 
-    for record in records:
-        app_copy = {k: v for k, v in record.items() if k != "reviews"}
-        apps_rows.append(app_copy)
+    def write(self, record: Mapping[str, Any]) -> None:
+        if self._apps.columns is None:
+            self._apps.set_columns([key for key in record if key != "reviews"])
+            self._reviews.set_columns(REVIEW_COLUMNS)
 
-        for review in record.get("reviews", []):
-            row = {"appId": record.get("appId")}
+        self._apps.append(record)
+        app_id = record.get("appId")
+        for review in record.get("reviews") or []:
+            row = {"appId": app_id}
             row.update(review)
-            reviews_rows.append(row)
+            self._reviews.append(row)
+        self.records_written += 1
+
+    def close(self) -> None:
+        if self._workbook is None:
+            return
+        if self._apps.columns is None:
+            # Create an empty workbook with a note
+            info = self._workbook.create_sheet("info")
+            info.append(["message"])
+            info.append(["No records to write."])
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._workbook.save(self.output_path)
+        self._workbook = None
+
+    def __enter__(self) -> "ExcelStreamWriter":
+        return self.open()
 
-    apps_df = pd.DataFrame(apps_rows)
-    reviews_df = pd.DataFrame(reviews_rows) if reviews_rows else pd.DataFrame(
-        columns=["appId", "userName", "score", "text", "date", "version", "thumbsUp"]
-    )
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        apps_df.to_excel(writer, sheet_name="apps", index=False)
-        reviews_df.to_excel(writer, sheet_name="reviews", index=False)
\ No newline at end of file
+def write_excel(records: Sequence[Mapping[str, Any]], output_path: Path) -> None:
+    with ExcelStreamWriter(output_path) as writer:
+        for record in records:
+            writer.write(record)
@@ -1,8 +1,10 @@
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Mapping, Sequence
 
-def write_json(records: List[Dict[str, Any]], output_path: Path) -> None:
+from utils.records import to_builtin
+
+def write_json(records: Sequence[Mapping[str, Any]], output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as f:
-        json.dump(records, f, ensure_ascii=False, indent=2)
\ No newline at end of file
+        json.dump(records, f, ensure_ascii=False, indent=2, default=to_builtin)
\ No newline at end of file
@@ -0,0 +1,69 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, IO, Mapping, Optional, Sequence
+
+from utils.records import to_builtin
+
+class JsonlWriter:
+    """
+    Appends records to a JSON Lines file as they are produced.
+
+    Every record is written as one line and flushed immediately, so memory
+    use does not depend on the number of records and everything written
+    before a crash stays on disk as complete lines.
+
+    With ``resume_offset`` the existing file is cut back to that size and
+    new records are appended after it.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        append: bool = False,
+        resume_offset: Optional[int] = None,
+    ) -> None:
+        self.output_path = output_path
+        self.append = append or resume_offset is not None
+        self.resume_offset = resume_offset
+        self.records_written = 0
+        self._file: Optional[IO[str]] = None
+
+    def open(self) -> "JsonlWriter":
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.resume_offset is not None and self.output_path.exists():
+            os.truncate(self.output_path, self.resume_offset)
+        self._file = self.output_path.open("a" if self.append else "w", encoding="utf-8")
+        return self
+
+    def tell(self) -> int:
+        return self._file.tell() if self._file is not None else 0
+
+    def sync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        if self._file is None:
+            self.open()
+        assert self._file is not None
+        self._file.write(json.dumps(record, ensure_ascii=False, default=to_builtin))
+        self._file.write("\n")
+        self._file.flush()
+        self.records_written += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "JsonlWriter":
+        return self.open()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def write_jsonl(records: Sequence[Mapping[str, Any]], output_path: Path) -> None:
+    with JsonlWriter(output_path) as writer:
+        for record in records:
+            writer.write(record)
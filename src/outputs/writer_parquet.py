@@ -0,0 +1,228 @@
+import shutil
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional output backend
+    pa = None
+    pq = None
+
+PARTITION_COLUMNS = {
+    "scrape_date": "scrapeDate",
+    "genre": "genre",
+}
+
+# pyarrow's name for a missing partition value, so readers map it back to null.
+_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Left in every dataset directory this writer creates, so a later run knows
+# it may replace it. Dataset readers skip names starting with a dot.
+_DATASET_MARKER = ".google-play-scraper-dataset"
+
+# Everything a dataset written before the marker existed can contain.
+_DATASET_ENTRIES = {"apps.parquet", "reviews.parquet", "apps", "reviews"}
+
+def _apps_schema() -> "pa.Schema":
+    return pa.schema(
+        [
+            pa.field("appId", pa.string(), nullable=False),
+            pa.field("title", pa.string()),
+            pa.field("description", pa.string()),
+            pa.field("score", pa.float64()),
+            pa.field("ratings", pa.int64()),
+            pa.field("installs", pa.string()),
+            pa.field("screenshots", pa.list_(pa.string())),
+            pa.field("video", pa.string()),
+            pa.field("developerEmail", pa.string()),
+            pa.field("developerWebsite", pa.string()),
+            pa.field("developerAddress", pa.string()),
+            pa.field("genre", pa.string()),
+            pa.field("categories", pa.list_(pa.string())),
+            pa.field("reviewsCount", pa.int64()),
+        ]
+    )
+
+def _reviews_schema() -> "pa.Schema":
+    return pa.schema(
+        [
+            pa.field("appId", pa.string(), nullable=False),
+            pa.field("userName", pa.string()),
+            pa.field("score", pa.float64()),
+            pa.field("text", pa.string()),
+            pa.field("date", pa.timestamp("s", tz="UTC")),
+            pa.field("version", pa.string()),
+            pa.field("thumbsUp", pa.int64()),
+        ]
+    )
+
+def _parse_review_date(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+class _TableBuffer:
+    """
+    Column buffers for one output file, flushed as a row group whenever
+    ``row_group_size`` rows have accumulated.
+    """
+
+    def __init__(self, path: Path, schema: "pa.Schema", row_group_size: int) -> None:
+        self.path = path
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+        self.rows = 0
+        self._writer: Optional["pq.ParquetWriter"] = None
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        for name, values in self.columns.items():
+            values.append(row.get(name))
+        self.rows += 1
+        if self.rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows and self._writer is not None:
+            return
+        table = pa.Table.from_pydict(self.columns, schema=self.schema)
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        for values in self.columns.values():
+            values.clear()
+        self.rows = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+class ParquetDatasetWriter:
+    """
+    Writes records into two Parquet tables under ``output_path``:
+    - apps: one row per app
+    - reviews: one row per individual review with appId back-reference
+
+    Rows are buffered per table and written out in row groups of
+    ``row_group_size``, so memory is bounded by one row group per open file.
+    With ``partition_by`` set to "scrape_date" or "genre", each table is
+    split into hive-style ``<column>=<value>`` directories that pyarrow,
+    pandas and most query engines read back as a column.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        partition_by: Optional[str] = None,
+        row_group_size: int = 10000,
+        scrape_date: Optional[date] = None,
+    ) -> None:
+        if pa is None:
+            raise RuntimeError("Parquet output requires pyarrow. Install it with 'pip install pyarrow'.")
+        if partition_by is not None and partition_by not in PARTITION_COLUMNS:
+            raise ValueError(
+                f"Invalid Parquet partitioning '{partition_by}'. "
+                f"Allowed: {', '.join(sorted(PARTITION_COLUMNS))}."
+            )
+        self.output_path = output_path
+        self.partition_by = partition_by
+        self.row_group_size = max(1, row_group_size)
+        self.scrape_date = scrape_date or datetime.now(timezone.utc).date()
+        self.records_written = 0
+        self._apps_schema = _apps_schema()
+        self._reviews_schema = _reviews_schema()
+        self._buffers: Dict[Tuple[str, str], _TableBuffer] = {}
+
+    def open(self) -> "ParquetDatasetWriter":
+        """
+        Create ``output_path``, replacing a dataset an earlier run wrote
+        there (its files would otherwise be mixed into this one). Anything
+        else already at that path is left alone and refused.
+        """
+        path = self.output_path
+        if path.exists() and not path.is_dir():
+            raise FileExistsError(f"Parquet output {path} exists and is not a directory.")
+        if path.exists():
+            entries = {entry.name for entry in path.iterdir()}
+            if (path / _DATASET_MARKER).is_file() or (entries and entries <= _DATASET_ENTRIES):
+                shutil.rmtree(path)
+            elif entries:
+                raise FileExistsError(
+                    f"Parquet output directory {path} is not empty and was not written by "
+                    "this scraper; remove it or choose another output directory."
+                )
+        path.mkdir(parents=True, exist_ok=True)
+        (path / _DATASET_MARKER).touch()
+        return self
+
+    def _partition_value(self, record: Mapping[str, Any]) -> Optional[str]:
+        if self.partition_by == "scrape_date":
+            return self.scrape_date.isoformat()
+        if self.partition_by == "genre":
+            return record.get("genre")
+        return None
+
+    def _buffer(self, table: str, partition: Optional[str]) -> _TableBuffer:
+        key = (table, partition or "")
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            schema = self._apps_schema if table == "apps" else self._reviews_schema
+            if self.partition_by is None:
+                path = self.output_path / f"{table}.parquet"
+            else:
+                column = PARTITION_COLUMNS[self.partition_by]
+                value = quote(partition, safe="") if partition else _NULL_PARTITION
+                path = self.output_path / table / f"{column}={value}" / "part-0.parquet"
+                # The value lives in the directory name, not in the file.
+                if column in schema.names:
+                    schema = schema.remove(schema.get_field_index(column))
+            buffer = _TableBuffer(path, schema, self.row_group_size)
+            self._buffers[key] = buffer
+        return buffer
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        partition = self._partition_value(record)
+        app_id = record.get("appId")
+
+        self._buffer("apps", partition).append(record)
+        reviews = self._buffer("reviews", partition)
+        for review in record.get("reviews") or []:
+            row = dict(review)
+            row["appId"] = app_id
+            row["date"] = _parse_review_date(review.get("date"))
+            reviews.append(row)
+        self.records_written += 1
+
+    def close(self) -> None:
+        for buffer in self._buffers.values():
+            buffer.close()
+        self._buffers.clear()
+
+    def __enter__(self) -> "ParquetDatasetWriter":
+        return self.open()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def write_parquet(
+    records: Sequence[Mapping[str, Any]],
+    output_path: Path,
+    partition_by: Optional[str] = None,
+    row_group_size: int = 10000,
+) -> None:
+    with ParquetDatasetWriter(
+        output_path, partition_by=partition_by, row_group_size=row_group_size
+    ) as writer:
+        for record in records:
+            writer.write(record)
@@ -0,0 +1,278 @@
+import json
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from outputs.writer_csv import APP_COLUMNS, REVIEW_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# App columns stored as JSON text.
+_LIST_COLUMNS = {"screenshots", "categories"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS apps (
+    appId TEXT PRIMARY KEY,
+    title TEXT,
+    description TEXT,
+    score REAL,
+    ratings INTEGER,
+    installs TEXT,
+    screenshots TEXT,
+    video TEXT,
+    developerEmail TEXT,
+    developerWebsite TEXT,
+    developerAddress TEXT,
+    genre TEXT,
+    categories TEXT,
+    reviewsCount INTEGER,
+    previousScore REAL,
+    firstSeen TEXT NOT NULL,
+    scrapedAt TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS apps_genre_score ON apps (genre, score);
+CREATE INDEX IF NOT EXISTS apps_score ON apps (score);
+CREATE INDEX IF NOT EXISTS apps_scraped_at ON apps (scrapedAt);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    appId TEXT NOT NULL REFERENCES apps (appId) ON DELETE CASCADE,
+    userName TEXT,
+    score REAL,
+    text TEXT,
+    date TEXT,
+    version TEXT,
+    thumbsUp INTEGER
+);
+CREATE INDEX IF NOT EXISTS reviews_app ON reviews (appId);
+"""
+
+def _upsert_app_sql(columns: Tuple[str, ...]) -> str:
+    """
+    Upsert of the given app columns (appId first). Columns left out, e.g.
+    by a field projection, keep their stored values.
+    """
+    updates = [f"{column} = excluded.{column}" for column in columns[1:]]
+    if "score" in columns:
+        updates.append("previousScore = apps.score")
+    updates.append("scrapedAt = excluded.scrapedAt")
+    return (
+        "INSERT INTO apps ({columns}, previousScore, firstSeen, scrapedAt)"
+        " VALUES ({placeholders}, NULL, :scrapedAt, :scrapedAt)"
+        " ON CONFLICT (appId) DO UPDATE SET {updates}"
+    ).format(
+        columns=", ".join(columns),
+        placeholders=", ".join(f":{column}" for column in columns),
+        updates=", ".join(updates),
+    )
+
+_INSERT_REVIEW = "INSERT INTO reviews ({columns}) VALUES ({placeholders})".format(
+    columns=", ".join(REVIEW_COLUMNS),
+    placeholders=", ".join("?" for _ in REVIEW_COLUMNS),
+)
+
+# Sort keys accepted by ``query_store``.
+ORDER_COLUMNS = {
+    "appId": "appId",
+    "score": "score",
+    "ratings": "ratings",
+    "scrapedAt": "scrapedAt",
+    "title": "title",
+}
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def connect(path: Path, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=60.0)
+        conn.executescript(_SCHEMA)
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+class SqliteStoreWriter:
+    """
+    Upserts records into a SQLite result store that accumulates across runs:
+    - apps: one row per app, keyed by appId, with ``scrapedAt`` set to the
+      time of the last write, ``firstSeen`` to the first one and
+      ``previousScore`` to the score it replaced
+    - reviews: the app's reviews from its latest record, replaced on every
+      upsert
+
+    Records are buffered and written ``batch_size`` at a time, each batch in
+    one transaction. Lists such as screenshots are stored as JSON. Fields a
+    record does not have (a projected record) are left as stored, and its
+    stored reviews are only replaced when it has reviews.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        batch_size: int = 500,
+        scraped_at: Optional[str] = None,
+    ) -> None:
+        self.output_path = output_path
+        self.batch_size = max(1, batch_size)
+        self.scraped_at = scraped_at
+        self.records_written = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[Mapping[str, Any]] = []
+
+    def open(self) -> "SqliteStoreWriter":
+        self._conn = connect(self.output_path)
+        return self
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        if self._conn is None:
+            self.open()
+        self._pending.append(record)
+        self.records_written += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending or self._conn is None:
+            return
+        scraped_at = self.scraped_at or _utc_now()
+        app_rows: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        reviewed: List[str] = []
+        review_rows: List[Tuple[Any, ...]] = []
+        # A later record for the same app in one batch wins.
+        latest = {record.get("appId"): record for record in self._pending}
+        for app_id, record in latest.items():
+            columns = ("appId", *(column for column in APP_COLUMNS[1:] if column in record))
+            row = {
+                column: json.dumps(record.get(column), ensure_ascii=False)
+                if column in _LIST_COLUMNS and record.get(column) is not None
+                else record.get(column)
+                for column in columns
+            }
+            row["scrapedAt"] = scraped_at
+            app_rows.setdefault(columns, []).append(row)
+            if "reviews" not in record:
+                continue
+            reviewed.append(app_id)
+            for review in record.get("reviews") or []:
+                review_rows.append(
+                    (app_id, *(review.get(column) for column in REVIEW_COLUMNS[1:]))
+                )
+        with self._conn:
+            for columns, rows in app_rows.items():
+                self._conn.executemany(_upsert_app_sql(columns), rows)
+            self._conn.executemany(
+                "DELETE FROM reviews WHERE appId = ?", ((app_id,) for app_id in reviewed)
+            )
+            self._conn.executemany(_INSERT_REVIEW, review_rows)
+        self._pending.clear()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "SqliteStoreWriter":
+        return self.open()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def write_sqlite(
+    records: Sequence[Mapping[str, Any]],
+    output_path: Path,
+    batch_size: int = 500,
+) -> None:
+    with SqliteStoreWriter(output_path, batch_size=batch_size) as writer:
+        for record in records:
+            writer.write(record)
+
+def query_store(
+    path: Path,
+    app_ids: Optional[List[str]] = None,
+    genre: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    dropped_below: Optional[float] = None,
+    scraped_since: Optional[str] = None,
+    scraped_until: Optional[str] = None,
+    title_contains: Optional[str] = None,
+    order_by: str = "appId",
+    descending: bool = False,
+    limit: Optional[int] = None,
+    with_reviews: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the stored apps matching every given filter, shaped like the
+    records that were written (plus ``scrapedAt``, ``firstSeen`` and
+    ``previousScore``).
+
+    ``dropped_below`` matches apps whose score fell under that value at
+    their latest scrape. ``scraped_since`` and ``scraped_until`` compare
+    against ISO timestamps, so a plain date such as "2024-05-01" works.
+    Reviews are only loaded with ``with_reviews``; ``reviews`` is an empty
+    list otherwise.
+    """
+    if order_by not in ORDER_COLUMNS:
+        raise ValueError(f"Invalid sort column '{order_by}'. Allowed: {', '.join(sorted(ORDER_COLUMNS))}.")
+    if not path.exists():
+        raise FileNotFoundError(f"Result store not found: {path}")
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    if app_ids:
+        clauses.append(f"appId IN ({', '.join('?' for _ in app_ids)})")
+        params.extend(app_ids)
+    if genre is not None:
+        clauses.append("genre = ?")
+        params.append(genre)
+    if min_score is not None:
+        clauses.append("score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        clauses.append("score <= ?")
+        params.append(max_score)
+    if dropped_below is not None:
+        clauses.append("score < ? AND previousScore >= ?")
+        params.extend([dropped_below, dropped_below])
+    if scraped_since is not None:
+        clauses.append("scrapedAt >= ?")
+        params.append(scraped_since)
+    if scraped_until is not None:
+        clauses.append("scrapedAt < ?")
+        params.append(scraped_until)
+    if title_contains is not None:
+        clauses.append("title LIKE ?")
+        params.append(f"%{title_contains}%")
+
+    sql = "SELECT * FROM apps"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {ORDER_COLUMNS[order_by]} {'DESC' if descending else 'ASC'}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    conn = connect(path, readonly=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        for row in conn.execute(sql, params):
+            record = dict(row)
+            for column in _LIST_COLUMNS:
+                if record.get(column) is not None:
+                    record[column] = json.loads(record[column])
+            reviews: List[Dict[str, Any]] = []
+            if with_reviews:
+                reviews = [
+                    {column: review[column] for column in REVIEW_COLUMNS[1:]}
+                    for review in conn.execute(
+                        "SELECT * FROM reviews WHERE appId = ? ORDER BY rowid", (record["appId"],)
+                    )
+                ]
+            record["reviews"] = reviews
+            yield record
+    finally:
+        conn.close()
@@ -0,0 +1,228 @@
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from extractors.app_details import extract_app_details
+from extractors.reviews_parser import extract_app_reviews
+from scraper import UNCHANGED, _fetch_paginated_reviews, iter_scraped_apps
+from utils.fingerprints import FingerprintStore
+from utils.formatters import merge_app_and_reviews
+from utils.html_parser import parse_html
+from utils.records import AppRecord, Review, wants_reviews
+from utils.request_client import RequestClient
+
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker passed between stages.
+_DONE = object()
+
+# How often blocked stages check whether the consumer went away.
+_STOP_CHECK_INTERVAL = 0.1
+
+AppIterator = Callable[..., Iterator[Tuple[str, Optional[AppRecord]]]]
+
+def parse_app_page(
+    app_id: str,
+    details_html: str,
+    reviews_html: Optional[str],
+    reviews: Optional[List[Review]],
+    max_reviews: int,
+    parser: Optional[str],
+    fields: Optional[Tuple[str, ...]] = None,
+    review_cursor: Optional[Dict[str, Any]] = None,
+) -> AppRecord:
+    """
+    Build the record for one app from its raw pages. Runs in a worker
+    process, so it only takes and returns picklable values.
+
+    ``reviews_html`` is None when reviews come from the details page, and
+    ``reviews`` is set when they were already fetched from the review feed
+    (or are not wanted). ``fields`` limits the record to those fields, and
+    ``review_cursor`` is the feed position to save once it is written.
+    """
+    soup = parse_html(details_html, parser=parser)
+    details = extract_app_details(soup, app_id, fields=fields)
+    if reviews is None:
+        review_soup = soup if reviews_html is None else parse_html(reviews_html, parser=parser)
+        reviews = extract_app_reviews(review_soup, app_id, max_reviews=max_reviews)
+    record = merge_app_and_reviews(details, reviews)
+    record.review_cursor = review_cursor
+    return record
+
+def _put(target: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_STOP_CHECK_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _completed(result: Optional[AppRecord]) -> "Future[Optional[AppRecord]]":
+    future: "Future[Optional[AppRecord]]" = Future()
+    future.set_result(result)
+    return future
+
+def iter_pipelined_apps(
+    client: RequestClient,
+    app_ids: List[str],
+    cfg: Dict[str, Any],
+    fingerprints: Optional[FingerprintStore] = None,
+) -> Iterator[Tuple[str, Optional[AppRecord]]]:
+    """
+    Drop-in replacement for ``iter_scraped_apps`` that moves parsing off the
+    GIL. Three stages run side by side:
+
+    1. ``cfg["concurrency"]`` fetch threads download the raw pages (and the
+       paginated review feed, which is JSON and cheap to decode);
+    2. a dispatcher hands every page to a pool of ``cfg["parse_workers"]``
+       processes that parse it and extract the record;
+    3. the caller consumes ``(app_id, record)`` pairs, typically writing
+       them out.
+
+    The stages are joined by queues of ``cfg["pipeline_queue_size"]``
+    pages and twice the number of parse workers in results, so a slow
+    stage blocks the ones before it instead of letting pages pile up in
+    memory. Records arrive in the order their pages were fetched, not in
+    input order. Worker processes are spawned rather than forked because
+    the fetch threads are already running.
+    """
+    fetch_workers = max(1, int(cfg.get("concurrency", 1)))
+    parse_workers = max(1, int(cfg.get("parse_workers", 1)))
+    language = cfg.get("language", "en_US")
+    base_url = cfg.get("base_url")
+    reviews_url = cfg.get("reviews_url", base_url)
+    paginated = cfg.get("review_source", "page") == "paginated"
+    max_reviews = cfg.get("max_reviews_per_app", 50)
+    parser = cfg.get("html_parser")
+    fields = cfg.get("fields")
+    fetch_reviews = wants_reviews(fields)
+
+    queue_size = max(1, int(cfg.get("pipeline_queue_size", 64)))
+    pages: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    results: "queue.Queue[Any]" = queue.Queue(maxsize=parse_workers * 2)
+    stop = threading.Event()
+    source = iter(app_ids)
+    source_lock = threading.Lock()
+
+    def fetch_stage() -> None:
+        while not stop.is_set():
+            with source_lock:
+                app_id = next(source, None)
+            if app_id is None:
+                break
+            params = {"id": app_id, "hl": language}
+            try:
+                details_html = client.get(base_url, params=params).text
+                reviews_html = None
+                if fetch_reviews and not paginated and reviews_url != base_url:
+                    reviews_html = client.get(reviews_url, params=params).text
+                digest = None
+                if fingerprints is not None:
+                    digest = fingerprints.page_digest(details_html)
+                    if not paginated and fingerprints.page_unchanged(app_id, digest):
+                        _put(pages, (app_id, UNCHANGED), stop)
+                        continue
+                reviews = None
+                review_cursor = None
+                if not fetch_reviews:
+                    reviews = []
+                elif paginated:
+                    reviews, review_cursor = _fetch_paginated_reviews(client, app_id, cfg)
+            except Exception as e:  # noqa: BLE001
+                logger.exception("Failed to fetch data for app %s: %s", app_id, e)
+                _put(pages, (app_id, None), stop)
+                continue
+            _put(pages, (app_id, (details_html, reviews_html, reviews, review_cursor, digest)), stop)
+        _put(pages, _DONE, stop)
+
+    def dispatch_stage(pool: ProcessPoolExecutor) -> None:
+        finished = 0
+        while finished < fetch_workers:
+            try:
+                item = pages.get(timeout=_STOP_CHECK_INTERVAL)
+            except queue.Empty:
+                if stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                finished += 1
+                continue
+            app_id, page = item
+            if page is None or page is UNCHANGED:
+                future = _completed(page)
+                digest = None
+            else:
+                details_html, reviews_html, reviews, review_cursor, digest = page
+                try:
+                    future = pool.submit(
+                        parse_app_page,
+                        app_id,
+                        details_html,
+                        reviews_html,
+                        reviews,
+                        max_reviews,
+                        parser,
+                        fields,
+                        review_cursor,
+                    )
+                except Exception as e:  # noqa: BLE001
+                    # e.g. a broken pool; reported by the consumer like a parse error.
+                    future = Future()
+                    future.set_exception(e)
+            if not _put(results, (app_id, digest, future), stop):
+                return
+        _put(results, _DONE, stop)
+
+    pool = ProcessPoolExecutor(
+        max_workers=parse_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    threads = [
+        threading.Thread(target=fetch_stage, name=f"pipeline-fetch-{idx}", daemon=True)
+        for idx in range(fetch_workers)
+    ]
+    threads.append(
+        threading.Thread(target=dispatch_stage, args=(pool,), name="pipeline-dispatch", daemon=True)
+    )
+    for thread in threads:
+        thread.start()
+
+    total = len(app_ids)
+    position = 0
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            app_id, digest, future = item
+            position += 1
+            try:
+                record = future.result()
+            except Exception as e:  # noqa: BLE001
+                logger.exception("Failed to parse data for app %s: %s", app_id, e)
+                record = None
+            if (
+                record is not None
+                and record is not UNCHANGED
+                and fingerprints is not None
+                and fingerprints.classify(app_id, digest, record) is None
+            ):
+                record = UNCHANGED
+            logger.info("Processed app %d/%d: %s", position, total, app_id)
+            yield app_id, record
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        pool.shutdown(cancel_futures=True)
+
+def app_iterator(cfg: Dict[str, Any]) -> AppIterator:
+    """
+    ``iter_pipelined_apps`` when parse workers are configured, otherwise the
+    thread-pool ``iter_scraped_apps``.
+    """
+    return iter_pipelined_apps if cfg.get("parse_workers") else iter_scraped_apps
@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from extractors.review_pages import ReviewCursors
+from outputs.writer_jsonl import JsonlWriter
+from pipeline import app_iterator
+from utils.request_client import RequestClient
+from utils.work_queue import WorkQueue
+
+logger = logging.getLogger(__name__)
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def shard_path(shard_dir: Path, worker_id: str) -> Path:
+    safe_id = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in worker_id)
+    return shard_dir / f"{safe_id}.jsonl"
+
+def _complete_size(path: Path) -> int:
+    """
+    Size of ``path`` up to and including its last newline, so a record torn
+    by a crash is cut off before the shard is appended to again.
+    """
+    if not path.exists():
+        return 0
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        block = 1 << 16
+        end = size
+        while end > 0:
+            start = max(0, end - block)
+            f.seek(start)
+            chunk = f.read(end - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            end = start
+    return 0
+
+def open_shard_writer(shard_dir: Path, worker_id: str) -> JsonlWriter:
+    path = shard_path(shard_dir, worker_id)
+    return JsonlWriter(path, resume_offset=_complete_size(path)).open()
+
+def run_worker(
+    client: RequestClient,
+    queue: WorkQueue,
+    cfg: Dict[str, Any],
+    worker_id: str,
+    writer: JsonlWriter,
+    wait: bool = True,
+) -> Dict[str, int]:
+    """
+    Lease batches of apps from ``queue``, scrape them and append the records
+    to this worker's shard until the queue is drained.
+
+    Records are synced to disk before their apps are marked done, so a
+    crash can get an app scraped twice but never lost; ``iter_shard_records``
+    drops the duplicates. Review cursors are saved once their records are
+    synced, too. With ``wait``, the worker keeps polling while other
+    workers still hold leases, so it takes over their apps if they die.
+    """
+    batch_size = max(1, int(cfg.get("concurrency", 1))) * 2
+    poll_interval = min(5.0, queue.visibility_timeout / 10)
+    heartbeat_every = queue.visibility_timeout / 3
+    scraped = failed = lost = 0
+    cursor_dir = cfg.get("review_cursor_dir")
+    review_cursors = ReviewCursors(Path(cursor_dir)) if cursor_dir else None
+
+    while True:
+        app_ids = queue.lease(worker_id, batch_size)
+        if not app_ids:
+            if not wait or queue.outstanding() == 0:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info("Worker %s leased %d apps.", worker_id, len(app_ids))
+        done: List[str] = []
+        errors: List[str] = []
+        last_heartbeat = time.monotonic()
+        for app_id, record in app_iterator(cfg)(client, app_ids, cfg):
+            if record is None:
+                errors.append(app_id)
+            else:
+                writer.write(record)
+                done.append(app_id)
+                if review_cursors is not None:
+                    review_cursors.stage(record)
+            if time.monotonic() - last_heartbeat >= heartbeat_every:
+                queue.heartbeat(worker_id)
+                last_heartbeat = time.monotonic()
+
+        writer.sync()
+        if review_cursors is not None:
+            review_cursors.commit()
+        completed = queue.complete(worker_id, done)
+        if errors:
+            queue.fail(worker_id, errors, "scrape failed")
+        scraped += completed
+        lost += len(done) - completed
+        failed += len(errors)
+        if len(done) > completed:
+            logger.warning(
+                "Worker %s lost the lease on %d apps; they may be scraped again.",
+                worker_id,
+                len(done) - completed,
+            )
+
+    return {"scraped": scraped, "failed": failed, "leaseLost": lost}
+
+def iter_shard_records(shard_dir: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records of every shard in ``shard_dir``, keeping only the
+    first record per app ID. Unreadable lines are skipped.
+    """
+    seen = set()
+    for path in sorted(shard_dir.glob("*.jsonl")):
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping unreadable line in shard %s", path)
+                    continue
+                app_id = record.get("appId")
+                if app_id in seen:
+                    continue
+                seen.add(app_id)
+                yield record
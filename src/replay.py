@@ -0,0 +1,142 @@
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from scraper import scrape_app
+from utils.html_parser import set_default_parser
+from utils.page_archive import ArchiveReader
+from utils.page_fetcher import PageFetcher
+from utils.records import AppRecord
+from utils.request_client import RequestClient
+
+logger = logging.getLogger(__name__)
+
+class ArchiveClient:
+    """
+    Stands in for ``RequestClient`` during a replay: every request is
+    answered from the archive, and a request that was never captured fails
+    like a request that ran out of retries.
+    """
+
+    def __init__(self, reader: ArchiveReader) -> None:
+        self.reader = reader
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+    ) -> requests.Response:
+        entry = self.reader.get(method, url, params, data)
+        if entry is None:
+            raise RuntimeError(f"{method} {url} (params={params}) is not in the archive")
+        return RequestClient._response_from_cache(entry)
+
+    def get(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response:
+        return self._request("GET", url, params, None)
+
+    def post(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response:
+        return self._request("POST", url, params, data)
+
+# Per-process replay state, set up by ``_init_worker``.
+_worker: Optional[Tuple[ArchiveClient, PageFetcher, Dict[str, Any]]] = None
+
+def _init_worker(archive_dir: str, cfg: Dict[str, Any]) -> None:
+    global _worker
+    set_default_parser(cfg.get("html_parser", "html.parser"))
+    client = ArchiveClient(ArchiveReader(Path(archive_dir)).open())
+    _worker = (client, PageFetcher(client, parser=cfg.get("html_parser")), cfg)
+
+def replay_chunk(app_ids: List[str]) -> List[Tuple[str, Optional[AppRecord]]]:
+    """
+    Re-extract a batch of apps from the archive opened by ``_init_worker``.
+    Apps that fail are logged and returned with a None record.
+    """
+    assert _worker is not None, "replay worker not initialised"
+    client, fetcher, cfg = _worker
+    results: List[Tuple[str, Optional[AppRecord]]] = []
+    for app_id in app_ids:
+        try:
+            record: Optional[AppRecord] = scrape_app(client, fetcher, app_id, cfg)
+        except Exception as e:  # noqa: BLE001
+            logger.exception("Failed to replay app %s: %s", app_id, e)
+            record = None
+        results.append((app_id, record))
+    return results
+
+def iter_replayed_apps(
+    archive_dir: Path,
+    app_ids: List[str],
+    cfg: Dict[str, Any],
+) -> Iterator[Tuple[str, Optional[AppRecord]]]:
+    """
+    Run the extractors over pages captured in ``archive_dir`` instead of
+    fetching them, yielding ``(app_id, record)`` pairs in input order like
+    ``iter_scraped_apps``.
+
+    Apps are replayed in batches of ``cfg["replay_chunk_size"]`` by
+    ``cfg["replay_workers"]`` processes (0 = one per CPU). Every worker maps
+    the archive segments itself, so only app IDs and finished records cross
+    process boundaries. With a single worker, apps are replayed in-process.
+    Saved review cursors are ignored so the captured review feed is read
+    from its first page again.
+    """
+    cfg = {**cfg, "review_cursor_dir": None}
+    workers = int(cfg.get("replay_workers") or 0) or os.cpu_count() or 1
+    chunk_size = max(1, int(cfg.get("replay_chunk_size", 64)))
+    chunks = [app_ids[idx:idx + chunk_size] for idx in range(0, len(app_ids), chunk_size)]
+    total = len(app_ids)
+    position = 0
+
+    if workers == 1:
+        _init_worker(str(archive_dir), cfg)
+        for chunk in chunks:
+            for app_id, record in replay_chunk(chunk):
+                position += 1
+                logger.info("Replayed app %d/%d: %s", position, total, app_id)
+                yield app_id, record
+        return
+
+    window = workers * 2
+    pending: Deque["Future[List[Tuple[str, Optional[AppRecord]]]]"] = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(str(archive_dir), cfg),
+    ) as pool:
+        try:
+            remaining = iter(chunks)
+            while True:
+                while len(pending) < window:
+                    chunk = next(remaining, None)
+                    if chunk is None:
+                        break
+                    pending.append(pool.submit(replay_chunk, chunk))
+                if not pending:
+                    break
+                for app_id, record in pending.popleft().result():
+                    position += 1
+                    logger.info("Replayed app %d/%d: %s", position, total, app_id)
+                    yield app_id, record
+        finally:
+            for future in pending:
+                future.cancel()
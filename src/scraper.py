@@ -0,0 +1,180 @@
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from extractors.app_details import extract_app_details
+from extractors.review_pages import (
+    REVIEWS_RPC_URL,
+    fetch_app_reviews_paginated,
+    load_review_cursor,
+)
+from extractors.reviews_parser import extract_app_reviews
+from utils.fingerprints import FingerprintStore
+from utils.formatters import merge_app_and_reviews
+from utils.metrics import metrics
+from utils.page_fetcher import PageFetcher
+from utils.records import AppRecord, Review, wants_reviews
+from utils.request_client import PageClient, RequestClient
+
+logger = logging.getLogger(__name__)
+
+# Receives each scraped record as soon as it is ready (e.g. a streaming writer).
+RecordSink = Callable[[Mapping[str, Any]], None]
+
+# Returned in place of a record, compared by identity, when an incremental
+# run finds an app unchanged since the previous run.
+UNCHANGED: Any = object()
+
+def _fetch_paginated_reviews(
+    client: PageClient,
+    app_id: str,
+    cfg: Dict[str, Any],
+) -> Tuple[List[Review], Optional[Dict[str, Any]]]:
+    """
+    Reviews from the paginated feed, resumed from the app's saved cursor,
+    and the cursor to save once they are written (None without a cursor
+    directory).
+    """
+    cursor_dir = cfg.get("review_cursor_dir")
+    cursor = load_review_cursor(Path(cursor_dir), app_id) if cursor_dir else None
+    reviews, cursor = fetch_app_reviews_paginated(
+        client=client,
+        app_id=app_id,
+        language=cfg.get("language", "en_US"),
+        max_reviews=cfg.get("max_reviews_per_app", 50),
+        sort=cfg.get("review_sort", "newest"),
+        filter_score=cfg.get("review_filter_score"),
+        cursor=cursor,
+        rpc_url=cfg.get("reviews_rpc_url", REVIEWS_RPC_URL),
+    )
+    return reviews, cursor if cursor_dir else None
+
+def scrape_app(
+    client: PageClient,
+    fetcher: PageFetcher,
+    app_id: str,
+    cfg: Dict[str, Any],
+    fingerprints: Optional[FingerprintStore] = None,
+) -> AppRecord:
+    """
+    Fetch details and reviews for one app and merge them into a record.
+
+    Reviews come from the details page by default, or from the paginated
+    review feed when ``cfg["review_source"]`` is "paginated". With
+    ``cfg["fields"]``, only those fields are extracted, and reviews are not
+    fetched at all unless they are among them.
+
+    With ``fingerprints``, ``UNCHANGED`` is returned for apps whose details
+    page or record matches the previous run. When reviews come from the same
+    page, an identical page is detected before anything is parsed.
+    """
+    language = cfg.get("language", "en_US")
+    base_url = cfg.get("base_url")
+    reviews_url = cfg.get("reviews_url", base_url)
+    params = {"id": app_id, "hl": language}
+    paginated = cfg.get("review_source", "page") == "paginated"
+    fields = cfg.get("fields")
+
+    page_digest = None
+    review_cursor = None
+    # Pages this call holds in the fetcher, each released exactly once.
+    held: List[str] = []
+    try:
+        if fingerprints is not None:
+            page_digest = fingerprints.page_digest(fetcher.get_text(base_url, params=params))
+            held.append(base_url)
+            if not paginated and fingerprints.page_unchanged(app_id, page_digest):
+                return UNCHANGED
+
+        logger.debug("Requesting app details for %s with params %s", app_id, params)
+        details_soup = fetcher.get_soup(base_url, params=params)
+        held.append(base_url)
+        details = extract_app_details(details_soup, app_id, fields=fields)
+        if not wants_reviews(fields):
+            reviews = []
+        elif paginated:
+            reviews, review_cursor = _fetch_paginated_reviews(client, app_id, cfg)
+        else:
+            logger.debug("Requesting reviews for %s from %s", app_id, reviews_url)
+            reviews_soup = fetcher.get_soup(reviews_url, params=params)
+            held.append(reviews_url)
+            reviews = extract_app_reviews(
+                reviews_soup, app_id, max_reviews=cfg.get("max_reviews_per_app", 50)
+            )
+    finally:
+        for url in held:
+            fetcher.release(url, params=params)
+
+    record = merge_app_and_reviews(details, reviews)
+    record.review_cursor = review_cursor
+    if fingerprints is not None and fingerprints.classify(app_id, page_digest, record) is None:
+        return UNCHANGED
+    return record
+
+def _scrape_app_safe(
+    client: RequestClient,
+    fetcher: PageFetcher,
+    app_id: str,
+    cfg: Dict[str, Any],
+    position: Tuple[int, int],
+    fingerprints: Optional[FingerprintStore] = None,
+) -> Optional[AppRecord]:
+    logger.info("Processing app %d/%d: %s", position[0], position[1], app_id)
+    try:
+        with metrics.time("app_seconds", engine="threads"):
+            return scrape_app(client, fetcher, app_id, cfg, fingerprints)
+    except Exception as e:  # noqa: BLE001
+        logger.exception("Failed to fetch data for app %s: %s", app_id, e)
+        metrics.inc("apps_failed_total")
+        return None
+
+def iter_scraped_apps(
+    client: RequestClient,
+    app_ids: List[str],
+    cfg: Dict[str, Any],
+    fingerprints: Optional[FingerprintStore] = None,
+) -> Iterator[Tuple[str, Optional[AppRecord]]]:
+    """
+    Scrape ``app_ids`` and yield ``(app_id, record)`` pairs in input order.
+
+    ``record`` is None when the app failed; the failure is logged and the
+    remaining apps are still processed. It is ``UNCHANGED`` for apps that an
+    incremental run (``fingerprints``) found unchanged. With ``cfg["concurrency"] > 1`` apps
+    are scraped on a thread pool. Only a bounded window of apps is in flight
+    at once, so memory does not grow with the size of the input list.
+    """
+    concurrency = max(1, int(cfg.get("concurrency", 1)))
+    fetcher = PageFetcher(client)
+    total = len(app_ids)
+
+    if concurrency == 1:
+        for idx, app_id in enumerate(app_ids, start=1):
+            yield app_id, _scrape_app_safe(
+                client, fetcher, app_id, cfg, (idx, total), fingerprints
+            )
+    else:
+        window = concurrency * 2
+        pending: Deque[Tuple[str, Future]] = deque()
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="scraper"
+        ) as executor:
+            for idx, app_id in enumerate(app_ids, start=1):
+                future = executor.submit(
+                    _scrape_app_safe, client, fetcher, app_id, cfg, (idx, total), fingerprints
+                )
+                pending.append((app_id, future))
+                if len(pending) >= window:
+                    done_id, done_future = pending.popleft()
+                    yield done_id, done_future.result()
+            while pending:
+                done_id, done_future = pending.popleft()
+                yield done_id, done_future.result()
+
+    stats = fetcher.stats()
+    logger.info(
+        "Page requests: %d sent, %d saved by sharing pages between extractors.",
+        stats["requestsMade"],
+        stats["requestsSaved"],
+    )
@@ -0,0 +1,129 @@
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from outputs.writer_csv import CsvTablesWriter, write_csv
+from outputs.writer_excel import ExcelStreamWriter
+from outputs.writer_json import write_json
+from outputs.writer_jsonl import JsonlWriter
+from outputs.writer_parquet import ParquetDatasetWriter
+from outputs.writer_sqlite import ORDER_COLUMNS, query_store
+
+EXPORT_FORMATS = ["jsonl", "json", "csv", "csv_normalized", "excel", "parquet"]
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main.py query",
+        description="Export apps from the SQLite result store, filtered through its indexes.",
+    )
+    parser.add_argument(
+        "--store",
+        type=str,
+        help="Result store written with --output-format sqlite (default: the configured output).",
+    )
+    parser.add_argument("--app-id", action="append", help="Only this app; repeat for several.")
+    parser.add_argument("--genre", type=str, help="Only apps of this genre.")
+    parser.add_argument("--min-score", type=float, help="Only apps scoring at least this.")
+    parser.add_argument("--max-score", type=float, help="Only apps scoring at most this.")
+    parser.add_argument(
+        "--dropped-below",
+        type=float,
+        help="Only apps whose score fell below this value at their latest scrape.",
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        help="Only apps last scraped at or after this ISO date/time (UTC).",
+    )
+    parser.add_argument(
+        "--until",
+        type=str,
+        help="Only apps last scraped before this ISO date/time (UTC).",
+    )
+    parser.add_argument("--title", type=str, help="Only apps whose title contains this text.")
+    parser.add_argument(
+        "--order-by",
+        choices=sorted(ORDER_COLUMNS),
+        default="appId",
+        help="Sort column.",
+    )
+    parser.add_argument("--desc", action="store_true", help="Sort in descending order.")
+    parser.add_argument("--limit", type=int, help="Maximum number of apps to export.")
+    parser.add_argument("--with-reviews", action="store_true", help="Include the stored reviews.")
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="jsonl",
+        help="Export format.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Export file or directory; jsonl and json are printed to stdout without it.",
+    )
+    return parser.parse_args(argv)
+
+def export(records: Iterator[Dict[str, Any]], output_format: str, output: Optional[Path]) -> int:
+    """
+    Write ``records`` in ``output_format`` and return how many were written.
+    """
+    if output is None:
+        if output_format == "jsonl":
+            count = 0
+            for record in records:
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+            return count
+        if output_format == "json":
+            rows = list(records)
+            json.dump(rows, sys.stdout, ensure_ascii=False, indent=2)
+            sys.stdout.write("\n")
+            return len(rows)
+        raise ValueError(f"--output is required for the {output_format} format.")
+
+    if output_format in ("json", "csv"):
+        rows = list(records)
+        (write_json if output_format == "json" else write_csv)(rows, output)
+        return len(rows)
+
+    if output_format == "jsonl":
+        writer: Any = JsonlWriter(output)
+    elif output_format == "csv_normalized":
+        writer = CsvTablesWriter(output)
+    elif output_format == "excel":
+        writer = ExcelStreamWriter(output)
+    else:
+        writer = ParquetDatasetWriter(output)
+    with writer:
+        for record in records:
+            writer.write(record)
+    return writer.records_written
+
+def main(argv: List[str], default_store: Optional[Path] = None) -> int:
+    args = parse_args(argv)
+    store = Path(args.store).resolve() if args.store else default_store
+    if store is None:
+        raise ValueError("No result store given; pass --store.")
+
+    records = query_store(
+        store,
+        app_ids=args.app_id,
+        genre=args.genre,
+        min_score=args.min_score,
+        max_score=args.max_score,
+        dropped_below=args.dropped_below,
+        scraped_since=args.since,
+        scraped_until=args.until,
+        title_contains=args.title,
+        order_by=args.order_by,
+        descending=args.desc,
+        limit=args.limit,
+        with_reviews=args.with_reviews,
+    )
+    output = Path(args.output).resolve() if args.output else None
+    count = export(records, args.format, output)
+    logging.info("Exported %d apps from %s", count, store)
+    return 0
@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Mapping, Optional
+
+import aiohttp
+
+from utils.http_cache import CacheEntry, HttpCache
+from utils.metrics import metrics
+from utils.page_archive import ArchiveWriter
+from utils.rate_control import (
+    THROTTLE_STATUSES,
+    HostRateController,
+    RateController,
+    decorrelated_jitter,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+class AsyncResponse:
+    """
+    Fully read HTTP response returned by ``AsyncRequestClient``.
+
+    Exposes the subset of the ``requests.Response`` interface the extractors
+    rely on, so parsing code is shared between the sync and async paths.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        url: str,
+        headers: Mapping[str, str],
+        text: str,
+    ) -> None:
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers
+        self.text = text
+
+class AsyncRequestClient:
+    """
+    asyncio HTTP client with the same timeout and retry semantics as
+    ``RequestClient``, built on aiohttp.
+
+    Use it as an async context manager, or call ``close()`` when done. The
+    underlying session is created lazily on the running event loop. An
+    ``HttpCache`` and a ``RateController`` can be shared with the sync
+    client, and successful responses are captured to an ``ArchiveWriter``
+    when one is given. Cache and archive files are read and written on a
+    worker thread, so the event loop keeps running meanwhile.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        timeout: int = 15,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        limit_per_host: int = 0,
+        cache: Optional[HttpCache] = None,
+        max_backoff: float = 30.0,
+        rate_controller: Optional[RateController] = None,
+        archive: Optional[ArchiveWriter] = None,
+    ) -> None:
+        self.headers = {
+            "User-Agent": user_agent,
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.limit_per_host = limit_per_host
+        self.cache = cache
+        self.rate_controller = rate_controller
+        self.archive = archive
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=0,
+                    limit_per_host=self.limit_per_host,
+                ),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncRequestClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @staticmethod
+    def _response_from_cache(entry: CacheEntry) -> AsyncResponse:
+        return AsyncResponse(
+            status_code=entry.status_code,
+            url=entry.url,
+            headers=entry.headers,
+            text=entry.text,
+        )
+
+    async def _acquire(self, url: str) -> Optional[HostRateController]:
+        if self.rate_controller is None:
+            return None
+        host = self.rate_controller.for_url(url)
+        while True:
+            wait = host.try_acquire()
+            if wait <= 0:
+                return host
+            await asyncio.sleep(wait)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> AsyncResponse:
+        cache_key: Optional[str] = None
+        cached: Optional[CacheEntry] = None
+        headers: Optional[Dict[str, str]] = None
+        if self.cache is not None and method == "GET":
+            cache_key = self.cache.make_key(method, url, params)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None and self.cache.is_fresh(cached):
+                self.cache.record_hit()
+                metrics.inc("http_cache_hits_total", method=method)
+                logger.debug("Cache hit for %s %s (params=%s)", method, url, params)
+                return self._response_from_cache(cached)
+            self.cache.record_miss()
+            if cached is not None and self.cache.can_revalidate(cached):
+                headers = self.cache.conditional_headers(cached)
+
+        last_exc: Optional[Exception] = None
+        delay = self.backoff_factor
+        for attempt in range(1, self.max_retries + 1):
+            host = await self._acquire(url)
+            status: Optional[int] = None
+            retry_after: Optional[float] = None
+            started = time.perf_counter()
+            try:
+                logger.debug(
+                    "HTTP %s %s (attempt %d/%d, params=%s)",
+                    method,
+                    url,
+                    attempt,
+                    self.max_retries,
+                    params,
+                )
+                async with self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    data=data,
+                    headers=headers,
+                ) as resp:
+                    status = resp.status
+                    if status in THROTTLE_STATUSES:
+                        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    if resp.status == 304 and cached is not None:
+                        logger.debug("Revalidated cached %s %s", method, url)
+                        await asyncio.to_thread(self.cache.touch, cache_key, cached, resp.headers)
+                        return self._response_from_cache(cached)
+                    body = await resp.read()
+                    encoding = resp.get_encoding()
+                    text = body.decode(encoding)
+                    if metrics.enabled:
+                        metrics.inc("http_response_bytes_total", len(body), method=method)
+                    if 200 <= resp.status < 300:
+                        if cache_key is not None:
+                            await asyncio.to_thread(
+                                self.cache.put,
+                                cache_key,
+                                status_code=resp.status,
+                                url=str(resp.url),
+                                headers=resp.headers,
+                                body=body,
+                                encoding=encoding,
+                            )
+                        return AsyncResponse(
+                            status_code=resp.status,
+                            url=str(resp.url),
+                            headers=resp.headers,
+                            text=text,
+                        )
+
+                logger.warning(
+                    "Received non-2xx status %s for %s %s: %s",
+                    resp.status,
+                    method,
+                    url,
+                    text[:200],
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:  # noqa: PERF203
+                last_exc = exc
+                logger.warning(
+                    "Request error on %s %s (attempt %d/%d): %s",
+                    method,
+                    url,
+                    attempt,
+                    self.max_retries,
+                    exc,
+                )
+            finally:
+                if host is not None:
+                    host.release(status, retry_after)
+                if metrics.enabled:
+                    metrics.observe(
+                        "http_request_seconds",
+                        time.perf_counter() - started,
+                        method=method,
+                        status=status or "error",
+                        attempt=attempt,
+                    )
+
+            if attempt == self.max_retries:
+                break
+            metrics.inc("http_retries_total", method=method, status=status or "error")
+            delay = decorrelated_jitter(delay, self.backoff_factor, self.max_backoff)
+            sleep_for = max(delay, retry_after or 0.0)
+            logger.debug("Sleeping for %.2fs before retry.", sleep_for)
+            await asyncio.sleep(sleep_for)
+
+        metrics.inc("http_failures_total", method=method)
+        if last_exc is not None:
+            raise RuntimeError(f"Failed to {method} {url}") from last_exc
+
+        raise RuntimeError(f"Failed to {method} {url} with status != 2xx")
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> AsyncResponse:
+        return await self._capture(
+            "GET", url, params, None, await self._request("GET", url, params=params)
+        )
+
+    async def post(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> AsyncResponse:
+        return await self._capture(
+            "POST", url, params, data, await self._request("POST", url, params=params, data=data)
+        )
+
+    async def _capture(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        resp: AsyncResponse,
+    ) -> AsyncResponse:
+        if self.archive is not None:
+            await asyncio.to_thread(
+                self.archive.record,
+                method, url, params, data, resp.status_code, resp.text.encode("utf-8"), "utf-8",
+            )
+        return resp
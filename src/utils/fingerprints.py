@@ -0,0 +1,116 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.records import to_builtin
+
+logger = logging.getLogger(__name__)
+
+def _digest_default(value: Any) -> Any:
+    try:
+        return to_builtin(value)
+    except TypeError:
+        return str(value)
+
+class FingerprintStore:
+    """
+    Content fingerprints per app from the previous run, for incremental
+    refreshes.
+
+    Two digests are kept per app: ``page``, the SHA-256 of the raw details
+    page, and ``record``, the SHA-256 of the extracted record. An identical
+    page means the app can be skipped without parsing; otherwise the record
+    digest decides whether the app changed. Thread-safe, so scraper workers
+    can classify apps directly.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.previous: Dict[str, Dict[str, str]] = {}
+        self.current: Dict[str, Dict[str, str]] = {}
+        self.new: List[str] = []
+        self.changed: List[str] = []
+        self.unchanged = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> "FingerprintStore":
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as f:
+                self.previous = json.load(f)
+            logger.info("Loaded fingerprints for %d apps from %s", len(self.previous), self.path)
+        return self
+
+    @staticmethod
+    def page_digest(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def record_digest(record: Dict[str, Any]) -> str:
+        payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=_digest_default)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def expect(self, app_ids: Iterable[str]) -> None:
+        """
+        Register the apps of this run. Their previous fingerprints are kept
+        unless the app is classified again, so apps that fail or are skipped
+        are neither lost nor reported as removed.
+        """
+        with self._lock:
+            for app_id in app_ids:
+                previous = self.previous.get(app_id)
+                if previous is not None:
+                    self.current.setdefault(app_id, previous)
+
+    def page_unchanged(self, app_id: str, page_digest: str) -> bool:
+        previous = self.previous.get(app_id)
+        if previous is None or previous.get("page") != page_digest:
+            return False
+        with self._lock:
+            self.current[app_id] = previous
+            self.unchanged += 1
+        return True
+
+    def classify(self, app_id: str, page_digest: str, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Store the new fingerprints and return "new", "changed", or None when
+        the record is identical to the previous run's.
+        """
+        record_digest = self.record_digest(record)
+        previous = self.previous.get(app_id)
+        with self._lock:
+            self.current[app_id] = {"page": page_digest, "record": record_digest}
+            if previous is None:
+                self.new.append(app_id)
+                return "new"
+            if previous.get("record") != record_digest:
+                self.changed.append(app_id)
+                return "changed"
+            self.unchanged += 1
+            return None
+
+    def removed(self) -> List[str]:
+        with self._lock:
+            return sorted(app_id for app_id in self.previous if app_id not in self.current)
+
+    def delta(self) -> Dict[str, Any]:
+        with self._lock:
+            new, changed, unchanged = sorted(self.new), sorted(self.changed), self.unchanged
+        return {
+            "new": new,
+            "changed": changed,
+            "removed": self.removed(),
+            "unchangedCount": unchanged,
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            snapshot = dict(self.current)
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
@@ -1,14 +1,18 @@
-from copy import deepcopy
-from typing import Any, Dict, List
+from typing import Any, List, Mapping
+
+from utils.records import AppRecord, Review
 
 def merge_app_and_reviews(
-app_details: Dict[str, Any],
-reviews: List[Dict[str, Any]],
-) -> Dict[str, Any]:
-"""
-Combine app-level details with a list of review objects into a single record.
-"""
-record = deepcopy(app_details)
-record["reviews"] = reviews
-record["reviewsCount"] = len(reviews)
-return record
\ No newline at end of file
+    app_details: Mapping[str, Any],
+    reviews: List[Review],
+) -> AppRecord:
+    """
+    Combine app-level details with a list of review objects into a single record.
+
+    An ``AppRecord`` from the details extractor is completed in place rather
+    than copied; other mappings are converted to one.
+    """
+    record = app_details if isinstance(app_details, AppRecord) else AppRecord.from_mapping(app_details)
+    record.reviews = reviews
+    record.reviewsCount = len(reviews)
+    return record
@@ -0,0 +1,90 @@
+import logging
+from typing import Any, List, Optional
+
+from bs4 import BeautifulSoup
+from bs4.builder import HTMLParserTreeBuilder, ParserRejectedMarkup
+from bs4.element import Comment
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional fast backend
+    LexborHTMLParser = None
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+_default_parser = "html.parser"
+
+class LexborTreeBuilder(HTMLParserTreeBuilder):
+    """
+    BeautifulSoup tree builder that tokenizes with selectolax's lexbor engine.
+
+    lexbor parses the document in C; the resulting tree is replayed into
+    BeautifulSoup as start/data/end events, so every extractor keeps working
+    against the regular ``BeautifulSoup`` API.
+    """
+
+    NAME = "selectolax"
+    ALTERNATE_NAMES = ["lexbor"]
+    features = [NAME, "lexbor"]
+
+    def feed(self, markup: str) -> None:
+        assert self.soup is not None
+        if LexborHTMLParser is None:
+            raise ParserRejectedMarkup("selectolax is not installed")
+
+        root = LexborHTMLParser(markup).root
+        if root is None:
+            return
+
+        soup = self.soup
+        # Pending nodes, with (tag name,) tuples marking where to close tags.
+        stack: List[Any] = [root]
+        while stack:
+            node = stack.pop()
+            if type(node) is tuple:
+                soup.handle_endtag(node[0])
+                continue
+            if node.is_element_node:
+                attrs = {
+                    name: "" if value is None else value
+                    for name, value in node.attributes.items()
+                }
+                soup.handle_starttag(node.tag, None, None, attrs)
+                stack.append((node.tag,))
+                children = list(node.iter(include_text=True))
+                children.reverse()
+                stack.extend(children)
+            elif node.is_text_node:
+                soup.handle_data(node.text_content)
+            elif node.is_comment_node:
+                soup.endData()
+                soup.handle_data(node.comment_content)
+                soup.endData(Comment)
+
+def set_default_parser(parser: str) -> None:
+    """
+    Select the backend used when ``parse_html`` is called without one.
+    """
+    global _default_parser
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Invalid HTML parser '{parser}'. Allowed: {', '.join(PARSER_BACKENDS)}."
+        )
+    _default_parser = parser
+
+def get_default_parser() -> str:
+    return _default_parser
+
+def parse_html(markup: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse ``markup`` into a BeautifulSoup tree with the configured backend.
+    """
+    backend = parser or _default_parser
+    with metrics.time("html_parse_seconds", parser=backend):
+        if backend == "selectolax":
+            return BeautifulSoup(markup, builder=LexborTreeBuilder)
+        return BeautifulSoup(markup, backend)
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept with an entry (lower case), and those of them that
+# validate it.
+_STORED_HEADERS = ("content-type", "etag", "last-modified")
+_VALIDATORS = ("etag", "last-modified")
+
+class CacheEntry:
+    """
+    A stored response body together with the metadata needed to serve it
+    again or revalidate it against the origin.
+    """
+
+    __slots__ = ("status_code", "url", "headers", "body", "encoding", "stored_at")
+
+    def __init__(
+        self,
+        status_code: int,
+        url: str,
+        headers: Dict[str, str],
+        body: bytes,
+        encoding: Optional[str],
+        stored_at: float,
+    ) -> None:
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.encoding = encoding
+        self.stored_at = stored_at
+
+    def _header(self, name: str) -> Optional[str]:
+        # Stored with the casing the origin (or HTTP library) used.
+        for key, value in self.headers.items():
+            if key.lower() == name:
+                return value
+        return None
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self._header("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self._header("last-modified")
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+class HttpCache:
+    """
+    Persistent on-disk HTTP response cache.
+
+    Entries are keyed by method, URL and query params, stored zlib-compressed
+    one file per entry, and evicted least-recently-used first once the total
+    size on disk exceeds ``max_bytes``. Entries younger than ``ttl`` seconds
+    are served directly; older ones are revalidated with conditional GETs
+    when the origin sent an ETag or Last-Modified header.
+
+    ``misses`` counts lookups that found no fresh entry and went to the
+    origin; those answered with 304 Not Modified are also ``revalidations``.
+    """
+
+    _SUFFIX = ".z"
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: float = 3600,
+        max_bytes: int = 512 * 1024 * 1024,
+        compress_level: int = 6,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.cache_dir.glob(f"*/*{self._SUFFIX}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, path.stem, st.st_size))
+        # Access time is tracked through mtime, so oldest first is LRU order.
+        for _, key, size in sorted(files):
+            self._lru[key] = size
+            self._total_bytes += size
+        logger.debug(
+            "Loaded HTTP cache index: %d entries, %d bytes", len(self._lru), self._total_bytes
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{self._SUFFIX}"
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([method.upper(), url, items], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            if key not in self._lru:
+                return None
+            self._lru.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            raw = zlib.decompress(path.read_bytes())
+            os.utime(path)
+        except (OSError, zlib.error):
+            logger.debug("Dropping unreadable cache entry %s", path, exc_info=True)
+            self._discard(key)
+            return None
+
+        meta_raw, _, body = raw.partition(b"\n")
+        meta = json.loads(meta_raw)
+        return CacheEntry(
+            status_code=meta["status"],
+            url=meta["url"],
+            headers=meta["headers"],
+            body=body,
+            encoding=meta.get("encoding"),
+            stored_at=meta["storedAt"],
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    def can_revalidate(self, entry: CacheEntry) -> bool:
+        return bool(entry.etag or entry.last_modified)
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def put(
+        self,
+        key: str,
+        status_code: int,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        encoding: Optional[str],
+    ) -> CacheEntry:
+        entry = CacheEntry(
+            status_code=status_code,
+            url=url,
+            headers={
+                name: value for name, value in headers.items() if name.lower() in _STORED_HEADERS
+            },
+            body=body,
+            encoding=encoding,
+            stored_at=time.time(),
+        )
+        self._write(key, entry)
+        with self._lock:
+            self.stores += 1
+        return entry
+
+    def touch(
+        self, key: str, entry: CacheEntry, headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """
+        Mark an entry as fresh again after a 304 Not Modified response. The
+        validators in the 304's ``headers`` replace the stored ones, so the
+        next revalidation sends the current ones.
+        """
+        validators = {
+            name: value for name, value in (headers or {}).items() if name.lower() in _VALIDATORS
+        }
+        if validators:
+            replaced = {name.lower() for name in validators}
+            entry.headers = {
+                name: value
+                for name, value in entry.headers.items()
+                if name.lower() not in replaced
+            }
+            entry.headers.update(validators)
+        entry.stored_at = time.time()
+        self._write(key, entry)
+        with self._lock:
+            self.revalidations += 1
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        meta = {
+            "status": entry.status_code,
+            "url": entry.url,
+            "headers": entry.headers,
+            "encoding": entry.encoding,
+            "storedAt": entry.stored_at,
+        }
+        payload = zlib.compress(
+            json.dumps(meta).encode("utf-8") + b"\n" + entry.body, self.compress_level
+        )
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per process and thread: processes share the cache directory.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += len(payload) - self._lru.pop(key, 0)
+            self._lru[key] = len(payload)
+            victims = []
+            while self._total_bytes > self.max_bytes and len(self._lru) > 1:
+                victim, size = self._lru.popitem(last=False)
+                self._total_bytes -= size
+                self.evictions += 1
+                victims.append(victim)
+
+        for victim in victims:
+            try:
+                self._path(victim).unlink()
+            except OSError:
+                pass
+
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._lru.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": len(self._lru),
+                "bytes": self._total_bytes,
+            }
@@ -0,0 +1,303 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+METRIC_PREFIX = "gplay_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus style, plus min and max.
+    Quantiles are estimated by interpolating inside the matching bucket.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = LATENCY_BUCKETS[idx - 1] if idx > 0 else 0.0
+                upper = LATENCY_BUCKETS[idx] if idx < len(LATENCY_BUCKETS) else self.max
+                lower = max(lower, self.min)
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "min": round(self.min, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p90": round(self.quantile(0.9), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "max": round(self.max, 6),
+        }
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "started")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: Dict[str, Any]) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+_NULL_TIMER = _NullTimer()
+
+class Metrics:
+    """
+    Process-wide latency histograms and counters, keyed by name and labels.
+
+    Disabled by default: ``observe``, ``inc`` and ``time`` return right away
+    and hot paths check ``enabled`` before measuring anything, so an
+    uninstrumented run only pays for an attribute lookup per call site.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.started = time.time()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+        self.started = time.time()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            family = self._histograms.setdefault(name, {})
+            histogram = family.get(key)
+            if histogram is None:
+                histogram = family[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            family[key] = family.get(key, 0.0) + value
+
+    def time(self, name: str, **labels: Any) -> Any:
+        """
+        Context manager that observes the duration of its block.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def _snapshot(self) -> Tuple[Dict[str, Dict[LabelKey, Dict[str, Any]]], Dict[str, Dict[LabelKey, float]]]:
+        with self._lock:
+            histograms = {
+                name: {
+                    key: {"buckets": list(h.counts), "summary": h.summary()}
+                    for key, h in family.items()
+                }
+                for name, family in self._histograms.items()
+            }
+            counters = {name: dict(family) for name, family in self._counters.items()}
+        return histograms, counters
+
+    def summary(self) -> Dict[str, Any]:
+        histograms, counters = self._snapshot()
+        return {
+            "startedAt": self.started,
+            "elapsedSeconds": round(time.time() - self.started, 3),
+            "histograms": {
+                name: [
+                    {"labels": dict(key), **entry["summary"]}
+                    for key, entry in sorted(family.items())
+                ]
+                for name, family in sorted(histograms.items())
+            },
+            "counters": {
+                name: [
+                    {"labels": dict(key), "value": value}
+                    for key, value in sorted(family.items())
+                ]
+                for name, family in sorted(counters.items())
+            },
+        }
+
+    def prometheus_text(self) -> str:
+        histograms, counters = self._snapshot()
+        lines: List[str] = []
+        for name, family in sorted(histograms.items()):
+            metric = METRIC_PREFIX + name
+            lines.append(f"# TYPE {metric} histogram")
+            for key, entry in sorted(family.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), entry["buckets"]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{metric}_bucket{_labels(key, le=le)} {cumulative}")
+                lines.append(f"{metric}_sum{_labels(key)} {entry['summary']['sum']}")
+                lines.append(f"{metric}_count{_labels(key)} {entry['summary']['count']}")
+        for name, family in sorted(counters.items()):
+            metric = METRIC_PREFIX + name
+            lines.append(f"# TYPE {metric} counter")
+            for key, value in sorted(family.items()):
+                lines.append(f"{metric}{_labels(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_summary(self, path: Path) -> None:
+        _write_atomic(path, json.dumps(self.summary(), indent=2))
+
+    def write_prometheus(self, path: Path) -> None:
+        _write_atomic(path, self.prometheus_text())
+
+def _labels(key: LabelKey, **extra: str) -> str:
+    items = list(key) + list(extra.items())
+    if not items:
+        return ""
+    rendered = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in items
+    )
+    return "{" + rendered + "}"
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+# Shared by every module of the scraper.
+metrics = Metrics()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        payload = metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+class MetricsExporter:
+    """
+    Publishes ``metrics`` during long runs: serves the Prometheus text format
+    on ``port`` (any path), and/or rewrites ``prometheus_file`` every
+    ``interval`` seconds so a node_exporter textfile collector can pick it up.
+    """
+
+    def __init__(
+        self,
+        port: Optional[int] = None,
+        prometheus_file: Optional[Path] = None,
+        interval: float = 15.0,
+    ) -> None:
+        self.port = port
+        self.prometheus_file = prometheus_file
+        self.interval = interval
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "MetricsExporter":
+        if self.port is not None:
+            self._server = ThreadingHTTPServer(("0.0.0.0", self.port), _MetricsHandler)
+            self._server.daemon_threads = True
+            self._threads.append(
+                threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+            )
+            logger.info("Serving metrics on port %d", self._server.server_port)
+        if self.prometheus_file is not None:
+            self._threads.append(
+                threading.Thread(target=self._write_loop, name="metrics-file", daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _write_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._write_file()
+
+    def _write_file(self) -> None:
+        assert self.prometheus_file is not None
+        try:
+            metrics.write_prometheus(self.prometheus_file)
+        except OSError:
+            logger.warning("Could not write metrics to %s", self.prometheus_file, exc_info=True)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        if self.prometheus_file is not None:
+            self._write_file()
@@ -0,0 +1,413 @@
+import hashlib
+import json
+import logging
+import mmap
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Tuple
+
+from utils.http_cache import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Record header: magic, metadata length, compressed body length.
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"GPA1"
+
+_SEGMENT_GLOB = "segment-*.seg"
+_INDEX_NAME = "index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    app_id TEXT,
+    status INTEGER NOT NULL,
+    encoding TEXT,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    captured REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_app ON pages (url, app_id);
+"""
+
+_INSERT = (
+    "INSERT OR REPLACE INTO pages"
+    " (key, method, url, app_id, status, encoding, segment, offset, length, captured)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# (key, method, url, app_id, status, encoding, segment, offset, length, captured)
+IndexRow = Tuple[str, str, str, Optional[str], int, Optional[str], int, int, int, float]
+
+def archive_key(
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    data: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """
+    Identify a request by method, URL, query params and form data, so POSTs
+    to the review feed are told apart by their cursor.
+    """
+    params_items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    data_items = sorted((str(k), str(v)) for k, v in (data or {}).items())
+    raw = json.dumps([method.upper(), url, params_items, data_items], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def _segment_path(directory: Path, number: int) -> Path:
+    return directory / f"segment-{number:05d}.seg"
+
+def _segment_number(path: Path) -> int:
+    return int(path.stem.split("-", 1)[1])
+
+class ArchiveWriter:
+    """
+    Append-only archive of raw responses, captured while scraping so the
+    extractors can later be re-run over them without touching the network.
+
+    Records are appended back to back to ``segment-NNNNN.seg`` files in
+    ``directory``; a new segment is started on every open and once the
+    current one grows past ``segment_bytes``. Each record is a small header,
+    its JSON metadata and the zlib-compressed body. ``index.sqlite`` maps
+    every request key to the segment, offset and length of its latest
+    record and is written in batches of ``commit_every`` pages, always after
+    the segment data it points to has been flushed. Because records carry
+    their own metadata, ``rebuild_index`` can restore an index lost in a
+    crash; replays do so whenever ``index_is_stale``.
+
+    A writer can be shared between threads, but only one process at a time
+    may write to a directory.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int = 256 * 1024 * 1024,
+        compress_level: int = 6,
+        commit_every: int = 500,
+    ) -> None:
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.compress_level = compress_level
+        self.commit_every = max(1, commit_every)
+        self.pages = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._segment: Optional[BinaryIO] = None
+        self._segment_number = -1
+        self._pending: List[IndexRow] = []
+
+    def open(self) -> "ArchiveWriter":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.directory / _INDEX_NAME), timeout=60.0, check_same_thread=False
+        )
+        self._conn.executescript(_SCHEMA)
+        existing = [_segment_number(path) for path in self.directory.glob(_SEGMENT_GLOB)]
+        self._segment_number = max(existing, default=-1)
+        self._start_segment()
+        return self
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self.open()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _start_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+        self._segment_number += 1
+        self._segment = _segment_path(self.directory, self._segment_number).open("ab")
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        data: Optional[Mapping[str, Any]],
+        status_code: int,
+        body: bytes,
+        encoding: Optional[str],
+    ) -> None:
+        """
+        Append one response. A later record for the same request replaces
+        the earlier one in the index.
+        """
+        key = archive_key(method, url, params, data)
+        app_id = (params or {}).get("id")
+        captured = time.time()
+        meta = json.dumps(
+            {
+                "key": key,
+                "method": method.upper(),
+                "url": url,
+                "appId": app_id,
+                "status": status_code,
+                "encoding": encoding,
+                "captured": captured,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        blob = zlib.compress(body, self.compress_level)
+        with self._lock:
+            if self._segment is None:
+                raise RuntimeError("Archive writer is not open.")
+            offset = self._segment.tell()
+            self._segment.write(_HEADER.pack(_MAGIC, len(meta), len(blob)))
+            self._segment.write(meta)
+            self._segment.write(blob)
+            self._pending.append(
+                (
+                    key,
+                    method.upper(),
+                    url,
+                    app_id,
+                    status_code,
+                    encoding,
+                    self._segment_number,
+                    offset + _HEADER.size + len(meta),
+                    len(blob),
+                    captured,
+                )
+            )
+            self.pages += 1
+            self.raw_bytes += len(body)
+            self.stored_bytes += _HEADER.size + len(meta) + len(blob)
+            if len(self._pending) >= self.commit_every:
+                self._flush_locked()
+            if self._segment.tell() >= self.segment_bytes:
+                self._flush_locked()
+                self._start_segment()
+
+    def _flush_locked(self) -> None:
+        if self._segment is not None:
+            self._segment.flush()
+        if self._pending and self._conn is not None:
+            with self._conn:
+                self._conn.executemany(_INSERT, self._pending)
+            self._pending.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "rawBytes": self.raw_bytes,
+            "storedBytes": self.stored_bytes,
+            "segments": self._segment_number + 1,
+        }
+
+class ArchiveReader:
+    """
+    Read-only view of an archive written by ``ArchiveWriter``. Segments are
+    memory-mapped on first use, so bodies are decompressed straight from
+    the page cache and concurrent readers (threads or processes) share it.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._files: List[BinaryIO] = []
+        self._lock = threading.Lock()
+
+    def open(self) -> "ArchiveReader":
+        index_path = self.directory / _INDEX_NAME
+        if not index_path.exists():
+            raise FileNotFoundError(f"Page archive index not found: {index_path}")
+        self._conn = sqlite3.connect(
+            f"file:{index_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        return self
+
+    def __enter__(self) -> "ArchiveReader":
+        return self.open()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            for f in self._files:
+                f.close()
+            self._maps.clear()
+            self._files.clear()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.open()
+        assert self._conn is not None
+        return self._conn
+
+    def _map(self, segment: int) -> mmap.mmap:
+        mapped = self._maps.get(segment)
+        if mapped is None:
+            with self._lock:
+                mapped = self._maps.get(segment)
+                if mapped is None:
+                    f = _segment_path(self.directory, segment).open("rb")
+                    self._files.append(f)
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._maps[segment] = mapped
+        return mapped
+
+    def get(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        data: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[CacheEntry]:
+        """
+        Return the archived response to a request, or None if it was not
+        captured.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT url, status, encoding, segment, offset, length, captured"
+                " FROM pages WHERE key = ?",
+                (archive_key(method, url, params, data),),
+            ).fetchone()
+        if row is None:
+            return None
+        page_url, status, encoding, segment, offset, length, captured = row
+        body = zlib.decompress(self._map(segment)[offset:offset + length])
+        return CacheEntry(
+            status_code=status,
+            url=page_url,
+            headers={},
+            body=body,
+            encoding=encoding,
+            stored_at=captured,
+        )
+
+    def app_ids(self, url: str) -> List[str]:
+        """
+        IDs of the apps whose page at ``url`` was captured, in capture order.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT app_id FROM pages WHERE method = 'GET' AND url = ? AND app_id IS NOT NULL"
+                " GROUP BY app_id ORDER BY MIN(rowid)",
+                (url,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+def rebuild_index(directory: Path) -> int:
+    """
+    Recreate ``index.sqlite`` from the records in the segment files, e.g.
+    after a crash lost its last batch. A truncated record at the end of a
+    segment is skipped. Returns the number of records indexed.
+    """
+    directory = Path(directory)
+    index_path = directory / _INDEX_NAME
+    if index_path.exists():
+        index_path.unlink()
+    conn = sqlite3.connect(str(index_path))
+    conn.executescript(_SCHEMA)
+    indexed = 0
+    try:
+        for path in sorted(directory.glob(_SEGMENT_GLOB), key=_segment_number):
+            number = _segment_number(path)
+            size = path.stat().st_size
+            rows: List[IndexRow] = []
+            with path.open("rb") as f:
+                while True:
+                    header = f.read(_HEADER.size)
+                    if len(header) < _HEADER.size:
+                        break
+                    magic, meta_len, blob_len = _HEADER.unpack(header)
+                    if magic != _MAGIC:
+                        logger.warning("Corrupt record in %s at offset %d.", path, f.tell() - _HEADER.size)
+                        break
+                    meta_raw = f.read(meta_len)
+                    offset = f.tell()
+                    f.seek(blob_len, 1)
+                    if len(meta_raw) < meta_len or f.tell() > size:
+                        logger.warning("Truncated record at the end of %s.", path)
+                        break
+                    meta = json.loads(meta_raw)
+                    rows.append(
+                        (
+                            meta["key"],
+                            meta["method"],
+                            meta["url"],
+                            meta.get("appId"),
+                            meta["status"],
+                            meta.get("encoding"),
+                            number,
+                            offset,
+                            blob_len,
+                            meta["captured"],
+                        )
+                    )
+            with conn:
+                conn.executemany(_INSERT, rows)
+            indexed += len(rows)
+    finally:
+        conn.close()
+    return indexed
+
+def index_is_stale(directory: Path) -> bool:
+    """
+    Whether ``index.sqlite`` is missing, or a crash lost its last batch:
+    index rows are only ever pending for the newest segment written to, so
+    the index is current if no complete record follows the last one it
+    points to there.
+    """
+    directory = Path(directory)
+    segments = sorted(directory.glob(_SEGMENT_GLOB), key=_segment_number, reverse=True)
+    last = next((path for path in segments if path.stat().st_size), None)
+    if last is None:
+        return False
+    index_path = directory / _INDEX_NAME
+    if not index_path.exists():
+        return True
+    conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    try:
+        end = conn.execute(
+            "SELECT MAX(offset + length) FROM pages WHERE segment = ?", (_segment_number(last),)
+        ).fetchone()[0] or 0
+    finally:
+        conn.close()
+    size = last.stat().st_size
+    with last.open("rb") as f:
+        f.seek(end)
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return False
+    magic, meta_len, blob_len = _HEADER.unpack(header)
+    # A torn record left by the crash is skipped by ``rebuild_index`` too.
+    return magic == _MAGIC and end + _HEADER.size + meta_len + blob_len <= size
@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from utils.html_parser import parse_html
+from utils.request_client import PageClient
+
+if TYPE_CHECKING:
+    from utils.async_request_client import AsyncRequestClient
+
+logger = logging.getLogger(__name__)
+
+def _request_key(url: str, params: Optional[Dict[str, Any]]) -> Tuple[Hashable, ...]:
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return ("GET", url, items)
+
+def _hold(holders: Dict[int, int], caller: int) -> None:
+    holders[caller] = holders.get(caller, 0) + 1
+
+def _unhold(holders: Dict[int, int], caller: int) -> bool:
+    """
+    Drop one hold of ``caller``; False if it held nothing.
+    """
+    count = holders.get(caller)
+    if not count:
+        return False
+    if count == 1:
+        del holders[caller]
+    else:
+        holders[caller] = count - 1
+    return True
+
+class _PendingPage:
+    """
+    Slot for a single page fetch. The first caller fills it, every other
+    caller asking for the same page waits on the event. The page is parsed
+    on the first ``get_soup`` call, so callers that only need the raw text
+    never pay for parsing. ``holders`` counts the holds of each caller.
+    """
+
+    def __init__(self, caller: int) -> None:
+        self.ready = threading.Event()
+        self.text: Optional[str] = None
+        self.soup: Optional[BeautifulSoup] = None
+        self.error: Optional[BaseException] = None
+        self.holders: Dict[int, int] = {caller: 1}
+        self.parse_lock = threading.Lock()
+
+class PageFetcher:
+    """
+    Fetches and parses store pages on behalf of the extractors.
+
+    Identical GET requests (same URL and params) are coalesced: while a page
+    is being downloaded, or after it has been parsed, every caller receives
+    the same parsed document instead of sending another request. Each
+    ``get_soup`` or ``get_text`` call that returns should be paired with a
+    ``release`` call from the same thread; the page is dropped once all of
+    its callers have released it. A thread's releases only ever drop its own
+    holds, so an extra release cannot take a page from another thread.
+
+    ``parser`` selects the HTML backend; the configured default is used
+    when it is None.
+    """
+
+    def __init__(self, client: PageClient, parser: Optional[str] = None) -> None:
+        self.client = client
+        self.parser = parser
+        self._pages: Dict[Tuple[Hashable, ...], _PendingPage] = {}
+        self._lock = threading.Lock()
+        self.requests_made = 0
+        self.requests_saved = 0
+
+    def get_soup(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> BeautifulSoup:
+        pending = self._get_page(url, params)
+        if pending.soup is None:
+            with pending.parse_lock:
+                if pending.soup is None:
+                    pending.soup = parse_html(pending.text, parser=self.parser)
+        return pending.soup
+
+    def get_text(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Like ``get_soup`` but returns the response body without parsing it.
+        Must be paired with a ``release`` call as well.
+        """
+        return self._get_page(url, params).text
+
+    def _get_page(self, url: str, params: Optional[Dict[str, Any]]) -> _PendingPage:
+        key = _request_key(url, params)
+        caller = threading.get_ident()
+        with self._lock:
+            pending = self._pages.get(key)
+            owner = pending is None
+            if owner:
+                pending = _PendingPage(caller)
+                self._pages[key] = pending
+                self.requests_made += 1
+            else:
+                _hold(pending.holders, caller)
+                self.requests_saved += 1
+
+        if not owner:
+            logger.debug("Reusing page for %s (params=%s)", url, params)
+            pending.ready.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending
+
+        try:
+            response = self.client.get(url, params=params)
+            pending.text = response.text
+        except BaseException as exc:
+            pending.error = exc
+            # Failed fetches are not cached so that a later call can retry.
+            with self._lock:
+                self._pages.pop(key, None)
+            raise
+        finally:
+            pending.ready.set()
+
+        return pending
+
+    def release(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Signal that the calling thread is done with a page. Ignored when it
+        holds none, e.g. because the page it asked for failed to download
+        and was fetched again for someone else since.
+        """
+        key = _request_key(url, params)
+        caller = threading.get_ident()
+        with self._lock:
+            pending = self._pages.get(key)
+            if pending is None or not _unhold(pending.holders, caller):
+                return
+            if not pending.holders:
+                del self._pages[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requestsMade": self.requests_made,
+                "requestsSaved": self.requests_saved,
+                "pagesHeld": len(self._pages),
+            }
+
+class AsyncPageFetcher:
+    """
+    asyncio counterpart of ``PageFetcher`` for ``AsyncRequestClient``.
+
+    Concurrent coroutines asking for the same page await a single shared
+    task instead of sending duplicate requests. Holds are counted per
+    asyncio task, as ``PageFetcher`` counts them per thread.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncRequestClient",
+        parser: Optional[str] = None,
+    ) -> None:
+        self.client = client
+        self.parser = parser
+        self._pages: Dict[Tuple[Hashable, ...], "asyncio.Task[str]"] = {}
+        self._soups: Dict[Tuple[Hashable, ...], BeautifulSoup] = {}
+        self._holders: Dict[Tuple[Hashable, ...], Dict[int, int]] = {}
+        self.requests_made = 0
+        self.requests_saved = 0
+
+    async def _load(self, url: str, params: Optional[Dict[str, Any]]) -> str:
+        response = await self.client.get(url, params=params)
+        return response.text
+
+    async def get_soup(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> BeautifulSoup:
+        text = await self.get_text(url, params=params)
+        key = _request_key(url, params)
+        soup = self._soups.get(key)
+        if soup is None:
+            soup = parse_html(text, parser=self.parser)
+            if key in self._pages:
+                self._soups[key] = soup
+        return soup
+
+    async def get_text(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        key = _request_key(url, params)
+        caller = id(asyncio.current_task())
+        task = self._pages.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(url, params))
+            self._pages[key] = task
+            self._holders[key] = {caller: 1}
+            self.requests_made += 1
+        else:
+            _hold(self._holders[key], caller)
+            self.requests_saved += 1
+            logger.debug("Reusing page for %s (params=%s)", url, params)
+
+        try:
+            # Shield the shared task so one cancelled caller does not cancel
+            # the fetch for everyone else waiting on it.
+            return await asyncio.shield(task)
+        except BaseException:
+            # A caller whose fetch raised holds nothing: a failed page is
+            # dropped for everyone, a cancelled caller only drops its hold.
+            if self._pages.get(key) is task and (
+                task.done() or (_unhold(self._holders[key], caller) and not self._holders[key])
+            ):
+                del self._pages[key]
+                del self._holders[key]
+                self._soups.pop(key, None)
+            raise
+
+    def release(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        key = _request_key(url, params)
+        if key not in self._pages or not _unhold(self._holders[key], id(asyncio.current_task())):
+            return
+        if not self._holders[key]:
+            del self._pages[key]
+            del self._holders[key]
+            self._soups.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requestsMade": self.requests_made,
+            "requestsSaved": self.requests_saved,
+            "pagesHeld": len(self._pages),
+        }
\ No newline at end of file
@@ -0,0 +1,237 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean "slow down" rather than "this request is broken".
+THROTTLE_STATUSES = frozenset({429, 503})
+
+# How long callers wait between checks when a host has no free slot.
+_POLL_INTERVAL = 0.01
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of sending a request while a host's circuit is open.
+    """
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds to wait according to a Retry-After header, which holds either a
+    number of seconds or an HTTP date. None when missing or unreadable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """
+    Next backoff delay using "decorrelated jitter": a random value between
+    ``base`` and three times the previous delay, capped at ``cap``.
+    """
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+class TokenBucket:
+    """
+    Classic token bucket: ``rate`` tokens per second, at most ``burst``
+    saved up. ``pause`` empties the bucket until a point in time, which is
+    how a Retry-After from the server is applied to every caller at once.
+    Not thread-safe on its own; ``HostRateController`` holds the lock.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, now: float) -> float:
+        """
+        Take a token and return 0, or return the seconds until one is due.
+        """
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def pause(self, until: float) -> None:
+        if until > self.paused_until:
+            self.paused_until = until
+            self.tokens = 0.0
+            self.updated = until
+
+class HostRateController:
+    """
+    Admission control for one host.
+
+    - Token bucket: caps the request rate (``rate`` per second, 0 = no cap).
+    - AIMD concurrency limit: grows by about one slot per ``limit``
+      successful responses and is multiplied by ``decrease`` when the host
+      answers 429/503 (at most once per ``cooldown`` seconds, so one burst of
+      errors counts as one signal).
+    - Circuit breaker: after ``failure_threshold`` consecutive failures the
+      host is refused for ``reset_timeout`` seconds, then a single probe
+      request decides whether it closes again.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = 0.0,
+        burst: float = 10.0,
+        initial_limit: float = 4.0,
+        min_limit: float = 1.0,
+        max_limit: float = 64.0,
+        decrease: float = 0.7,
+        cooldown: float = 1.0,
+        failure_threshold: int = 20,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.limit = max(min_limit, min(initial_limit, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.last_decrease = 0.0
+        self.throttled = 0
+        self.succeeded = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Claim a slot for one request. Returns 0 when the request may be sent
+        (the caller must then call ``release``), otherwise the number of
+        seconds to wait before trying again.
+
+        Raises ``CircuitOpenError`` while the circuit is open.
+        """
+        with self._lock:
+            now = time.monotonic()
+            half_open = False
+            if self.opened_at is not None:
+                if now - self.opened_at < self.reset_timeout or self.probing:
+                    raise CircuitOpenError(f"Circuit open for {self.host}")
+                # Half-open: the next admitted request is the probe.
+                half_open = True
+            if self.in_flight >= int(self.limit):
+                return _POLL_INTERVAL
+            wait = self.bucket.try_take(now)
+            if wait > 0:
+                return wait
+            self.probing = half_open
+            self.in_flight += 1
+            return 0.0
+
+    def release(self, status: Optional[int], retry_after: Optional[float] = None) -> None:
+        """
+        Report the outcome of a request admitted by ``try_acquire``.
+        ``status`` is None when no response was received.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.in_flight = max(0, self.in_flight - 1)
+            throttled = status in THROTTLE_STATUSES
+            failed = status is None or status >= 500 or throttled
+
+            if throttled:
+                self.throttled += 1
+                if now - self.last_decrease >= self.cooldown:
+                    self.last_decrease = now
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    logger.info(
+                        "Throttled by %s (HTTP %s); concurrency limit now %d",
+                        self.host,
+                        status,
+                        int(self.limit),
+                    )
+                if retry_after:
+                    self.bucket.pause(now + retry_after)
+            elif not failed:
+                self.succeeded += 1
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+            if failed:
+                self.consecutive_failures += 1
+                if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+                    if self.opened_at is None:
+                        logger.warning(
+                            "Opening circuit for %s after %d consecutive failures",
+                            self.host,
+                            self.consecutive_failures,
+                        )
+                    self.opened_at = now
+            else:
+                self.consecutive_failures = 0
+                if self.opened_at is not None:
+                    logger.info("Closing circuit for %s", self.host)
+                self.opened_at = None
+            self.probing = False
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "concurrencyLimit": int(self.limit),
+                "inFlight": self.in_flight,
+                "succeeded": self.succeeded,
+                "throttled": self.throttled,
+                "circuitOpen": self.opened_at is not None,
+            }
+
+class RateController:
+    """
+    Hands out one ``HostRateController`` per host, all created with the
+    same settings. Shared by every thread or coroutine of a client.
+    """
+
+    def __init__(self, **host_settings: float) -> None:
+        self.host_settings = host_settings
+        self._hosts: Dict[str, HostRateController] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> HostRateController:
+        host = urlsplit(url).netloc
+        with self._lock:
+            controller = self._hosts.get(host)
+            if controller is None:
+                controller = HostRateController(host, **self.host_settings)
+                self._hosts[host] = controller
+            return controller
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: controller.stats() for host, controller in hosts.items()}
@@ -0,0 +1,205 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+class _Record(Mapping):
+    """
+    Fixed-field record stored in ``__slots__`` that still reads like the
+    dict records it replaces: ``record["score"]``, ``record.get(...)``,
+    iteration, ``dict(record)``, ``**record`` and comparison with dicts all
+    work, so writers and other consumers need not care which one they get.
+    """
+
+    __slots__ = ()
+
+    FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET: FrozenSet[str] = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def _keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self._keys()}
+
+class Review(_Record):
+    """
+    One review. User names, dates and versions repeat across millions of
+    reviews and are interned.
+    """
+
+    __slots__ = ("userName", "score", "text", "date", "version", "thumbsUp")
+
+    FIELDS = __slots__
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(
+        self,
+        userName: Optional[str] = None,  # noqa: N803
+        score: Optional[float] = None,
+        text: Optional[str] = None,
+        date: Optional[str] = None,
+        version: Optional[str] = None,
+        thumbsUp: Optional[int] = None,  # noqa: N803
+    ) -> None:
+        self.userName = _intern(userName)
+        self.score = score
+        self.text = text
+        self.date = _intern(date)
+        self.version = _intern(version)
+        self.thumbsUp = thumbsUp
+
+    @classmethod
+    def from_mapping(cls, data: "Mapping[str, Any]") -> "Review":
+        if isinstance(data, cls):
+            return data
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+class AppRecord(_Record):
+    """
+    App details and, once merged, its reviews. Fields keep the order of the
+    former dict records, so serialized output is unchanged. Strings shared
+    by many apps (genre, installs bucket, categories, developer contact
+    details) are interned.
+
+    A record whose ``projection`` is set (a ``select_fields`` tuple) only
+    exposes those fields as mapping keys. ``review_cursor`` is the review
+    feed position to save once the record is written; it is not a field.
+    """
+
+    FIELDS = (
+        "title",
+        "appId",
+        "description",
+        "score",
+        "ratings",
+        "reviews",
+        "installs",
+        "screenshots",
+        "video",
+        "developerEmail",
+        "developerWebsite",
+        "developerAddress",
+        "genre",
+        "categories",
+        "reviewsCount",
+    )
+    _FIELD_SET = frozenset(FIELDS)
+
+    __slots__ = FIELDS + ("projection", "review_cursor")
+
+    def __init__(
+        self,
+        appId: str,  # noqa: N803
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        score: Optional[float] = None,
+        ratings: Optional[int] = None,
+        reviews: Optional[List[Review]] = None,
+        installs: Optional[str] = None,
+        screenshots: Optional[List[str]] = None,
+        video: Optional[str] = None,
+        developerEmail: Optional[str] = None,  # noqa: N803
+        developerWebsite: Optional[str] = None,  # noqa: N803
+        developerAddress: Optional[str] = None,  # noqa: N803
+        genre: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        reviewsCount: Optional[int] = None,  # noqa: N803
+    ) -> None:
+        self.title = title
+        self.appId = appId
+        self.description = description
+        self.score = score
+        self.ratings = ratings
+        self.reviews = reviews
+        self.installs = _intern(installs)
+        self.screenshots = screenshots
+        self.video = video
+        self.developerEmail = _intern(developerEmail)
+        self.developerWebsite = _intern(developerWebsite)
+        self.developerAddress = _intern(developerAddress)
+        self.genre = _intern(genre)
+        self.categories = [_intern(c) for c in categories] if categories is not None else None
+        self.reviewsCount = reviewsCount
+        self.projection: Optional[Tuple[str, ...]] = None
+        self.review_cursor: Optional[Dict[str, Any]] = None
+
+    def _keys(self) -> Tuple[str, ...]:
+        return self.projection or self.FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        if key in (self.projection or self._FIELD_SET):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    @classmethod
+    def from_mapping(cls, data: "Mapping[str, Any]") -> "AppRecord":
+        """
+        Build a record from a details dict; keys outside ``FIELDS`` are
+        dropped.
+        """
+        fields = {field: data.get(field) for field in cls.FIELDS}
+        if fields["reviews"] is not None:
+            fields["reviews"] = [Review.from_mapping(review) for review in fields["reviews"]]
+        return cls(**fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = super().to_dict()
+        if record.get("reviews") is not None:
+            record["reviews"] = [review.to_dict() for review in self.reviews]
+        return record
+
+# Fields that need the app's reviews to be fetched.
+REVIEW_FIELDS = frozenset({"reviews", "reviewsCount"})
+
+def select_fields(fields: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Validate a field projection and return it in record order, always with
+    ``appId``. Accepts names or a comma-separated string.
+    """
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    requested = {field.strip() for field in fields if field.strip()}
+    unknown = requested - AppRecord._FIELD_SET
+    if unknown:
+        raise ValueError(
+            f"Invalid field(s) {', '.join(sorted(unknown))}. Allowed: {', '.join(AppRecord.FIELDS)}."
+        )
+    requested.add("appId")
+    return tuple(field for field in AppRecord.FIELDS if field in requested)
+
+def wants_reviews(fields: Optional[Iterable[str]]) -> bool:
+    """
+    Whether a projection (None = every field) includes reviews.
+    """
+    return fields is None or not REVIEW_FIELDS.isdisjoint(fields)
+
+def to_builtin(value: Any) -> Any:
+    """
+    ``default`` hook for ``json.dump``/``json.dumps`` that serializes
+    records as the dicts they stand for.
+    """
+    if isinstance(value, _Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
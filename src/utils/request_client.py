@@ -1,15 +1,65 @@
 import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Protocol
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from utils.http_cache import CacheEntry, HttpCache
+from utils.metrics import metrics
+from utils.page_archive import ArchiveWriter
+from utils.rate_control import (
+    THROTTLE_STATUSES,
+    HostRateController,
+    RateController,
+    decorrelated_jitter,
+    parse_retry_after,
+)
 
 logger = logging.getLogger(__name__)
 
+class PageClient(Protocol):
+    """
+    What page fetching and the review feed need from a client:
+    ``RequestClient``, or the archive stand-in a replay uses.
+    """
+
+    def get(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response: ...
+
+    def post(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response: ...
+
 class RequestClient:
     """
     Lightweight HTTP client wrapper that adds timeouts, retries,
     and structured logging on top of requests.Session.
+
+    A single client can be shared between worker threads: the session keeps
+    up to ``pool_size`` pooled connections per host and blocks callers when
+    all of them are busy instead of opening throwaway connections.
+
+    When an ``HttpCache`` is given, GET responses are served from and stored
+    in it, and stale entries are revalidated with conditional requests.
+
+    Retries back off with decorrelated jitter starting at ``backoff_factor``
+    and capped at ``max_backoff``; a Retry-After header on 429/503 responses
+    is honoured when it asks for longer. With a ``RateController``, every
+    request is admitted through its host's token bucket, AIMD concurrency
+    limit and circuit breaker.
+
+    With an ``ArchiveWriter``, every successful response (cached or not) is
+    also captured there for offline replay.
     """
 
     def __init__(
@@ -18,8 +68,20 @@ class RequestClient:
         timeout: int = 15,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
+        pool_size: int = 10,
+        cache: Optional[HttpCache] = None,
+        max_backoff: float = 30.0,
+        rate_controller: Optional[RateController] = None,
+        archive: Optional[ArchiveWriter] = None,
     ) -> None:
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=True,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(
             {
                 "User-Agent": user_agent,
@@ -29,6 +91,30 @@ class RequestClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.rate_controller = rate_controller
+        self.archive = archive
+
+    @staticmethod
+    def _response_from_cache(entry: CacheEntry) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = entry.status_code
+        resp.url = entry.url
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        resp.encoding = entry.encoding
+        resp._content = entry.body
+        return resp
+
+    def _acquire(self, url: str) -> Optional[HostRateController]:
+        if self.rate_controller is None:
+            return None
+        host = self.rate_controller.for_url(url)
+        while True:
+            wait = host.try_acquire()
+            if wait <= 0:
+                return host
+            time.sleep(wait)
 
     def _request(
         self,
@@ -38,8 +124,28 @@ class RequestClient:
         params: Optional[Dict[str, Any]] = None,
         data: Optional[Dict[str, Any]] = None,
     ) -> requests.Response:
+        cache_key: Optional[str] = None
+        cached: Optional[CacheEntry] = None
+        headers: Optional[Dict[str, str]] = None
+        if self.cache is not None and method == "GET":
+            cache_key = self.cache.make_key(method, url, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None and self.cache.is_fresh(cached):
+                self.cache.record_hit()
+                metrics.inc("http_cache_hits_total", method=method)
+                logger.debug("Cache hit for %s %s (params=%s)", method, url, params)
+                return self._response_from_cache(cached)
+            self.cache.record_miss()
+            if cached is not None and self.cache.can_revalidate(cached):
+                headers = self.cache.conditional_headers(cached)
+
         last_exc: Optional[Exception] = None
+        delay = self.backoff_factor
         for attempt in range(1, self.max_retries + 1):
+            host = self._acquire(url)
+            status: Optional[int] = None
+            retry_after: Optional[float] = None
+            started = time.perf_counter()
             try:
                 logger.debug(
                     "HTTP %s %s (attempt %d/%d, params=%s)",
@@ -54,9 +160,28 @@ class RequestClient:
                     url=url,
                     params=params,
                     data=data,
+                    headers=headers,
                     timeout=self.timeout,
                 )
+                status = resp.status_code
+                if status in THROTTLE_STATUSES:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if metrics.enabled:
+                    metrics.inc("http_response_bytes_total", len(resp.content), method=method)
+                if resp.status_code == 304 and cached is not None:
+                    logger.debug("Revalidated cached %s %s", method, url)
+                    self.cache.touch(cache_key, cached, resp.headers)
+                    return self._response_from_cache(cached)
                 if 200 <= resp.status_code < 300:
+                    if cache_key is not None:
+                        self.cache.put(
+                            cache_key,
+                            status_code=resp.status_code,
+                            url=resp.url,
+                            headers=resp.headers,
+                            body=resp.content,
+                            encoding=resp.encoding,
+                        )
                     return resp
 
                 logger.warning(
@@ -76,11 +201,27 @@ class RequestClient:
                     self.max_retries,
                     exc,
                 )
+            finally:
+                if host is not None:
+                    host.release(status, retry_after)
+                if metrics.enabled:
+                    metrics.observe(
+                        "http_request_seconds",
+                        time.perf_counter() - started,
+                        method=method,
+                        status=status or "error",
+                        attempt=attempt,
+                    )
 
-            sleep_for = self.backoff_factor * attempt
+            if attempt == self.max_retries:
+                break
+            metrics.inc("http_retries_total", method=method, status=status or "error")
+            delay = decorrelated_jitter(delay, self.backoff_factor, self.max_backoff)
+            sleep_for = max(delay, retry_after or 0.0)
             logger.debug("Sleeping for %.2fs before retry.", sleep_for)
             time.sleep(sleep_for)
 
+        metrics.inc("http_failures_total", method=method)
         if last_exc is not None:
             raise RuntimeError(f"Failed to {method} {url}") from last_exc
 
@@ -92,7 +233,7 @@ class RequestClient:
         *,
         params: Optional[Dict[str, Any]] = None,
     ) -> requests.Response:
-        return self._request("GET", url, params=params)
+        return self._capture("GET", url, params, None, self._request("GET", url, params=params))
 
     def post(
         self,
@@ -101,4 +242,20 @@ class RequestClient:
         params: Optional[Dict[str, Any]] = None,
         data: Optional[Dict[str, Any]] = None,
     ) -> requests.Response:
-        return self._request("POST", url, params=params, data=data)
\ No newline at end of file
+        return self._capture(
+            "POST", url, params, data, self._request("POST", url, params=params, data=data)
+        )
+
+    def _capture(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        resp: requests.Response,
+    ) -> requests.Response:
+        if self.archive is not None:
+            self.archive.record(
+                method, url, params, data, resp.status_code, resp.content, resp.encoding
+            )
+        return resp
\ No newline at end of file
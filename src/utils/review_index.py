@@ -0,0 +1,291 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bloom file header: magic, number of bits, number of hash functions, items.
+_BLOOM_HEADER = struct.Struct("<4sQIQ")
+_BLOOM_MAGIC = b"GRB1"
+
+_BLOOM_NAME = "bloom.bin"
+_SET_NAME = "seen.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (fingerprint INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('count', 0);
+"""
+
+_MASK64 = (1 << 64) - 1
+
+def review_fingerprint(app_id: Optional[str], review: Mapping[str, Any]) -> int:
+    """
+    Stable 64-bit fingerprint of a review of ``app_id``: user, text, score
+    and date. Signed, so it fits an SQLite integer.
+    """
+    raw = json.dumps(
+        [app_id, review.get("userName"), review.get("text"), review.get("score"), review.get("date")],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+def bloom_parameters(capacity: int, fp_rate: float) -> Tuple[int, int]:
+    """
+    Number of bits and hash functions for ``capacity`` items at a false
+    positive rate of ``fp_rate``.
+    """
+    capacity = max(1, capacity)
+    bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+def bloom_capacity(bits: int, fp_rate: float) -> int:
+    """
+    Number of items ``bits`` bits hold at a false positive rate of
+    ``fp_rate``.
+    """
+    return int(bits * math.log(2) ** 2 / -math.log(fp_rate))
+
+class BloomFilter:
+    """
+    Bit array with ``hashes`` probe positions per 64-bit fingerprint, taken
+    by double hashing from its two halves.
+    """
+
+    def __init__(self, bits: int, hashes: int, items: int = 0, data: Optional[bytearray] = None) -> None:
+        self.bits = bits
+        self.hashes = hashes
+        self.items = items
+        self.data = data if data is not None else bytearray((bits + 7) // 8)
+
+    def _positions(self, fingerprint: int) -> Iterable[int]:
+        value = fingerprint & _MASK64
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, fingerprint: int) -> None:
+        for pos in self._positions(fingerprint):
+            self.data[pos >> 3] |= 1 << (pos & 7)
+        self.items += 1
+
+    def __contains__(self, fingerprint: int) -> bool:
+        data = self.data
+        return all(data[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fingerprint))
+
+    def expected_fp_rate(self) -> float:
+        return (1 - math.exp(-self.hashes * self.items / self.bits)) ** self.hashes
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, self.bits, self.hashes, self.items))
+            f.write(self.data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BloomFilter"]:
+        if not path.exists():
+            return None
+        with path.open("rb") as f:
+            header = f.read(_BLOOM_HEADER.size)
+            if len(header) != _BLOOM_HEADER.size:
+                return None
+            magic, bits, hashes, items = _BLOOM_HEADER.unpack(header)
+            data = bytearray(f.read())
+        if magic != _BLOOM_MAGIC or len(data) != (bits + 7) // 8:
+            return None
+        return cls(bits, hashes, items, data)
+
+class ReviewIndex:
+    """
+    Persistent index of the reviews emitted by earlier runs, so a run only
+    emits reviews it has not seen before.
+
+    Reviews are identified by ``review_fingerprint``, per app: the same
+    short review by the same user on two apps is still two reviews. Every
+    fingerprint is kept in ``seen.sqlite`` in ``directory``; ``bloom.bin``
+    holds a Bloom filter over the same set, sized for ``capacity`` reviews
+    at a false positive rate of ``fp_rate``. A review the filter has never
+    seen is new without touching the disk; one it may have seen is looked up
+    in the set, so filter false positives only cost a lookup and never drop
+    a review. ``stats()`` reports how often that happened.
+
+    ``filter_new`` stages the fingerprints of the reviews it lets through;
+    ``commit`` persists them once those reviews are durably written, and
+    ``discard`` unstages reviews that failed to be written. The filter is
+    rebuilt from the set when it is missing, out of date (a crash before
+    ``close``), sized for other settings or over capacity.
+    """
+
+    def __init__(self, directory: Path, capacity: int = 1_000_000, fp_rate: float = 0.001) -> None:
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"Invalid false positive rate {fp_rate}; expected a value between 0 and 1.")
+        self.directory = directory
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.bloom: Optional[BloomFilter] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: Dict[int, None] = {}
+        self._lock = threading.Lock()
+        self._checked = 0
+        self._duplicates = 0
+        self._bloom_negatives = 0
+        self._false_positives = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def open(self) -> "ReviewIndex":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.directory / _SET_NAME), timeout=60.0, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        count = self._count()
+        bits, _ = bloom_parameters(self.capacity, self.fp_rate)
+        bloom = BloomFilter.load(self.directory / _BLOOM_NAME)
+        if (
+            bloom is None
+            or bloom.items != count
+            or bloom.bits < bits
+            or count > bloom_capacity(bloom.bits, self.fp_rate)
+        ):
+            # Leave room to grow, so a full index is not rebuilt every run.
+            bits, hashes = bloom_parameters(max(self.capacity, 2 * count), self.fp_rate)
+            bloom = self._rebuild(bits, hashes)
+        self.bloom = bloom
+        return self
+
+    def _count(self) -> int:
+        assert self._conn is not None
+        return self._conn.execute("SELECT value FROM meta WHERE key = 'count'").fetchone()[0]
+
+    def _rebuild(self, bits: int, hashes: int) -> BloomFilter:
+        assert self._conn is not None
+        bloom = BloomFilter(bits, hashes)
+        for (fingerprint,) in self._conn.execute("SELECT fingerprint FROM seen"):
+            bloom.add(fingerprint)
+        logger.info(
+            "Built the review Bloom filter (%d bits, %d hashes) from %d reviews",
+            bits, hashes, bloom.items,
+        )
+        return bloom
+
+    def _seen(self, fingerprint: int) -> bool:
+        assert self.bloom is not None and self._conn is not None
+        if fingerprint not in self.bloom:
+            self._bloom_negatives += 1
+            return False
+        row = self._conn.execute("SELECT 1 FROM seen WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row is None:
+            self._false_positives += 1
+            return False
+        return True
+
+    def filter_new(self, app_id: Optional[str], reviews: Iterable[Mapping[str, Any]]) -> List[Any]:
+        """
+        Return the reviews of ``app_id`` not emitted before, neither by an
+        earlier run nor earlier in this one, and stage them to be committed.
+        """
+        if self._conn is None:
+            self.open()
+        fresh = []
+        with self._lock:
+            for review in reviews:
+                fingerprint = review_fingerprint(app_id, review)
+                self._checked += 1
+                if fingerprint in self._pending or self._seen(fingerprint):
+                    self._duplicates += 1
+                    continue
+                self._pending[fingerprint] = None
+                fresh.append(review)
+        return fresh
+
+    def commit(self) -> None:
+        """
+        Persist the staged fingerprints and add them to the Bloom filter.
+        """
+        with self._lock:
+            if not self._pending or self._conn is None:
+                return
+            assert self.bloom is not None
+            with self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO seen (fingerprint) VALUES (?)",
+                    ((fingerprint,) for fingerprint in self._pending),
+                )
+                added = self._conn.total_changes - before
+                self._conn.execute("UPDATE meta SET value = value + ? WHERE key = 'count'", (added,))
+            for fingerprint in self._pending:
+                self.bloom.add(fingerprint)
+            # Keep the filter's item count in step with the set's.
+            self.bloom.items -= len(self._pending) - added
+            self._pending.clear()
+
+    def discard(self, app_id: Optional[str], reviews: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Unstage reviews of ``app_id`` that ``filter_new`` let through but
+        that were never written.
+        """
+        with self._lock:
+            for review in reviews:
+                self._pending.pop(review_fingerprint(app_id, review), None)
+
+    def close(self, commit: bool = True) -> None:
+        """
+        Commit staged fingerprints (unless ``commit`` is false, e.g. when
+        their reviews were never written) and save the Bloom filter.
+        """
+        if self._conn is None:
+            return
+        if commit:
+            self.commit()
+        else:
+            self._pending.clear()
+        assert self.bloom is not None
+        if self.bloom.items > bloom_capacity(self.bloom.bits, self.fp_rate):
+            logger.info(
+                "Review index holds %d reviews, more than its Bloom filter is sized for; "
+                "the filter is resized on the next run.",
+                self.bloom.items,
+            )
+        self.bloom.save(self.directory / _BLOOM_NAME)
+        self._conn.close()
+        self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counts for this run. ``observedFalsePositiveRate`` is the share of
+        unseen reviews the Bloom filter nevertheless flagged as seen;
+        ``expectedFalsePositiveRate`` is the theoretical rate at the
+        filter's current fill.
+        """
+        with self._lock:
+            unseen = self._bloom_negatives + self._false_positives
+            return {
+                "checked": self._checked,
+                "new": self._checked - self._duplicates,
+                "duplicates": self._duplicates,
+                "bloomFalsePositives": self._false_positives,
+                "observedFalsePositiveRate": round(self._false_positives / unseen, 6) if unseen else 0.0,
+                "expectedFalsePositiveRate": round(self.bloom.expected_fp_rate(), 6) if self.bloom else 0.0,
+                "configuredFalsePositiveRate": self.fp_rate,
+                "indexed": self.bloom.items if self.bloom else 0,
+            }
+
+    def __enter__(self) -> "ReviewIndex":
+        return self.open()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
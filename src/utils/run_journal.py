@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+class RunJournal:
+    """
+    Append-only record of which apps a run has finished.
+
+    Each line is ``{"appId": ..., "status": "done", "offset": N}`` or
+    ``{"appId": ..., "status": "failed"}``, where ``offset`` is the size of
+    the output file once that app's record was written. Entries are buffered
+    and written in batches of ``flush_every`` (or every ``flush_interval``
+    seconds). Before a batch is written, ``sync_output`` is called so the
+    journal never points past data that is not on disk yet; ``after_flush``
+    is called once the batch itself is on disk.
+
+    On resume, finished apps are skipped and the output is cut back to the
+    last journaled offset, dropping records whose entry was lost in a crash
+    (those apps are simply scraped again).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_every: int = 100,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.completed: Set[str] = set()
+        self.failed: Set[str] = set()
+        self.resume_offset = 0
+        self.offset_source: Callable[[], int] = lambda: 0
+        self.sync_output: Callable[[], None] = lambda: None
+        self.after_flush: Callable[[], None] = lambda: None
+        self._pending: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._file: Optional[IO[str]] = None
+
+    def load(self) -> "RunJournal":
+        """
+        Read the state left by a previous run. Anything after the last
+        complete line, i.e. an entry torn by a crash, is discarded.
+        """
+        if not self.path.exists():
+            return self
+        valid_size = 0
+        with self.path.open("rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.debug("Ignoring unreadable journal line: %r", line)
+                    break
+                valid_size += len(line)
+                app_id = entry.get("appId")
+                if entry.get("status") == "done":
+                    self.completed.add(app_id)
+                    self.failed.discard(app_id)
+                    self.resume_offset = entry.get("offset", self.resume_offset)
+                else:
+                    self.failed.add(app_id)
+        # Cut off a line torn by a crash so new entries start on a clean line.
+        if valid_size < self.path.stat().st_size:
+            os.truncate(self.path, valid_size)
+        logger.info(
+            "Journal %s: %d apps done, %d failed, output offset %d.",
+            self.path,
+            len(self.completed),
+            len(self.failed),
+            self.resume_offset,
+        )
+        return self
+
+    def open(self, resume: bool = False) -> "RunJournal":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume:
+            self._file = self.path.open("a", encoding="utf-8")
+        else:
+            self.completed.clear()
+            self.failed.clear()
+            self.resume_offset = 0
+            self._file = self.path.open("w", encoding="utf-8")
+        return self
+
+    def pending(self, app_ids: List[str]) -> List[str]:
+        """
+        ``app_ids`` without the apps already finished. Apps that failed
+        before are kept so they are tried again.
+        """
+        remaining = [app_id for app_id in app_ids if app_id not in self.completed]
+        skipped = len(app_ids) - len(remaining)
+        if skipped:
+            logger.info("Resuming: skipping %d apps finished in a previous run.", skipped)
+        return remaining
+
+    def mark_done(self, app_id: str) -> None:
+        self.completed.add(app_id)
+        self.failed.discard(app_id)
+        self._append({"appId": app_id, "status": "done", "offset": self.offset_source()})
+
+    def mark_failed(self, app_id: str) -> None:
+        self.failed.add(app_id)
+        self._append({"appId": app_id, "status": "failed"})
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self._pending.append(entry)
+        if (
+            len(self._pending) >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending or self._file is None:
+            return
+        self.sync_output()
+        self._file.write(
+            "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in self._pending)
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending.clear()
+        self.after_flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
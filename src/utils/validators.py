@@ -6,11 +6,21 @@ def validate_app_ids(app_ids: Iterable[str]) -> None:
         raise ValueError("No app IDs provided. Please supply at least one app ID.")
 
 def validate_output_format(output_format: str) -> None:
-    allowed = {"json", "csv", "excel"}
+    allowed = {"json", "jsonl", "csv", "csv_normalized", "excel", "parquet", "sqlite"}
     if output_format not in allowed:
         raise ValueError(f"Invalid output format '{output_format}'. Allowed: {', '.join(sorted(allowed))}.")
 
 def validate_mode(mode: str) -> None:
-    allowed = {"app_ids", "keyword", "category"}
+    allowed = {"app_ids", "keyword", "category", "discover"}
     if mode not in allowed:
-        raise ValueError(f"Invalid mode '{mode}'. Allowed: {', '.join(sorted(allowed))}.")
\ No newline at end of file
+        raise ValueError(f"Invalid mode '{mode}'. Allowed: {', '.join(sorted(allowed))}.")
+
+def validate_concurrency(concurrency: int) -> int:
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise ValueError(f"Invalid concurrency '{concurrency}'. Must be a positive integer.")
+    return concurrency
+
+def validate_review_source(review_source: str) -> None:
+    allowed = {"page", "paginated"}
+    if review_source not in allowed:
+        raise ValueError(f"Invalid review source '{review_source}'. Allowed: {', '.join(sorted(allowed))}.")
\ No newline at end of file
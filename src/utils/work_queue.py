@@ -0,0 +1,209 @@
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    app_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_status ON items (status, lease_expires);
+"""
+
+class WorkQueue:
+    """
+    Lease-based queue of app IDs in a SQLite file, shared by any number of
+    worker processes (or hosts, when the file sits on shared storage).
+
+    ``lease`` hands out pending apps to one worker for ``visibility_timeout``
+    seconds. Apps that are neither completed nor failed in time become
+    visible again, so the apps of a crashed worker are picked up by the
+    others. Every lease counts as an attempt; an app whose attempts reach
+    ``max_attempts`` is moved to the ``dead`` status instead of being
+    handed out again.
+
+    Completing or failing an app only takes effect while the caller still
+    holds its lease. Each operation is a short ``BEGIN IMMEDIATE``
+    transaction, and the default rollback journal is kept because WAL does
+    not work over network filesystems.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        visibility_timeout: float = 600.0,
+        max_attempts: int = 3,
+    ) -> None:
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max(1, max_attempts)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def open(self) -> "WorkQueue":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=60.0, isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+        return self
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "WorkQueue":
+        return self.open()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.open()
+        assert self._conn is not None
+        return self._conn
+
+    def _transaction(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def enqueue(self, app_ids: Iterable[str]) -> int:
+        """
+        Add apps to the queue. Apps already queued (in any status) are left
+        alone. Returns the number of apps added.
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO items (app_id, updated) VALUES (?, ?)",
+                ((app_id, now) for app_id in app_ids),
+            )
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def lease(self, worker_id: str, limit: int) -> List[str]:
+        """
+        Lease up to ``limit`` apps to ``worker_id``, oldest first. Expired
+        leases whose app has no attempts left are dead-lettered on the way.
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "UPDATE items SET status = 'dead', lease_owner = NULL, updated = ?,"
+                " last_error = COALESCE(last_error, 'lease expired')"
+                " WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            rows = conn.execute(
+                "SELECT app_id FROM items"
+                " WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)"
+                " ORDER BY rowid LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            app_ids = [row[0] for row in rows]
+            conn.executemany(
+                "UPDATE items SET status = 'leased', attempts = attempts + 1,"
+                " lease_owner = ?, lease_expires = ?, updated = ? WHERE app_id = ?",
+                ((worker_id, now + self.visibility_timeout, now, app_id) for app_id in app_ids),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return app_ids
+
+    def heartbeat(self, worker_id: str) -> None:
+        """
+        Extend every lease held by ``worker_id`` by a full visibility timeout.
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "UPDATE items SET lease_expires = ?, updated = ?"
+                " WHERE status = 'leased' AND lease_owner = ?",
+                (now + self.visibility_timeout, now, worker_id),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def complete(self, worker_id: str, app_ids: Iterable[str]) -> int:
+        """
+        Mark leased apps as done. Returns how many were still leased to
+        ``worker_id``; the others had expired and may be redone elsewhere.
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE items SET status = 'done', lease_owner = NULL, updated = ?"
+                " WHERE app_id = ? AND status = 'leased' AND lease_owner = ?",
+                ((now, app_id, worker_id) for app_id in app_ids),
+            )
+            completed = conn.total_changes - before
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return completed
+
+    def fail(self, worker_id: str, app_ids: Iterable[str], error: str) -> None:
+        """
+        Give leased apps back after a failed attempt. Apps with attempts left
+        become pending again, the others are dead-lettered.
+        """
+        now = time.time()
+        conn = self._transaction()
+        try:
+            conn.executemany(
+                "UPDATE items SET"
+                " status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END,"
+                " lease_owner = NULL, last_error = ?, updated = ?"
+                " WHERE app_id = ? AND status = 'leased' AND lease_owner = ?",
+                ((self.max_attempts, error, now, app_id, worker_id) for app_id in app_ids),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"pending": 0, "leased": 0, "done": 0, "dead": 0}
+        for status, count in self.conn.execute(
+            "SELECT status, COUNT(*) FROM items GROUP BY status"
+        ):
+            counts[status] = count
+        return counts
+
+    def outstanding(self) -> int:
+        """
+        Number of apps that are pending or leased, i.e. not finished yet.
+        """
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM items WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        return row[0]
+
+    def dead_letters(self) -> List[Tuple[str, int, Optional[str]]]:
+        return self.conn.execute(
+            "SELECT app_id, attempts, last_error FROM items WHERE status = 'dead' ORDER BY rowid"
+        ).fetchall()